@@ -0,0 +1,62 @@
+"""
+Первичное заполнение (или восстановление) агрегатов для аналитики.
+
+Пересчитывает monthly_rollups и arrears_rollups по уже накопленным показаниям,
+платежам и закрытым периодам. Расход, оплаты и распределение долга миграция 10 заполняет сама,
+а начисления за периоды, закрытые до неё, пересчитываются только здесь, поэтому запуск нужен
+один раз — после обновления схемы до версии 10. Не запускайте во время закрытия месяца.
+
+Запуск:
+    PYTHONPATH=src python backfill_rollups.py
+"""
+
+import asyncio
+import sys
+
+from FlatPay.core import SettingsManager, Config, setup_logger
+from FlatPay.database import PoolManager, WriterManager, run_migrations
+from FlatPay.services.analytics import rebuild_rollups
+from FlatPay.utils.tariffs import TariffManager
+
+
+async def main(app_config: Config) -> int:
+    """
+    Пересчитывает агрегаты.
+
+    Возвращает:
+     - int: Код завершения: 0 — агрегаты пересчитаны, 1 — ошибка.
+    """
+
+    await run_migrations(path=app_config.DATABASE_PATH, profile=app_config.SQLITE_PROFILE)
+    PoolManager.init_pool(
+        path=app_config.DATABASE_PATH,
+        size=1,
+        timeout=app_config.DB_POOL_TIMEOUT,
+        profile=app_config.SQLITE_PROFILE
+    )
+    await WriterManager.init_writer(
+        path=app_config.DATABASE_PATH,
+        profile=app_config.SQLITE_PROFILE,
+        batch_size=app_config.WRITER_BATCH_SIZE,
+        batch_window=app_config.WRITER_BATCH_WINDOW
+    )
+
+    try:
+        async with PoolManager.get_pool().connection() as connection:
+            # Начисления за закрытые периоды пересчитываются по тарифам на последний день периода
+            await TariffManager.reload(connection)
+            rebuilt = await rebuild_rollups(connection, chunk_size=app_config.MONTH_CLOSE_CHUNK_SIZE)
+    finally:
+        await WriterManager.close_writer()
+        await PoolManager.close_pool()
+
+    return 0 if rebuilt else 1
+
+
+if __name__ == "__main__":
+    # Загружаем конфигурацию из .env и настраиваем логирование
+    SettingsManager.load_config()
+    config: Config = SettingsManager.get_config()
+    setup_logger(config=config)
+
+    sys.exit(asyncio.run(main(config)))
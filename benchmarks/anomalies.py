@@ -0,0 +1,145 @@
+"""
+Бенчмарк оценки аномального расхода.
+
+Создаёт --accounts пользователей со статистикой расхода за прошлые месяцы и показаниями
+за период (--anomalies доля с «лишним нулём»), затем сравнивает:
+ - векторную проверку всего периода (scan_anomalies) с поштучной оценкой тех же строк;
+ - обновление статистики при закрытии месяца (update_stats_range по всему диапазону);
+ - стоимость оценки в одной отправке показаний (update_readings) — она не должна зависеть
+   от длины истории пользователя.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/anomalies.py --accounts 100000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+from time import perf_counter
+
+import numpy as np
+
+import FlatPay.core  # noqa: F401  (инициализирует пакет core до пакета database)
+from FlatPay.app.models import Readings
+from FlatPay.core.config import SQLITE_PROFILES
+from FlatPay.database import PoolManager, WriterManager, run_migrations
+from FlatPay.database.repositories.anomaly_repo import fetch_anomaly_scan_chunk_repo
+from FlatPay.services.readings import scan_anomalies, score_consumption, update_readings, update_stats_range
+from FlatPay.services.readings.readings import readings_period
+from FlatPay.utils.tariffs import TariffManager
+
+
+PREVIOUS, PERIOD = "2024-01", "2024-02"
+MEANS = (150.0, 10.0, 6.0, 40.0)
+
+
+def seed(path: str, accounts: int, anomalies: float) -> None:
+    """Заполняет пользователей, статистику до PERIOD и показания за PREVIOUS и PERIOD."""
+
+    emails = [f"user{i:08d}@example.com" for i in range(accounts)]
+
+    with sqlite3.connect(path) as connection:
+        connection.executemany("INSERT INTO Taxpayers (email) VALUES (?)", ((email,) for email in emails))
+        connection.executemany(
+            """
+            INSERT INTO consumption_stats (
+                email, period, count,
+                electricity_mean, cold_water_mean, hot_water_mean, gas_mean,
+                electricity_var, cold_water_var, hot_water_var, gas_var
+            )
+            VALUES (?, ?, 12, ?, ?, ?, ?, 400, 4, 2, 36)
+            """,
+            ((email, PREVIOUS, *MEANS) for email in emails)
+        )
+
+        history = []
+        for email in emails:
+            used = [max(0, round(random.gauss(mean, mean * 0.1))) for mean in MEANS]
+            if random.random() < anomalies:
+                used[0] *= 10
+            history.append((email, PREVIOUS, 10000, 1000, 500, 3000, *MEANS))
+            history.append((email, PERIOD, 10000 + used[0], 1000 + used[1], 500 + used[2], 3000 + used[3], *used))
+
+        connection.executemany(
+            """
+            INSERT INTO readings_history (
+                email, period, electricity, cold_water, hot_water, gas,
+                electricity_used, cold_water_used, hot_water_used, gas_used
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            history
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=100000)
+    parser.add_argument("--anomalies", type=float, default=0.01)
+    parser.add_argument("--submissions", type=int, default=500)
+    parser.add_argument("--profile", default="balanced", choices=SQLITE_PROFILES)
+    args = parser.parse_args()
+
+    profile = SQLITE_PROFILES[args.profile]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        await run_migrations(path, profile=profile)
+        seed(path, args.accounts, args.anomalies)
+
+        PoolManager.init_pool(path, size=1, timeout=30, profile=profile)
+        async with PoolManager.get_pool().connection() as connection:
+            await TariffManager.reload(connection)
+
+            # Векторная проверка периода: страница за страницей одним расчётом
+            started = perf_counter()
+            found = await scan_anomalies(connection, PERIOD)
+            vectorized = perf_counter() - started
+
+            # Те же строки, оценённые по одной (N = 1), как при обходе в цикле
+            rows = await fetch_anomaly_scan_chunk_repo(connection, PERIOD, "", args.accounts)
+
+        started = perf_counter()
+        flagged = 0
+        for row in rows:
+            scores = score_consumption(np.asarray([row[1:5]], dtype=np.float64), [row[5:]])
+            flagged += bool((np.abs(scores) > 4.0).any())
+        per_row = perf_counter() - started
+
+        print(
+            f"проверка {args.accounts} пользователей: векторно {vectorized:.2f} сек. "
+            f"({len(found)} аномалий), поштучно {per_row:.2f} сек. ({flagged} аномалий) — "
+            f"в {per_row / vectorized:.1f} раза быстрее"
+        )
+
+        await WriterManager.init_writer(path, profile, batch_size=128, batch_window=0.002)
+
+        # Обновление статистики при закрытии месяца — O(1) на пользователя
+        started = perf_counter()
+        updated = await WriterManager.get_writer().submit(update_stats_range, PERIOD, "", "\uffff")
+        print(f"обновление статистики: {updated} пользователей за {perf_counter() - started:.2f} сек.")
+
+        # Одиночные отправки: расход и оценка по двум чтениям по ключу, без чтения истории
+        current = readings_period()
+        readings = Readings(meter_readings={"electricity": 10320, "cold_water": 1022, "hot_water": 512, "gas": 3082})
+        latencies = []
+        for i in range(args.submissions):
+            started = perf_counter()
+            await update_readings(f"user{i:08d}@example.com", readings)
+            latencies.append(perf_counter() - started)
+
+        latencies.sort()
+        print(
+            f"отправка показаний за {current}: медиана {latencies[len(latencies) // 2] * 1e3:.2f} мс, "
+            f"p95 {latencies[int(len(latencies) * 0.95)] * 1e3:.2f} мс"
+        )
+
+        await WriterManager.close_writer()
+        await PoolManager.close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
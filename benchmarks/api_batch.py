@@ -0,0 +1,114 @@
+"""
+Бенчмарк пакетных эндпоинтов JSON API.
+
+Через тестовый клиент Quart (без сети; на реальной сети к каждому запросу добавляется ещё RTT) сравнивает:
+ - долги --accounts пользователей: один POST /debts/batch против --accounts запросов по одному email;
+ - показания --accounts пользователей: один POST /readings/batch (одна операция записи)
+   против --accounts запросов по одной строке;
+ - сериализацию истории показаний: TypeAdapter.dump_json против json.dumps(model_dump()).
+
+Запуск:
+    PYTHONPATH=src python benchmarks/api_batch.py --accounts 1000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+from time import perf_counter
+
+from pydantic import TypeAdapter
+
+from FlatPay.app.models import ReadingsRecord
+from FlatPay.core import SettingsManager, setup_app
+
+
+API = "/FlatPay/api/v1"
+TOKEN = "benchmark-token"
+
+
+def readings(email: str, base: int) -> dict:
+    return {"email": email, "meter_readings": {"electricity": base, "cold_water": base, "hot_water": base, "gas": base}}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.setdefault("DATABASE_PATH", os.path.join(directory, "bench.db"))
+        os.environ.setdefault("LOG_CONFIG_PATH", "")
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+        os.environ["IMPORT_TOKEN"] = TOKEN
+        os.environ["API_BATCH_LIMIT"] = str(args.accounts)
+        SettingsManager.load_config()
+
+        app = setup_app(SettingsManager.get_config().SECRET_KEY)
+        headers = {"Authorization": f"Bearer {TOKEN}"}
+        emails = [f"user{i:06d}@example.com" for i in range(args.accounts)]
+
+        async with app.test_app():
+            with sqlite3.connect(SettingsManager.get_config().DATABASE_PATH) as connection:
+                connection.executemany("INSERT INTO Taxpayers (email) VALUES (?)", ((email,) for email in emails))
+
+            client = app.test_client()
+
+            started = perf_counter()
+            for email in emails:
+                response = await client.post(f"{API}/debts/batch", json={"emails": [email]}, headers=headers)
+                assert response.status_code == 200
+            single = perf_counter() - started
+
+            started = perf_counter()
+            response = await client.post(f"{API}/debts/batch", json={"emails": emails}, headers=headers)
+            assert response.status_code == 200
+            batch = perf_counter() - started
+            print(f"долги {args.accounts} пользователей: по одному {single:.2f} сек. ({args.accounts} запросов), "
+                  f"пакетом {batch * 1e3:.1f} мс (1 запрос) — в {single / batch:.0f} раз быстрее")
+
+            started = perf_counter()
+            for email in emails:
+                body = {"period": "2024-01", "readings": [readings(email, 100)]}
+                response = await client.post(f"{API}/readings/batch", json=body, headers=headers)
+                assert response.status_code == 200
+            single = perf_counter() - started
+
+            started = perf_counter()
+            body = {"period": "2024-02", "readings": [readings(email, 200) for email in emails]}
+            response = await client.post(f"{API}/readings/batch", json=body, headers=headers)
+            assert (await response.get_json())["imported"] == args.accounts
+            batch = perf_counter() - started
+            print(f"показания {args.accounts} пользователей: по одному {single:.2f} сек., "
+                  f"пакетом {batch * 1e3:.1f} мс — в {single / batch:.0f} раз быстрее")
+
+        # Сериализация страницы истории показаний (24 периода) — как в GET /readings
+        history = [
+            ReadingsRecord(
+                period=f"20{i // 12:02d}-{i % 12 + 1:02d}",
+                meter_readings={"electricity": 10000 + i, "cold_water": 1000, "hot_water": 500, "gas": 3000},
+                consumption={"electricity": 300, "cold_water": 10, "hot_water": 6, "gas": 40},
+                anomaly_score=0.5
+            )
+            for i in range(24)
+        ]
+        adapter = TypeAdapter(list[ReadingsRecord])
+        rounds = 10000
+
+        started = perf_counter()
+        for _ in range(rounds):
+            json.dumps([record.model_dump() for record in history])
+        plain = perf_counter() - started
+
+        started = perf_counter()
+        for _ in range(rounds):
+            adapter.dump_json(history)
+        fast = perf_counter() - started
+        print(f"сериализация 24 периодов: json.dumps {plain / rounds * 1e6:.0f} мкс, "
+              f"TypeAdapter.dump_json {fast / rounds * 1e6:.0f} мкс — в {plain / fast:.1f} раза быстрее")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
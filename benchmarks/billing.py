@@ -0,0 +1,102 @@
+"""
+Бенчмарк пакетного перерасчёта долга.
+
+Сравнивает построчный путь (Readings + calculate_base_debt + UPDATE на пользователя)
+с векторным движком bill_all_accounts (NumPy + executemany по страницам).
+Построчный путь запускается на первых --per-row пользователях, результат пересчитывается в строки/сек.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/billing.py --accounts 1000000 --chunk 20000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+from time import perf_counter
+
+import FlatPay.core  # noqa: F401  (инициализирует пакет core до пакета database)
+from FlatPay.app.models import Readings
+from FlatPay.core.config import SQLITE_PROFILES
+from FlatPay.database import WriterManager, get_connection, close_connection, run_migrations
+from FlatPay.database.repositories.payments_repo import update_next_month_debt_repo
+from FlatPay.database.repositories.readings_repo import fetch_consumption_chunk_repo
+from FlatPay.services.payments import bill_all_accounts
+from FlatPay.utils.calculate_base_debt import calculate_base_debt
+
+
+PERIOD = "2024-01"
+
+
+def seed(path: str, accounts: int) -> None:
+    """Заполняет таблицу Taxpayers пользователями, а историю показаний — случайным расходом за PERIOD."""
+
+    emails = [f"user{i:08d}@example.com" for i in range(accounts)]
+
+    with sqlite3.connect(path) as connection:
+        connection.executemany("INSERT INTO Taxpayers (email) VALUES (?)", ((email,) for email in emails))
+        connection.executemany(
+            """
+            INSERT INTO readings_history (
+                email, period, electricity, cold_water, hot_water, gas,
+                electricity_used, cold_water_used, hot_water_used, gas_used
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                (email, PERIOD, *(used := (random.randint(0, 500), random.randint(0, 15),
+                                          random.randint(0, 10), random.randint(0, 60))), *used)
+                for email in emails
+            )
+        )
+
+
+async def per_row(connection, limit: int) -> float:
+    writer = WriterManager.get_writer()
+    started = perf_counter()
+
+    rows = await fetch_consumption_chunk_repo(connection, PERIOD, "", limit)
+    for email, electricity, cold_water, hot_water, gas in rows:
+        readings = Readings(meter_readings={
+            "electricity": electricity, "cold_water": cold_water, "hot_water": hot_water, "gas": gas
+        })
+        await writer.submit(update_next_month_debt_repo, calculate_base_debt(readings), email)
+
+    return len(rows) / (perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=200000)
+    parser.add_argument("--per-row", type=int, default=20000)
+    parser.add_argument("--chunk", type=int, default=20000)
+    parser.add_argument("--profile", default="balanced", choices=SQLITE_PROFILES)
+    args = parser.parse_args()
+
+    profile = SQLITE_PROFILES[args.profile]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        await run_migrations(path, profile=profile)
+        seed(path, args.accounts)
+
+        await WriterManager.init_writer(path, profile, batch_size=128, batch_window=0.002)
+        connection = await get_connection(path, profile=profile)
+
+        rate = await per_row(connection, args.per_row)
+        print(f"построчно:  {rate:>12.0f} пользователей/сек "
+              f"(оценка для {args.accounts}: {args.accounts / rate:.1f} сек.)")
+
+        started = perf_counter()
+        billed = await bill_all_accounts(period=PERIOD, chunk_size=args.chunk)
+        elapsed = perf_counter() - started
+        print(f"векторно:   {billed / elapsed:>12.0f} пользователей/сек ({billed} за {elapsed:.2f} сек.)")
+
+        await close_connection(connection)
+        await WriterManager.close_writer()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
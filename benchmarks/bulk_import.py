@@ -0,0 +1,104 @@
+"""
+Бенчмарк массового импорта показаний из CSV.
+
+Создаёт --accounts пользователей с показаниями за прошлый период и CSV-файл с новыми
+показаниями (--invalid доля строк с ошибками), затем импортирует его потоково
+пачками по --batch строк. Цель — не меньше 100 000 строк в минуту.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/bulk_import.py --accounts 100000 --batch 2000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+from datetime import date, timedelta
+from time import perf_counter
+
+import FlatPay.core  # noqa: F401  (инициализирует пакет core до пакета database)
+from FlatPay.core.config import SQLITE_PROFILES
+from FlatPay.database import PoolManager, WriterManager, run_migrations
+from FlatPay.services.readings import import_readings
+from FlatPay.utils.tariffs import TariffManager
+
+
+# Показания импортируются за текущий период: по ним пересчитывается и долг на следующий месяц
+PERIOD = date.today().strftime("%Y-%m")
+PREVIOUS = (date.today().replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+
+
+def seed(path: str, csv_path: str, accounts: int, invalid: float) -> None:
+    """Заполняет пользователей с показаниями за PREVIOUS и пишет CSV с показаниями за PERIOD."""
+
+    emails = [f"user{i:08d}@example.com" for i in range(accounts)]
+
+    with sqlite3.connect(path) as connection:
+        connection.executemany("INSERT INTO Taxpayers (email) VALUES (?)", ((email,) for email in emails))
+        connection.executemany(
+            """
+            INSERT INTO readings_history (
+                email, period, electricity, cold_water, hot_water, gas,
+                electricity_used, cold_water_used, hot_water_used, gas_used
+            )
+            VALUES (?, ?, 1000, 100, 50, 300, 0, 0, 0, 0)
+            """,
+            ((email, PREVIOUS) for email in emails)
+        )
+
+    with open(csv_path, "w", encoding="utf-8") as file:
+        file.write("email;electricity;cold_water;hot_water;gas\n")
+        for email in emails:
+            if random.random() < invalid:
+                # Ошибочные строки: показания меньше прошлых или нечисловые
+                file.write(random.choice((f"{email};900;100;50;300\n", f"{email};abc;100;50;300\n")))
+            else:
+                file.write(f"{email};{1000 + random.randint(0, 500)};{100 + random.randint(0, 15)};"
+                           f"{50 + random.randint(0, 10)};{300 + random.randint(0, 60)}\n")
+
+
+async def read_chunks(path: str, size: int = 1 << 16):
+    with open(path, "rb") as file:
+        while chunk := file.read(size):
+            yield chunk
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=2000)
+    parser.add_argument("--invalid", type=float, default=0.01)
+    parser.add_argument("--profile", default="balanced", choices=SQLITE_PROFILES)
+    args = parser.parse_args()
+
+    profile = SQLITE_PROFILES[args.profile]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        csv_path = os.path.join(directory, "readings.csv")
+        await run_migrations(path, profile=profile)
+        seed(path, csv_path, args.accounts, args.invalid)
+
+        PoolManager.init_pool(path, size=1, timeout=30, profile=profile)
+        async with PoolManager.get_pool().connection() as connection:
+            await TariffManager.reload(connection)
+        await WriterManager.init_writer(path, profile, batch_size=128, batch_window=0.002)
+
+        started = perf_counter()
+        report = await import_readings(read_chunks(csv_path), period=PERIOD, batch_size=args.batch)
+        elapsed = perf_counter() - started
+
+        print(
+            f"строк: {report.rows}, сохранено: {report.imported}, отклонено: {report.failed}, "
+            f"{elapsed:.2f} сек. — {report.rows / elapsed * 60:,.0f} строк/мин "
+            f"(файл {os.path.getsize(csv_path) / 1e6:.1f} МБ)"
+        )
+
+        await WriterManager.close_writer()
+        await PoolManager.close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
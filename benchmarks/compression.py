@@ -0,0 +1,124 @@
+"""
+Бенчмарк сжатия ответов.
+
+Через тестовый клиент Quart (без сети) выводит:
+ - страницы пользователя (история показаний за --periods месяцев) и ответы JSON API: байт без сжатия
+   и со сжатием gzip, время на запрос;
+ - статику домашней страницы: байт без сжатия и с готовым вариантом, сжатым при старте
+   (процессорное время на сжатие при отдаче — ноль);
+ - время сжатия тела разного размера на уровне COMPRESSION_GZIP_LEVEL: оно обосновывает порог
+   COMPRESSION_OFFLOAD_SIZE, с которого сжатие выполняется в пуле потоков и не блокирует цикл событий.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/compression.py --requests 500
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import sqlite3
+import tempfile
+from time import perf_counter
+
+from FlatPay.core import SettingsManager, setup_app
+from FlatPay.utils.compression import CompressionManager, compress
+
+
+EMAIL, PASSWORD = "user@example.com", "password1"
+PAGES = ("/FlatPay/homepage", "/FlatPay/get_readings", "/FlatPay/api/v1/account", "/FlatPay/api/v1/readings")
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def seed(path: str, periods: int) -> None:
+    """Добавляет пользователю историю показаний за `periods` месяцев (до 2000-01 включительно назад)."""
+
+    history = []
+    for i in range(periods):
+        year, month = divmod(2000 * 12 - i, 12)
+        history.append((EMAIL, f"{year}-{month + 1:02d}", 10000 - i * 300, 1000 - i * 10, 500 - i * 6, 3000 - i * 40,
+                        300, 10, 6, 40))
+
+    with sqlite3.connect(path) as connection:
+        connection.executemany(
+            """
+            INSERT INTO readings_history (
+                email, period, electricity, cold_water, hot_water, gas,
+                electricity_used, cold_water_used, hot_water_used, gas_used
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            history
+        )
+        # Новая версия аккаунта: сводка в кэше не используется, ETag меняется
+        connection.execute("UPDATE Taxpayers SET version = version + 1 WHERE email = ?", (EMAIL,))
+
+
+async def measure(client, path: str, requests: int, headers: dict) -> tuple[int, float]:
+    """Возвращает (байт тела на запрос, мкс на запрос)."""
+
+    body = 0
+    started = perf_counter()
+    for _ in range(requests):
+        response = await client.get(path, headers=headers)
+        body += len(await response.get_data())
+
+    return body // requests, (perf_counter() - started) / requests * 1e6
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--periods", type=int, default=24)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.setdefault("DATABASE_PATH", os.path.join(directory, "bench.db"))
+        os.environ.setdefault("LOG_CONFIG_PATH", "")
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+        SettingsManager.load_config()
+
+        app = setup_app(SettingsManager.get_config().SECRET_KEY)
+        async with app.test_app():
+            client = app.test_client()
+            await client.post("/FlatPay/register", form={"email": EMAIL, "password": PASSWORD})
+            await client.post("/FlatPay/login", form={"email": EMAIL, "password": PASSWORD})
+            seed(SettingsManager.get_config().DATABASE_PATH, args.periods)
+
+            print(f"{'ответ':<34} {'байт':>7} {'gzip':>7} {'мкс/запрос':>11} {'gzip':>7}")
+            for page in PAGES:
+                await client.get(page)  # Прогрев: компиляция шаблона, сводка аккаунта в кэше
+                plain_bytes, plain_time = await measure(client, page, args.requests, {})
+                gzip_bytes, gzip_time = await measure(client, page, args.requests, GZIP)
+                print(f"{page:<34} {plain_bytes:>7} {gzip_bytes:>7} {plain_time:>11.0f} {gzip_time:>7.0f}  "
+                      f"(-{(1 - gzip_bytes / plain_bytes) * 100:.0f}% байт)")
+
+            # Статика: сжатые варианты готовы с момента создания приложения
+            html = await (await client.get(PAGES[0])).get_data(as_text=True)
+            for asset in re.findall(r'(?:href|src)="(/static/[^"?]+)[^"]*"', html):
+                plain_bytes, plain_time = await measure(client, asset, args.requests, {})
+                gzip_bytes, gzip_time = await measure(client, asset, args.requests, GZIP)
+                note = (f"готовый вариант, -{(1 - gzip_bytes / plain_bytes) * 100:.0f}% байт"
+                        if gzip_bytes < plain_bytes else "уже сжатый тип, отдаётся как есть")
+                print(f"{asset:<34} {plain_bytes:>7} {gzip_bytes:>7} {plain_time:>11.0f} {gzip_time:>7.0f}  ({note})")
+
+        # Время сжатия по размеру тела: сколько цикл событий стоял бы без пула потоков
+        compressor = CompressionManager.get_compressor()
+        print(f"\nсжатие gzip (уровень {compressor.gzip_level}), порог пула потоков "
+              f"{compressor.offload_size // 1024} КиБ:")
+        row = (f"<tr><td>{i}</td><td>2024-01</td><td>{10000 + i * 7}</td><td>{1000 + i}</td>"
+               f"<td>{500 + i % 13}</td><td>{3000 + i * 3}</td></tr>" for i in range(1_000_000))
+        sample = "".join(row).encode()
+        for size in (1024, 16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024):
+            data = sample[:size]
+            rounds = max(1, 4 * 1024 * 1024 // size)
+            started = perf_counter()
+            for _ in range(rounds):
+                compress(data, "gzip", compressor.gzip_level)
+            elapsed = (perf_counter() - started) / rounds * 1e3
+            mode = "пул потоков" if size >= compressor.offload_size else "в цикле событий"
+            print(f"  {size // 1024:>5} КиБ: {elapsed:>7.2f} мс ({mode})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
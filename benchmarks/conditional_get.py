@@ -0,0 +1,116 @@
+"""
+Бенчмарк условных GET-запросов к страницам пользователя.
+
+Через тестовый клиент Quart (без сети) запрашивает домашнюю страницу, страницу долга и страницу
+показаний (--periods периодов истории) --requests раз и сравнивает:
+ - full — обычный запрос: сводка из кэша, рендеринг шаблона, полный HTML в ответе;
+ - 304 — повторный запрос с If-None-Match: страница не рендерится, тело ответа пустое.
+Для каждой страницы выводятся байты тела на запрос и процессорное время на запрос.
+
+Для статики выводится, сколько запросов делает повторный просмотр страницы: файлы по URL
+с отпечатком кэшируются как неизменяемые и не перепроверяются вовсе.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/conditional_get.py --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import sqlite3
+import tempfile
+from time import process_time
+
+from FlatPay.core import SettingsManager, setup_app
+
+
+EMAIL, PASSWORD = "user@example.com", "password1"
+PAGES = ("/FlatPay/homepage", "/FlatPay/get_debt", "/FlatPay/get_readings")
+
+
+def seed(path: str, periods: int) -> None:
+    """Добавляет пользователю историю показаний за `periods` месяцев (до 2000-01 включительно назад)."""
+
+    history = []
+    for i in range(periods):
+        year, month = divmod(2000 * 12 - i, 12)
+        history.append((EMAIL, f"{year}-{month + 1:02d}", 10000 - i * 300, 1000 - i * 10, 500 - i * 6, 3000 - i * 40,
+                        300, 10, 6, 40))
+
+    with sqlite3.connect(path) as connection:
+        connection.executemany(
+            """
+            INSERT INTO readings_history (
+                email, period, electricity, cold_water, hot_water, gas,
+                electricity_used, cold_water_used, hot_water_used, gas_used
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            history
+        )
+
+
+async def measure(client, path: str, requests: int, headers: dict) -> tuple[int, float, int]:
+    """Возвращает (байт тела на запрос, мкс процессорного времени на запрос, код ответа)."""
+
+    body = 0
+    status = 0
+    started = process_time()
+    for _ in range(requests):
+        response = await client.get(path, headers=headers)
+        body += len(await response.get_data())
+        status = response.status_code
+
+    return body // requests, (process_time() - started) / requests * 1e6, status
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--periods", type=int, default=24)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        os.environ.setdefault("DATABASE_PATH", path)
+        os.environ.setdefault("LOG_CONFIG_PATH", "")
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+        SettingsManager.load_config()
+
+        app = setup_app(SettingsManager.get_config().SECRET_KEY)
+        async with app.test_app():
+            client = app.test_client()
+            await client.post("/FlatPay/register", form={"email": EMAIL, "password": PASSWORD})
+            await client.post("/FlatPay/login", form={"email": EMAIL, "password": PASSWORD})
+            seed(SettingsManager.get_config().DATABASE_PATH, args.periods)
+
+            print(f"{'страница':<24} {'режим':<5} {'байт/запрос':>12} {'мкс CPU/запрос':>15}")
+            for page in PAGES:
+                # Прогрев: компиляция шаблона, сводка аккаунта в кэше
+                response = await client.get(page)
+                etag = response.headers["ETag"]
+
+                full_bytes, full_cpu, _ = await measure(client, page, args.requests, {})
+                cached_bytes, cached_cpu, status = await measure(client, page, args.requests, {"If-None-Match": etag})
+                assert status == 304
+
+                print(f"{page:<24} {'full':<5} {full_bytes:>12} {full_cpu:>15.0f}")
+                print(f"{page:<24} {'304':<5} {cached_bytes:>12} {cached_cpu:>15.0f}  "
+                      f"(-{full_bytes - cached_bytes} байт, -{(1 - cached_cpu / full_cpu) * 100:.0f}% CPU)")
+
+            # Статика: первый просмотр загружает файлы, повторный — без запросов (immutable)
+            html = await (await client.get(PAGES[0])).get_data(as_text=True)
+            assets = re.findall(r'href="(/static/[^"]+)"', html)
+            total = 0
+            for asset in assets:
+                response = await client.get(asset)
+                total += len(await response.get_data())
+                assert "immutable" in response.headers["Cache-Control"], asset
+
+            print(f"статика домашней страницы: {len(assets)} файлов, {total} байт при первом просмотре; "
+                  f"при повторном — 0 запросов вместо {len(assets)} перепроверок (Cache-Control: immutable)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Бенчмарк ленивого получения соединения с БД в обработчиках запросов.
+
+Измеряет запросы в секунду (через тестовый клиент Quart, без сети) для маршрутов,
+которые не обращаются к базе данных: главная страница /FlatPay/ и статический файл.
+Сравниваются:
+ - eager — соединение берётся из пула перед каждым запросом (прежнее поведение);
+ - lazy — соединение берётся только при вызове get_db_connection().
+При --concurrency больше DB_POOL_SIZE в режиме eager запросы ещё и ждут свободное соединение.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/lazy_connection.py --requests 5000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+from time import perf_counter
+
+from FlatPay.core import SettingsManager, setup_app, get_db_connection
+from FlatPay.database import PoolManager
+
+
+async def measure(app, path: str, args: argparse.Namespace) -> float:
+    client = app.test_client()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            response = await client.get(path)
+            assert response.status_code == 200
+            await response.get_data()
+
+    started = perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    return args.requests / (perf_counter() - started)
+
+
+async def run(mode: str, args: argparse.Namespace) -> None:
+    app = setup_app(SettingsManager.get_config().SECRET_KEY)
+
+    if mode == "eager":
+        async def eager_connection() -> None:
+            await get_db_connection()
+
+        app.before_request(eager_connection)
+
+    async with app.test_app():
+        for name, path in (("/FlatPay/", "/FlatPay/"), ("static", "/static/styles.css")):
+            # Прогрев: компиляция шаблона, открытие соединения пула
+            await measure(app, path, argparse.Namespace(requests=200, concurrency=args.concurrency))
+            rate = await measure(app, path, args)
+            print(f"{mode:<6} {name:<10} {rate:>9.0f} запросов/с")
+
+        stats = PoolManager.get_pool().stats
+        print(f"{mode:<6} соединений выдано пулом: {stats.acquisitions}, среднее ожидание: {stats.avg_wait_time * 1000:.3f} мс")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.setdefault("DATABASE_PATH", os.path.join(directory, "bench.db"))
+        os.environ.setdefault("LOG_CONFIG_PATH", "")
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+        SettingsManager.load_config()
+
+        for mode in ("eager", "lazy", "eager", "lazy"):
+            await run(mode, args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,119 @@
+"""
+Бенчмарк задержки входа при одновременных попытках входа.
+
+Запускает --logins входов с параллелизмом --concurrency и параллельно измеряет
+задержку цикла событий (насколько опаздывает «тикер» с периодом 5 мс).
+Сравниваются:
+ - inline — проверка scrypt прямо в цикле событий (как было бы без пула);
+ - pool-N — проверка в PasswordHasher с N потоками.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/login.py --logins 400 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+from time import perf_counter
+
+import numpy as np
+
+import FlatPay.core  # noqa: F401  (инициализирует пакет core до пакета database)
+from FlatPay.core.config import SQLITE_PROFILES
+from FlatPay.database import PoolManager, WriterManager, run_migrations
+from FlatPay.database.repositories.user_repo import fetch_credentials_repo
+from FlatPay.services.user import authenticate_user, CREDENTIALS_CACHE
+from FlatPay.utils.cache import CacheManager
+from FlatPay.utils.security import HasherManager, hash_password, verify_password
+
+
+PASSWORD = "correct horse battery staple"
+
+
+async def ticker(stop: asyncio.Event, lags: list[float], period: float = 0.005) -> None:
+    """Измеряет, насколько цикл событий опаздывает с пробуждением корутины."""
+
+    while not stop.is_set():
+        started = perf_counter()
+        await asyncio.sleep(period)
+        lags.append(perf_counter() - started - period)
+
+
+async def inline_login(email: str) -> bool:
+    async with PoolManager.get_pool().connection() as connection:
+        stored, salt = await fetch_credentials_repo(connection, email)
+    return verify_password(PASSWORD, stored, salt)
+
+
+async def pool_login(email: str) -> bool:
+    async with PoolManager.get_pool().connection() as connection:
+        return await authenticate_user(connection, email, PASSWORD)
+
+
+async def run(name: str, login, args: argparse.Namespace, emails: list[str]) -> None:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+    lags: list[float] = []
+    stop = asyncio.Event()
+
+    async def one(email: str) -> None:
+        async with semaphore:
+            started = perf_counter()
+            assert await login(email)
+            latencies.append(perf_counter() - started)
+
+    tick = asyncio.create_task(ticker(stop, lags))
+    started = perf_counter()
+    await asyncio.gather(*(one(emails[i % len(emails)]) for i in range(args.logins)))
+    elapsed = perf_counter() - started
+    stop.set()
+    await tick
+
+    ms = np.array(latencies) * 1000
+    print(
+        f"{name:<8} входов/с: {args.logins / elapsed:>7.1f}   "
+        f"p50: {np.percentile(ms, 50):>7.1f} мс   p99: {np.percentile(ms, 99):>7.1f} мс   "
+        f"задержка цикла max: {max(lags, default=0) * 1000:>7.1f} мс"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 4])
+    args = parser.parse_args()
+
+    profile = SQLITE_PROFILES["balanced"]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        await run_migrations(path, profile=profile)
+        PoolManager.init_pool(path, size=args.concurrency, timeout=30, profile=profile)
+        await WriterManager.init_writer(path, profile, batch_size=128, batch_window=0.002)
+
+        # Хеши создаются заранее, чтобы измерять только вход
+        emails = [f"user{i}@example.com" for i in range(args.accounts)]
+        async with PoolManager.get_pool().connection() as connection:
+            await connection.executemany(
+                "INSERT INTO Taxpayers (email, password) VALUES (?, ?)",
+                ((email, hash_password(PASSWORD)) for email in emails)
+            )
+            await connection.commit()
+
+        CacheManager.init_cache(CREDENTIALS_CACHE, max_size=args.accounts, ttl=300)
+        await run("inline", inline_login, args, emails)
+
+        for workers in sorted(set(args.workers)):
+            HasherManager.init_hasher(workers=workers)
+            await run(f"pool-{workers}", pool_login, args, emails)
+            HasherManager.close_hasher()
+
+        await WriterManager.close_writer()
+        await PoolManager.close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+"""
+Бенчмарк ограничителя частоты запросов.
+
+Заполняет TokenBucketLimiter --keys уникальными ключами (как при атаке с множества IP-адресов),
+затем измеряет скорость проверок по уже существующим ключам и расход памяти:
+ - оценку самого ограничителя (memory_usage);
+ - фактический прирост памяти по tracemalloc.
+Последний прогон превышает max_keys вдвое и проверяет, что память не растёт.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/rate_limiter.py --keys 100000
+"""
+
+import argparse
+import random
+import tracemalloc
+from time import perf_counter
+
+import FlatPay.core  # noqa: F401  (инициализирует пакет core до пакета database)
+from FlatPay.core.config import RateLimit
+from FlatPay.utils.rate_limit import TokenBucketLimiter
+
+
+def fill(limiter: TokenBucketLimiter, keys: int, limit: RateLimit) -> float:
+    started = perf_counter()
+    for i in range(keys):
+        limiter.hit(f"login:ip:10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}", limit)
+    return keys / (perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=100000)
+    parser.add_argument("--hits", type=int, default=1000000)
+    args = parser.parse_args()
+
+    limit = RateLimit(requests=10, period=60)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    limiter = TokenBucketLimiter(max_keys=args.keys, idle_ttl=limit.period)
+    rate = fill(limiter, args.keys, limit)
+    traced = tracemalloc.get_traced_memory()[0] - baseline
+    print(f"новые ключи:   {rate:>12.0f} проверок/с")
+    print(f"память:        {limiter.memory_usage() / 2 ** 20:>8.1f} МиБ по оценке, "
+          f"{traced / 2 ** 20:.1f} МиБ по tracemalloc ({traced / args.keys:.0f} байт на ключ)")
+
+    keys = [f"login:ip:10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.keys)]
+    sample = random.choices(keys, k=args.hits)
+    started = perf_counter()
+    for key in sample:
+        limiter.hit(key, limit)
+    print(f"старые ключи:  {args.hits / (perf_counter() - started):>12.0f} проверок/с")
+
+    # Вдвое больше ключей, чем max_keys: старые корзины вытесняются, память не растёт
+    before = tracemalloc.get_traced_memory()[0]
+    fill(limiter, args.keys * 2, RateLimit(requests=10, period=60))
+    grown = tracemalloc.get_traced_memory()[0] - before
+    print(f"переполнение:  {limiter.stats}")
+    print(f"прирост памяти после переполнения: {grown / 2 ** 20:.2f} МиБ")
+
+
+if __name__ == "__main__":
+    main()
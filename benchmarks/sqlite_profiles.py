@@ -0,0 +1,111 @@
+"""
+Бенчмарк профилей производительности SQLite.
+
+Для каждого пресета из SQLITE_PROFILES создаёт временную базу с налогоплательщиками
+и параллельно запускает:
+ - писателей, обновляющих показания отдельных пользователей (по commit на запись);
+ - читателей, запрашивающих долг пользователей;
+ - одну «месячную» задачу, раз в полсекунды переписывающую всю таблицу.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/sqlite_profiles.py --accounts 20000 --duration 5
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+from time import perf_counter
+
+import FlatPay.core  # noqa: F401  (инициализирует пакет core до пакета database)
+from FlatPay.core.config import SQLITE_PROFILES, SQLiteProfile
+from FlatPay.database import ConnectionPool, run_migrations
+
+
+async def seed(pool: ConnectionPool, accounts: int) -> None:
+    """Заполняет таблицу Taxpayers тестовыми пользователями."""
+
+    async with pool.connection() as connection:
+        await connection.executemany(
+            "INSERT INTO Taxpayers (email, password, salt) VALUES (?, '', '')",
+            ((f"user{i}@example.com",) for i in range(accounts))
+        )
+        await connection.commit()
+
+
+async def writer(pool: ConnectionPool, accounts: int, deadline: float, counter: list[int]) -> None:
+    while perf_counter() < deadline:
+        async with pool.connection() as connection:
+            await connection.execute(
+                "UPDATE Taxpayers SET electricity = ?, gas = ? WHERE email = ?",
+                (random.randint(0, 500), random.randint(0, 50), f"user{random.randrange(accounts)}@example.com")
+            )
+            await connection.commit()
+        counter[0] += 1
+
+
+async def reader(pool: ConnectionPool, accounts: int, deadline: float, counter: list[int]) -> None:
+    while perf_counter() < deadline:
+        async with pool.connection() as connection:
+            async with connection.execute(
+                "SELECT current_month_debt FROM Taxpayers WHERE email = ?",
+                (f"user{random.randrange(accounts)}@example.com",)
+            ) as cursor:
+                await cursor.fetchone()
+        counter[0] += 1
+
+
+async def month_job(pool: ConnectionPool, deadline: float, counter: list[int]) -> None:
+    while perf_counter() < deadline:
+        async with pool.connection() as connection:
+            await connection.execute(
+                "UPDATE Taxpayers SET current_month_debt = current_month_debt + next_month_debt, next_month_debt = 0"
+            )
+            await connection.commit()
+        counter[0] += 1
+        await asyncio.sleep(0.5)
+
+
+async def run_profile(name: str, profile: SQLiteProfile, args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        await run_migrations(path, profile=profile)
+
+        pool = ConnectionPool(path, size=args.writers + args.readers + 1, timeout=30, profile=profile)
+        await seed(pool, args.accounts)
+
+        writes, reads, jobs = [0], [0], [0]
+        deadline = perf_counter() + args.duration
+
+        await asyncio.gather(
+            *(writer(pool, args.accounts, deadline, writes) for _ in range(args.writers)),
+            *(reader(pool, args.accounts, deadline, reads) for _ in range(args.readers)),
+            month_job(pool, deadline, jobs)
+        )
+        await pool.close()
+
+    print(
+        f"{name:<10} writes/s: {writes[0] / args.duration:>9.1f}   "
+        f"reads/s: {reads[0] / args.duration:>9.1f}   "
+        f"full-table updates: {jobs[0]:>4}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=20000)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    for name, profile in SQLITE_PROFILES.items():
+        await run_profile(name, profile, args)
+
+    # Исходные настройки SQLite (журнал отката, synchronous=FULL) для сравнения
+    await run_profile("legacy", SQLiteProfile(journal_mode="DELETE", busy_timeout=30000), args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""
+Массовый импорт показаний из CSV-файла управляющей компании.
+
+Файл должен содержать столбцы email, electricity, cold_water, hot_water, gas
+(разделитель — запятая или точка с запятой). Отчёт об импорте в формате JSON
+выводится в stdout или сохраняется в файл --report.
+
+Запуск:
+    PYTHONPATH=src python import_readings.py readings.csv --period 2024-05 --report report.json
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from typing import AsyncIterator
+
+from FlatPay.core import SettingsManager, Config, setup_logger
+from FlatPay.database import PoolManager, WriterManager, run_migrations
+from FlatPay.services.readings import import_readings
+from FlatPay.utils.anomaly import AnomalyManager
+from FlatPay.utils.tariffs import TariffManager
+
+
+async def read_chunks(path: str, size: int = 1 << 16) -> AsyncIterator[bytes]:
+    """Читает файл кусками по `size` байт."""
+
+    with open(path, "rb") as file:
+        while chunk := file.read(size):
+            yield chunk
+
+
+async def main(app_config: Config, args: argparse.Namespace) -> int:
+    """
+    Импортирует файл и выводит отчёт.
+
+    Возвращает:
+     - int: Код завершения: 0 — все строки сохранены, 1 — есть ошибки.
+    """
+
+    await run_migrations(path=app_config.DATABASE_PATH, profile=app_config.SQLITE_PROFILE)
+    PoolManager.init_pool(
+        path=app_config.DATABASE_PATH,
+        size=1,
+        timeout=app_config.DB_POOL_TIMEOUT,
+        profile=app_config.SQLITE_PROFILE
+    )
+    async with PoolManager.get_pool().connection() as connection:
+        await TariffManager.reload(connection)
+    AnomalyManager.init_detector(
+        threshold=app_config.ANOMALY_THRESHOLD,
+        window=app_config.ANOMALY_WINDOW,
+        min_periods=app_config.ANOMALY_MIN_PERIODS
+    )
+    await WriterManager.init_writer(
+        path=app_config.DATABASE_PATH,
+        profile=app_config.SQLITE_PROFILE,
+        batch_size=app_config.WRITER_BATCH_SIZE,
+        batch_window=app_config.WRITER_BATCH_WINDOW
+    )
+
+    try:
+        report = await import_readings(
+            read_chunks(args.path), period=args.period, batch_size=args.batch_size or app_config.IMPORT_BATCH_SIZE
+        )
+    finally:
+        await WriterManager.close_writer()
+        await PoolManager.close_pool()
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as file:
+            file.write(report.model_dump_json(indent=2))
+    else:
+        sys.stdout.write(report.model_dump_json(indent=2) + "\n")
+
+    logger.info(
+        f"Сохранено {report.imported} из {report.rows} строк, отклонено {report.failed}, "
+        f"с аномальным расходом {len(report.warnings)}"
+    )
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV-файл с показаниями")
+    parser.add_argument("--period", help="Период показаний YYYY-MM (по умолчанию — текущий месяц)")
+    parser.add_argument("--batch-size", type=int, help="Строк в одной пачке (по умолчанию — IMPORT_BATCH_SIZE)")
+    parser.add_argument("--report", help="Файл для JSON-отчёта (по умолчанию — stdout)")
+    arguments = parser.parse_args()
+
+    # Загружаем конфигурацию из .env и настраиваем логирование
+    SettingsManager.load_config()
+    config: Config = SettingsManager.get_config()
+    setup_logger(config=config)
+    logger = logging.getLogger("import_readings")
+
+    sys.exit(asyncio.run(main(config, arguments)))
@@ -0,0 +1,66 @@
+"""
+Пакетный перерасчёт оценки долга за следующий месяц у всех пользователей.
+
+Оценка (next_month_debt) считается при отправке показаний по тарифам на последний день периода.
+Если тарифы открытого периода изменились (POST /FlatPay/tariffs), уже отправленные показания
+остаются оценены по старым тарифам — этот скрипт пересчитывает их все страницами по MONTH_CLOSE_CHUNK_SIZE.
+Закрытые периоды пересчитывать не нужно: долг по ним уже перенесён в основной.
+
+Запуск:
+    PYTHONPATH=src python rebill.py --period 2024-05
+"""
+
+import argparse
+import asyncio
+import sys
+
+from FlatPay.core import SettingsManager, Config, setup_logger
+from FlatPay.database import PoolManager, WriterManager, run_migrations
+from FlatPay.services.payments import bill_all_accounts
+from FlatPay.utils.tariffs import TariffManager
+
+
+async def main(app_config: Config, args: argparse.Namespace) -> int:
+    """
+    Пересчитывает оценку долга.
+
+    Возвращает:
+     - int: Код завершения: 0 — долг пересчитан, 1 — ошибка.
+    """
+
+    await run_migrations(path=app_config.DATABASE_PATH, profile=app_config.SQLITE_PROFILE)
+    PoolManager.init_pool(
+        path=app_config.DATABASE_PATH,
+        size=1,
+        timeout=app_config.DB_POOL_TIMEOUT,
+        profile=app_config.SQLITE_PROFILE
+    )
+    async with PoolManager.get_pool().connection() as connection:
+        await TariffManager.reload(connection)
+    await WriterManager.init_writer(
+        path=app_config.DATABASE_PATH,
+        profile=app_config.SQLITE_PROFILE,
+        batch_size=app_config.WRITER_BATCH_SIZE,
+        batch_window=app_config.WRITER_BATCH_WINDOW
+    )
+
+    try:
+        billed = await bill_all_accounts(period=args.period, chunk_size=app_config.MONTH_CLOSE_CHUNK_SIZE)
+    finally:
+        await WriterManager.close_writer()
+        await PoolManager.close_pool()
+
+    return 1 if billed is False else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--period", help="Период расхода YYYY-MM (по умолчанию — текущий месяц)")
+    arguments = parser.parse_args()
+
+    # Загружаем конфигурацию из .env и настраиваем логирование
+    SettingsManager.load_config()
+    config: Config = SettingsManager.get_config()
+    setup_logger(config=config)
+
+    sys.exit(asyncio.run(main(config, arguments)))
@@ -1,60 +1,69 @@
-import asyncio
 import logging
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from importlib.util import find_spec
+
 import uvicorn
 
-from FlatPay.core import setup_app
 from FlatPay.core import SettingsManager, Config, setup_logger
-from FlatPay.tasks import run_scheduler, end_scheduler
 
 
-async def main(app_config: Config):
-    """
-    Основной цикл работы приложения.
-
-    Последовательность действий:
-    1. Инициализация планировщика периодических задач
-    2. Создание экземпляра Quart-приложения
-    3. Запуск ASGI-сервера (Uvicorn) с настройками
-    4. Обработка исключений и корректное завершение работы
-
-    Гарантирует:
-    - Корректное завершение работы планировщика при остановке приложения.
-    - Логирование критических ошибок.
-    - Плавное завершение работы при получении сигнала остановки.
+def server_options(app_config: Config) -> dict:
     """
+    Собирает настройки Uvicorn для выбранного режима сервера.
 
-    # Инициализируем Quart-приложение
-    app = setup_app(app_config.SECRET_KEY)
-    logger.info("Приложение запущено")
+    Режимы:
+    - development: один процесс с автоперезапуском при изменении файлов.
+    - production: без автоперезапуска, SERVER_WORKERS процессов-воркеров,
+      uvloop и httptools (если установлены), настроенные keep-alive и backlog.
 
-    # Инициализируем асинхронный планировщик задач
-    scheduler = AsyncIOScheduler()
-
-    try:
-        # Добавляем задачи и запускаем scheduler
-        run_scheduler(scheduler=scheduler, db_path=app_config.DATABASE_PATH)
-        logger.info("Планировщик задач запущен")
+    Параметры:
+    - app_config (Config): Конфигурация приложения.
 
-        # Конфигурация Uvicorn-сервера (ASGI)
-        server_config = uvicorn.Config(
-            app=app,           # Quart-приложение как ASGI-объект
-            host="127.0.0.1",  # Только локально. Поставь "0.0.0.0", чтобы открыть извне
-            port=5005,         # Порт
-            reload=True        # Автоперезапуск при изменениях (dev-режим)
-        )
+    Возвращает:
+    - dict: Именованные аргументы для uvicorn.run().
+    """
 
-        app.logger.info("Старт сервера на http://127.0.0.1:5005")
+    options = {
+        "host": app_config.SERVER_HOST,
+        "port": app_config.SERVER_PORT,
+        "timeout_keep_alive": app_config.SERVER_KEEPALIVE,
+        "backlog": app_config.SERVER_BACKLOG,
+        "log_config": None  # Логирование уже настроено по YAML-конфигурации
+    }
+
+    if app_config.SERVER_MODE == "development":
+        # Автоперезапуск при изменениях (работает только в одном процессе)
+        options.update(reload=True, reload_dirs=["src"])
+        return options
+
+    # Более быстрые цикл событий и HTTP-парсер — если установлены
+    options.update(
+        workers=app_config.SERVER_WORKERS,
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
+        access_log=False  # Лог каждого запроса заметно снижает пропускную способность
+    )
+    return options
+
+
+def main(app_config: Config) -> None:
+    """
+    Запускает ASGI-сервер (Uvicorn).
 
-        server = uvicorn.Server(server_config)
-        await server.serve()  # Блокирующий запуск
+    Приложение передаётся строкой импорта фабрики "FlatPay.core:create_app":
+    так его может создать каждый процесс-воркер и процесс автоперезапуска.
+    Планировщик задач запускается в каждом воркере, а закрытие месяца выполняет
+    только воркер-лидер (см. FlatPay.tasks.leader).
+    """
 
-    except Exception as e:
-        app.logger.exception(f"Произошла ошибка: {e}")
+    options = server_options(app_config)
+    logger.info(
+        f"Старт сервера на http://{app_config.SERVER_HOST}:{app_config.SERVER_PORT} "
+        f"(режим {app_config.SERVER_MODE}, воркеров: {options.get('workers', 1)}, "
+        f"loop: {options.get('loop', 'auto')}, http: {options.get('http', 'auto')})"
+    )
 
-    finally:
-        end_scheduler(scheduler=scheduler)
-        logger.info("Планировщик задач остановлен")
+    # Блокирующий запуск до остановки сервера
+    uvicorn.run("FlatPay.core:create_app", factory=True, **options)
 
 
 # Точка входа в приложение
@@ -68,8 +77,7 @@ if __name__ == "__main__":
     logger = logging.getLogger("main")
 
     try:
-        # Запускаем event loop и main()
-        asyncio.run(main(app_config=config))
+        main(app_config=config)
 
     except KeyboardInterrupt:
         # Завершение по Ctrl+C
@@ -1,5 +1,14 @@
 from .user import (
     index_handler, register_handler, dashboard_handler, homepage_handler, login_handler, logout_handler
 )
-from .payments import apply_user_payment, get_user_current_debt
-from .readings import update_user_readings, get_readings_info
+from .payments import apply_user_payment, get_user_current_debt, get_user_payments_history
+from .readings import update_user_readings, get_readings_info, import_readings_handler, get_anomalies_handler
+from .analytics import get_analytics_handler, get_arrears_handler
+from .leader import get_leader_handler
+from .pool import get_pool_stats_handler
+from .tariffs import tariffs_handler
+from .api import (
+    api_login_handler, api_logout_handler, api_account_handler, api_debt_handler, api_get_readings_handler,
+    api_update_readings_handler, api_get_payments_handler, api_apply_payment_handler, api_debts_batch_handler,
+    api_readings_batch_handler
+)
@@ -0,0 +1,83 @@
+import logging
+from datetime import date, datetime
+
+import quart as qa
+from quart import Response
+from aiosqlite import Connection
+from pydantic import TypeAdapter
+
+from FlatPay.app.models import ArrearsBucket
+from FlatPay.core.middlewares import get_db_connection, is_manager_request
+from FlatPay.services.analytics import get_monthly_rollup, get_yearly_rollup, get_arrears_distribution
+
+
+# Инициализируем логирование
+logger = logging.getLogger("analytics_handlers")
+
+# Сериализация списка корзин долга в JSON за один проход
+ARREARS_ADAPTER = TypeAdapter(list[ArrearsBucket])
+
+
+async def get_analytics_handler() -> Response:
+    """
+    Обработчик итогов по расходу, начислениям и оплатам (для управляющих компаний).
+
+    GET-запрос:
+     - Проверяет токен из заголовка `Authorization: Bearer <IMPORT_TOKEN>`.
+     - С параметром `period` (YYYY-MM) возвращает итоги за месяц,
+       иначе — итоги за год из параметра `year` (по умолчанию — текущий) с разбивкой по месяцам.
+     - Итоги читаются из заранее посчитанных агрегатов: время ответа не зависит от количества пользователей.
+    """
+
+    request = qa.request
+
+    if not is_manager_request():
+        return Response('{"error": "forbidden"}', status=403, mimetype="application/json")
+
+    period = request.args.get("period")
+    year = request.args.get("year") or str(date.today().year)
+
+    try:
+        if period is not None:
+            datetime.strptime(period, "%Y-%m")
+        else:
+            datetime.strptime(year, "%Y")
+    except ValueError:
+        return Response(
+            '{"error": "period must be YYYY-MM, year must be YYYY"}', status=400, mimetype="application/json"
+        )
+
+    # Получаем соединение с базой данных (из пула — при первом обращении)
+    connection: Connection = await get_db_connection()
+
+    if period is not None:
+        rollup = await get_monthly_rollup(connection, period)
+    else:
+        rollup = await get_yearly_rollup(connection, int(year))
+
+    if rollup is False:
+        return Response('{"error": "internal error"}', status=500, mimetype="application/json")
+
+    return Response(rollup.model_dump_json(), mimetype="application/json")
+
+
+async def get_arrears_handler() -> Response:
+    """
+    Обработчик распределения текущего долга пользователей (для управляющих компаний).
+
+    GET-запрос:
+     - Проверяет токен из заголовка `Authorization: Bearer <IMPORT_TOKEN>`.
+     - Возвращает JSON-список корзин долга с количеством пользователей и суммой долга в каждой.
+    """
+
+    if not is_manager_request():
+        return Response('{"error": "forbidden"}', status=403, mimetype="application/json")
+
+    # Получаем соединение с базой данных (из пула — при первом обращении)
+    connection: Connection = await get_db_connection()
+
+    distribution = await get_arrears_distribution(connection)
+    if distribution is False:
+        return Response('{"error": "internal error"}', status=500, mimetype="application/json")
+
+    return Response(ARREARS_ADAPTER.dump_json(distribution), mimetype="application/json")
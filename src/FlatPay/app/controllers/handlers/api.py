@@ -0,0 +1,301 @@
+import json
+
+import quart as qa
+from quart import session, Response
+from aiosqlite import Connection
+from pydantic import BaseModel, EmailStr, TypeAdapter, ValidationError
+
+from FlatPay.app.models import (
+    User, Readings, Payment, AccountDebt, AccountsRequest, ReadingsBatchRequest, ReadingsRecord, PaymentRecord
+)
+from FlatPay.core.config import SettingsManager
+from FlatPay.core.middlewares import get_db_connection, is_manager_request, account_etag
+from FlatPay.services.payments import apply_payment, get_current_debts, get_payment_history
+from FlatPay.services.readings import update_readings, get_readings_history, submit_readings_batch
+from FlatPay.services.user import authenticate_user, get_account_summary
+from FlatPay.utils.validators import is_authenticated
+
+# Сериализация списков моделей в JSON за один проход (pydantic-core, без промежуточных словарей)
+READINGS_ADAPTER = TypeAdapter(list[ReadingsRecord])
+PAYMENTS_ADAPTER = TypeAdapter(list[PaymentRecord])
+DEBTS_ADAPTER = TypeAdapter(list[AccountDebt])
+
+
+def json_response(body: BaseModel | bytes | str, status: int = 200) -> Response:
+    """
+    Создаёт JSON-ответ из модели (сериализуется сразу в байты) или из готового JSON.
+
+    Параметры:
+     - body (BaseModel | bytes | str): Модель или готовый JSON.
+     - status (int): Код ответа.
+
+    Возвращаемое значение:
+     - Response: Ответ с типом application/json.
+    """
+
+    if isinstance(body, BaseModel):
+        body = body.model_dump_json()
+
+    return Response(body, status=status, mimetype="application/json")
+
+
+def json_error(message: str, status: int) -> Response:
+    """Создаёт JSON-ответ с ошибкой: {"error": "<message>"}."""
+
+    return json_response(f'{{"error": "{message}"}}', status)
+
+
+async def parse_body(model: type[BaseModel]) -> BaseModel | Response:
+    """
+    Проверяет JSON-тело запроса моделью напрямую из байт (без промежуточного json.loads).
+
+    Параметры:
+     - model (type[BaseModel]): Модель тела запроса.
+
+    Возвращаемое значение:
+     - BaseModel: Проверенное тело запроса.
+     - Response: Ответ 400 с описанием ошибок, если тело некорректно.
+    """
+
+    try:
+        return model.model_validate_json(await qa.request.get_data())
+    except ValidationError as e:
+        return json_response(e.json(include_url=False, include_input=False), 400)
+
+
+async def api_login_handler() -> Response:
+    """
+    Обработчик входа через API.
+
+    POST-запрос:
+     - Принимает JSON {"email", "password"}; при успехе создаёт сессию (cookie), как и вход через форму.
+     - Возвращает 200 с email пользователя, 400 — если тело некорректно, 401 — если пароль не подошёл.
+    """
+
+    user = await parse_body(User)
+    if isinstance(user, Response):
+        return user
+
+    # Получаем соединение с базой данных (из пула — при первом обращении)
+    connection: Connection = await get_db_connection()
+
+    if not await authenticate_user(connection, user.email, user.password):
+        return json_error("invalid credentials", 401)
+
+    session["user_email"] = user.email
+    session["logged_in"] = True
+    return json_response(json.dumps({"email": user.email}))
+
+
+async def api_logout_handler() -> Response:
+    """Обработчик выхода через API: очищает сессию и возвращает 204."""
+
+    session.clear()
+    return Response("", status=204)
+
+
+async def api_account_handler() -> Response:
+    """
+    Обработчик сводки по аккаунту.
+
+    GET-запрос:
+     - Возвращает долг, последний платёж, оценку долга за месяц и историю показаний одним ответом
+       (AccountSummary) — то же, что показывают домашняя страница, страницы долга и показаний.
+     - Поддерживает условный запрос: при совпадении If-None-Match отвечает 304 без сериализации.
+    """
+
+    if not is_authenticated():
+        return json_error("unauthorized", 401)
+
+    email: EmailStr = session.get("user_email")
+    summary = await get_account_summary(await get_db_connection(), email)
+    if summary is False:
+        return json_error("account not found", 404)
+
+    etag = account_etag(email, summary.version, "api")
+    if qa.request.if_none_match.contains_weak(etag):
+        response = Response("", status=304)
+    else:
+        response = json_response(summary)
+
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+async def api_debt_handler() -> Response:
+    """
+    Обработчик текущего долга пользователя.
+
+    GET-запрос:
+     - Возвращает {"email", "current_debt"} из сводки по аккаунту.
+    """
+
+    if not is_authenticated():
+        return json_error("unauthorized", 401)
+
+    email: EmailStr = session.get("user_email")
+    summary = await get_account_summary(await get_db_connection(), email)
+    if summary is False:
+        return json_error("account not found", 404)
+
+    return json_response(AccountDebt(email=email, current_debt=summary.current_debt))
+
+
+async def api_get_readings_handler() -> Response:
+    """
+    Обработчик истории показаний пользователя.
+
+    GET-запрос:
+     - Возвращает историю показаний (за период из параметров `since`/`until`, если они заданы).
+    """
+
+    request = qa.request
+
+    if not is_authenticated():
+        return json_error("unauthorized", 401)
+
+    history = await get_readings_history(
+        await get_db_connection(), session.get("user_email"),
+        since=request.args.get("since"), until=request.args.get("until")
+    )
+    if history is False:
+        return json_error("internal error", 500)
+
+    return json_response(READINGS_ADAPTER.dump_json(history))
+
+
+async def api_update_readings_handler() -> Response:
+    """
+    Обработчик отправки показаний пользователя.
+
+    POST-запрос:
+     - Принимает JSON {"meter_readings": {...}}, сохраняет показания и пересчитывает долг на следующий месяц.
+     - Возвращает расход за период и счётчики с аномальным расходом (SubmittedReadings).
+    """
+
+    if not is_authenticated():
+        return json_error("unauthorized", 401)
+
+    email: EmailStr = session.get("user_email")
+
+    readings = await parse_body(Readings)
+    if isinstance(readings, Response):
+        return readings
+
+    # Сохраняем показания и пересчитываем задолженность по расходу за месяц (как при отправке формы)
+    submitted = await update_readings(email, readings)
+    if submitted is None:
+        return json_error("readings rejected", 422)
+
+    return json_response(submitted)
+
+
+async def api_get_payments_handler() -> Response:
+    """
+    Обработчик истории платежей пользователя.
+
+    GET-запрос:
+     - Возвращает историю платежей (за период из параметров `since`/`until`, если они заданы).
+    """
+
+    request = qa.request
+
+    if not is_authenticated():
+        return json_error("unauthorized", 401)
+
+    history = await get_payment_history(
+        await get_db_connection(), session.get("user_email"),
+        since=request.args.get("since"), until=request.args.get("until")
+    )
+    if history is False:
+        return json_error("internal error", 500)
+
+    return json_response(PAYMENTS_ADAPTER.dump_json(history))
+
+
+async def api_apply_payment_handler() -> Response:
+    """
+    Обработчик оплаты задолженности.
+
+    POST-запрос:
+     - Принимает JSON {"amount", "idempotency_key"} и применяет платёж; повтор с тем же ключом не списывает
+       сумму повторно, а тот же ключ с другой суммой отклоняется (422).
+     - Возвращает {"email", "current_debt"} после платежа.
+    """
+
+    if not is_authenticated():
+        return json_error("unauthorized", 401)
+
+    email: EmailStr = session.get("user_email")
+
+    payment = await parse_body(Payment)
+    if isinstance(payment, Response):
+        return payment
+
+    if not await apply_payment(email, payment):
+        return json_error("payment rejected", 422)
+
+    # Сводка после платежа уже удалена из кэша и читается заново
+    summary = await get_account_summary(await get_db_connection(), email)
+    if summary is False:
+        return json_error("internal error", 500)
+
+    return json_response(AccountDebt(email=email, current_debt=summary.current_debt))
+
+
+async def api_debts_batch_handler() -> Response:
+    """
+    Обработчик пакетного получения долгов (для управляющих компаний).
+
+    POST-запрос:
+     - Проверяет токен из заголовка `Authorization: Bearer <IMPORT_TOKEN>`.
+     - Принимает JSON {"emails": [...]} (не больше API_BATCH_LIMIT) и возвращает долги всех пользователей
+       одним запросом к базе: список {"email", "current_debt"} в порядке запроса (null — пользователь не найден).
+    """
+
+    if not is_manager_request():
+        return json_error("forbidden", 403)
+
+    accounts = await parse_body(AccountsRequest)
+    if isinstance(accounts, Response):
+        return accounts
+
+    if len(accounts.emails) > SettingsManager.get_config().API_BATCH_LIMIT:
+        return json_error("batch too large", 413)
+
+    debts = await get_current_debts(await get_db_connection(), accounts.emails)
+    if debts is False:
+        return json_error("internal error", 500)
+
+    return json_response(DEBTS_ADAPTER.dump_json(debts))
+
+
+async def api_readings_batch_handler() -> Response:
+    """
+    Обработчик пакетной отправки показаний (для управляющих компаний).
+
+    POST-запрос:
+     - Проверяет токен из заголовка `Authorization: Bearer <IMPORT_TOKEN>`.
+     - Принимает JSON {"period", "readings": [{"email", "meter_readings"}, ...]} (не больше API_BATCH_LIMIT)
+       и сохраняет все показания одной операцией записи.
+     - Возвращает отчёт ImportReport: номер строки в ошибках — позиция в списке `readings`, начиная с 1.
+    """
+
+    if not is_manager_request():
+        return json_error("forbidden", 403)
+
+    batch = await parse_body(ReadingsBatchRequest)
+    if isinstance(batch, Response):
+        return batch
+
+    if len(batch.readings) > SettingsManager.get_config().API_BATCH_LIMIT:
+        return json_error("batch too large", 413)
+
+    try:
+        report = await submit_readings_batch(batch.readings, period=batch.period)
+    except ValueError:
+        return json_error("period must be YYYY-MM", 400)
+
+    return json_response(report)
@@ -0,0 +1,28 @@
+import json
+from dataclasses import asdict
+
+from quart import Response
+
+from FlatPay.core.middlewares import is_manager_request
+from FlatPay.tasks import LeaderManager
+
+
+async def get_leader_handler() -> Response:
+    """
+    Обработчик состояния выбора лидера фоновых задач (для управляющих компаний и мониторинга).
+
+    GET-запрос:
+     - Проверяет токен из заголовка `Authorization: Bearer <IMPORT_TOKEN>`.
+     - Возвращает JSON с состоянием аренды в процессе, обработавшем запрос (LeaseState):
+       является ли он лидером, до какого времени действует аренда, счётчики выборов, продлений и ошибок.
+     - Отвечает 503, если выбор лидера в процессе не запущен.
+    """
+
+    if not is_manager_request():
+        return Response('{"error": "forbidden"}', status=403, mimetype="application/json")
+
+    state = LeaderManager.get_state()
+    if state is None:
+        return Response('{"error": "leader election is not running"}', status=503, mimetype="application/json")
+
+    return Response(json.dumps(asdict(state)), mimetype="application/json")
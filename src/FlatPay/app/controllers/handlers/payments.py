@@ -1,9 +1,13 @@
+from uuid import uuid4
+
 import quart as qa
-from quart import g, session
+from quart import session, Response
 from aiosqlite import Connection
 from pydantic import EmailStr
 
-from FlatPay.services.payments import apply_payment, get_current_debt
+from FlatPay.core.middlewares import get_db_connection, account_etag, render_conditional
+from FlatPay.services.payments import apply_payment, get_payment_history
+from FlatPay.services.user import get_account_summary
 from FlatPay.app.models.models import Payment
 
 
@@ -23,31 +27,37 @@ async def apply_user_payment() -> str:
     """
 
     request = qa.request
-    # Получаем соединение с базой данных
-    connection: Connection = g.db_conn
     # Получаем email пользователя из сессии
     email: EmailStr = session.get("user_email")
 
     if request.method == "GET":
-        # Возвращаем страницу с формой для оплаты задолженности
-        return await qa.render_template("apply_payment.html")
+        # Возвращаем страницу с формой для оплаты задолженности.
+        # Ключ идемпотентности защищает от повторного списания при повторной отправке формы
+        return await qa.render_template("apply_payment.html", idempotency_key=uuid4().hex)
 
     elif request.method == "POST":
         form_data: dict = await request.form  # Получаем данные из формы
-        new_payment: Payment = Payment(amount=form_data.get("new_payment"))  # Создаём объект платежа
 
         try:
-            # Применяем платёж и обновляем данные пользователя в БД
-            await apply_payment(connection, email, new_payment)
+            # Создаём объект платежа
+            new_payment: Payment = Payment(
+                amount=form_data.get("new_payment"),
+                idempotency_key=form_data.get("idempotency_key") or None
+            )
+        except ValueError:
+            # Если сумма некорректна, возвращаем страницу с ошибкой
+            return await qa.render_template("lose_update_debt.html")
+
+        # Применяем платёж и обновляем данные пользователя в БД
+        if await apply_payment(email, new_payment):
             # Если оплата успешна, возвращаем страницу с подтверждением
             return await qa.render_template("successful_apply_payment.html", email=email)
 
-        except ValueError:
-            # В случае ошибки при попытке оплаты, возвращаем страницу с ошибкой
-            return await qa.render_template("lose_update_debt.html")
+        # В случае ошибки при попытке оплаты, возвращаем страницу с ошибкой
+        return await qa.render_template("lose_update_debt.html")
 
 
-async def get_user_current_debt() -> str | None:
+async def get_user_current_debt() -> Response | str | None:
     """
     Обработчик страницы получения информации о задолженности.
 
@@ -57,27 +67,62 @@ async def get_user_current_debt() -> str | None:
     POST-запрос:
      - Получает информацию о задолженности пользователя.
      - Если данные получены успешно, отображает страницу с информацией о задолженности, иначе — ошибку.
+     - Если у клиента актуальная версия страницы (If-None-Match), отвечает 304 без рендеринга.
 
     Возвращаемое значение:
-     - str: HTML-страница с результатом или ошибкой.
+     - Response | str: HTML-страница с результатом, ответ 304 или страница с ошибкой.
     """
 
     # Обрабатываем только GET-запрос
     request = qa.request
-    # Получаем соединение с базой данных
-    connection: Connection = g.db_conn
     # Получаем email пользователя из сессии
     email: EmailStr = session.get("user_email")
 
     if request.method == "GET":
-        # Получаем текущую задолженность пользователя
-        current_debt: float = await get_current_debt(connection, email)
+        # Получаем соединение с базой данных (из пула — при первом обращении)
+        connection: Connection = await get_db_connection()
+
+        # Получаем сводку по аккаунту (текущая задолженность и версия аккаунта для ETag)
+        summary = await get_account_summary(connection, email)
 
-        if current_debt is not False:
+        if summary is not False:
             # Если задолженность найдена, возвращаем страницу с информацией о задолженности
-            return await qa.render_template("get_current_month_debt.html",
+            return await render_conditional(account_etag(email, summary.version),
+                                            "get_current_month_debt.html",
                                             email=email,
-                                            current_debt=current_debt)
+                                            current_debt=summary.current_debt)
 
         # Если задолженность не найдена, возвращаем страницу с ошибкой
         return await qa.render_template("lose_get_debt.html")
+
+
+async def get_user_payments_history() -> str:
+    """
+    Обработчик страницы истории платежей.
+
+    GET-запрос:
+     - Получает платежи пользователя (за период из параметров `since`/`until`, если они заданы).
+     - Отображает таблицу платежей с остатком долга после каждого платежа, иначе — ошибку.
+
+    Возвращаемое значение:
+     - str: HTML-страница с историей платежей или ошибкой.
+    """
+
+    request = qa.request
+    # Получаем email пользователя из сессии
+    email: EmailStr = session.get("user_email")
+
+    if request.method == "GET":
+        # Получаем соединение с базой данных (из пула — при первом обращении)
+        connection: Connection = await get_db_connection()
+
+        # Получаем историю платежей пользователя
+        history = await get_payment_history(
+            connection, email, since=request.args.get("since"), until=request.args.get("until")
+        )
+
+        if history is not False:
+            return await qa.render_template("payments_history.html", email=email, history=history)
+
+        # Если историю получить не удалось, возвращаем страницу с ошибкой
+        return await qa.render_template("lose_get_debt.html")
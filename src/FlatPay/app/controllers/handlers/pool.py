@@ -0,0 +1,25 @@
+import json
+from dataclasses import asdict
+
+from quart import Response
+
+from FlatPay.core.middlewares import is_manager_request
+from FlatPay.database import PoolManager
+
+
+async def get_pool_stats_handler() -> Response:
+    """
+    Обработчик статистики пула соединений с базой данных (для управляющих компаний и мониторинга).
+
+    GET-запрос:
+     - Проверяет токен из заголовка `Authorization: Bearer <IMPORT_TOKEN>`.
+     - Возвращает JSON со статистикой пула в процессе, обработавшем запрос (PoolStats):
+       занятые и свободные соединения, ожидающие корутины, таймауты, суммарное, среднее и максимальное
+       время ожидания соединения.
+    """
+
+    if not is_manager_request():
+        return Response('{"error": "forbidden"}', status=403, mimetype="application/json")
+
+    stats = PoolManager.get_pool().stats
+    return Response(json.dumps({**asdict(stats), "avg_wait_time": stats.avg_wait_time}), mimetype="application/json")
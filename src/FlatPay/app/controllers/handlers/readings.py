@@ -1,19 +1,28 @@
 import logging
+from datetime import datetime
 
 import quart as qa
-from quart import g, session
+from quart import session, Response
 from aiosqlite import Connection
-from pydantic import EmailStr
-
-from FlatPay.app.models import Readings
-from FlatPay.services.payments import update_next_debt
+from pydantic import EmailStr, TypeAdapter
+
+from FlatPay.app.models import Readings, ReadingsAnomaly
+from FlatPay.core.config import SettingsManager
+from FlatPay.core.middlewares import get_db_connection, is_manager_request, account_etag, render_conditional
+from FlatPay.services.user import get_account_summary
+from FlatPay.services.readings import (
+    update_readings, get_readings_history, import_readings, scan_anomalies, readings_period
+)
+from FlatPay.utils.anomaly import AnomalyManager
 from FlatPay.utils.validators import is_early
-from FlatPay.database.repositories.readings_repo import fetch_user_readings_repo, update_user_readings_repo
 
 
 # Инициализируем логирование
 logger = logging.getLogger("readings_handlers")
 
+# Сериализация списка аномалий в JSON за один проход (без промежуточных словарей)
+ANOMALIES_ADAPTER = TypeAdapter(list[ReadingsAnomaly])
+
 
 async def update_user_readings() -> str:
     """
@@ -24,13 +33,13 @@ async def update_user_readings() -> str:
      - Иначе — отображает форму для ввода показаний.
 
     POST-запрос:
-     - Валидирует данные показаний счётчиков и обновляет задолженность пользователя.
-     - Возвращает HTML-страницу с оповещением об успешном обновлении или с сообщением об ошибке.
+     - Сохраняет текущие значения счётчиков в историю показаний и пересчитывает
+       задолженность пользователя по расходу за месяц.
+     - Возвращает HTML-страницу с оповещением об успешном обновлении (и просьбой перепроверить
+       счётчики с аномальным расходом) или с сообщением об ошибке.
     """
 
     request = qa.request
-    # Получаем соединение с базой данных
-    connection: Connection = g.db_conn
     # Получаем email пользователя из сессии
     email: EmailStr = session.get("user_email")
 
@@ -51,61 +60,120 @@ async def update_user_readings() -> str:
             }
         )
 
-        try:
-            # Обновляем показания и задолженность пользователя
-            await update_user_readings_repo(connection, email, readings)
-            await update_next_debt(connection, email, readings)
-
+        # Сохраняем показания и пересчитываем задолженность по расходу за месяц (одна транзакция)
+        submitted = await update_readings(email, readings)
+        if submitted is not None:
             # Отправляем страницу с подтверждением успеха
-            return await qa.render_template("successful_update_readings.html", email=email)
-
-        except Exception as e:
-            logger.error(f"Ошибка при обновлении показаний для {email}: {e}")
+            return await qa.render_template(
+                "successful_update_readings.html", email=email, anomalies=submitted.anomalies
+            )
 
-            # Отправляем страницу с ошибкой
-            return await qa.render_template("lose_update_readings.html")
+        # Отправляем страницу с ошибкой
+        return await qa.render_template("lose_update_readings.html")
 
 
-async def get_readings_info() -> str:
+async def get_readings_info() -> Response | str:
     """
     Обработчик получения показаний счётчиков.
 
     GET-запрос:
-        - Извлекает email пользователя из сессии, получает показания из базы данных
-          и отображает их в HTML-формате.
+        - Извлекает email пользователя из сессии, получает историю показаний
+          (за период из параметров `since`/`until`, если они заданы) и отображает её в HTML-формате.
+        - Если у клиента актуальная версия страницы (If-None-Match), отвечает 304 без чтения истории и рендеринга.
 
     Возвращаемое значение:
-        - str: HTML-страница с информацией о показаниях или с сообщением об ошибке.
+        - Response | str: HTML-страница с информацией о показаниях, ответ 304 или страница с ошибкой.
     """
 
     # Обрабатываем только GET-запрос
     request = qa.request
-    # Получаем соединение с базой данных
-    connection: Connection = g.db_conn
     # Получаем email пользователя из сессии
     email: EmailStr = session.get("user_email")
 
     if request.method == "GET":
+        # Получаем соединение с базой данных (из пула — при первом обращении)
+        connection: Connection = await get_db_connection()
 
-        try:
-            # Получаем показания из базы
-            readings = await fetch_user_readings_repo(connection, email)
+        # Версия аккаунта берётся из сводки (обычно из кэша): ETag проверяется до чтения истории
+        summary = await get_account_summary(connection, email)
+        threshold = AnomalyManager.get_detector().threshold
 
-            # Делаем распаковку значений для удобства
-            electricity, cold_water, hot_water, gas = readings
+        if summary is not False:
+            etag = account_etag(email, summary.version, threshold)
+            if request.if_none_match.contains_weak(etag):
+                return await render_conditional(etag, "user_readings.html")
 
-            # Отправляем страницу с показаниями
-            return await qa.render_template(
-                "user_readings.html",
-                email=email,
-                electricity=electricity,
-                cold_water=cold_water,
-                hot_water=hot_water,
-                gas=gas
+            # Получаем историю показаний пользователя
+            history = await get_readings_history(
+                connection, email, since=request.args.get("since"), until=request.args.get("until")
             )
 
-        except Exception as e:
-            logger.error(f"Ошибка при получении показаний для {email}: {e}")
+            if history is not False:
+                return await render_conditional(
+                    etag, "user_readings.html", email=email, history=history, threshold=threshold
+                )
+
+        # Если историю получить не удалось, возвращаем страницу с ошибкой
+        return await qa.render_template("lose_get_readings.html")
+
+
+async def import_readings_handler() -> Response:
+    """
+    Обработчик массового импорта показаний из CSV (для управляющих компаний).
+
+    POST-запрос:
+     - Проверяет токен из заголовка `Authorization: Bearer <IMPORT_TOKEN>`;
+       если IMPORT_TOKEN не задан, импорт через HTTP отключён.
+     - Потоково читает тело запроса (text/csv) со столбцами email, electricity, cold_water, hot_water, gas
+       и сохраняет показания за период из параметра `period` (по умолчанию — текущий месяц).
+     - Возвращает JSON-отчёт с количеством сохранённых строк и ошибками по строкам.
+    """
+
+    request = qa.request
+    config = SettingsManager.get_config()
+
+    if not is_manager_request():
+        return Response('{"error": "forbidden"}', status=403, mimetype="application/json")
+
+    try:
+        # Тело запроса читается кусками по мере поступления, файл целиком в памяти не собирается
+        report = await import_readings(
+            request.body, period=request.args.get("period"), batch_size=config.IMPORT_BATCH_SIZE
+        )
+
+    except ValueError:
+        return Response('{"error": "period must be YYYY-MM"}', status=400, mimetype="application/json")
+
+    return Response(report.model_dump_json(), mimetype="application/json")
+
+
+async def get_anomalies_handler() -> Response:
+    """
+    Обработчик списка аномальных показаний за период (для управляющих компаний).
+
+    GET-запрос:
+     - Проверяет токен из заголовка `Authorization: Bearer <IMPORT_TOKEN>`.
+     - Оценивает расход всех пользователей за период из параметра `period` (по умолчанию — текущий месяц)
+       по их статистике прошлых месяцев.
+     - Возвращает JSON-список пользователей с аномальным расходом: расход, ожидаемый расход и z-score.
+    """
+
+    request = qa.request
+
+    if not is_manager_request():
+        return Response('{"error": "forbidden"}', status=403, mimetype="application/json")
+
+    period = request.args.get("period") or readings_period()
+    try:
+        datetime.strptime(period, "%Y-%m")
+    except ValueError:
+        return Response('{"error": "period must be YYYY-MM"}', status=400, mimetype="application/json")
+
+    # Получаем соединение с базой данных (из пула — при первом обращении)
+    connection: Connection = await get_db_connection()
+
+    anomalies = await scan_anomalies(connection, period)
+    if anomalies is False:
+        return Response('{"error": "internal error"}', status=500, mimetype="application/json")
 
-            # Возвращаем страницу с ошибкой
-            return await qa.render_template("error_readings.html")
+    return Response(ANOMALIES_ADAPTER.dump_json(anomalies), mimetype="application/json")
@@ -0,0 +1,54 @@
+import quart as qa
+from quart import Response
+from pydantic import TypeAdapter
+
+from FlatPay.app.controllers.handlers.api import json_error, json_response, parse_body
+from FlatPay.app.models import TariffVersion
+from FlatPay.core.middlewares import is_manager_request
+from FlatPay.services.payments import set_tariff
+from FlatPay.utils.tariffs import TariffManager, METERS
+
+
+# Сериализация расписания тарифов в JSON за один проход
+TARIFFS_ADAPTER = TypeAdapter(list[TariffVersion])
+
+
+def schedule_response() -> Response:
+    """Возвращает расписание тарифов этого процесса: версии по возрастанию даты начала действия."""
+
+    schedule = TariffManager.get_schedule()
+    versions = [
+        TariffVersion(effective_from=effective_from, **tariffs)
+        for effective_from, tariffs in zip(schedule.dates, schedule.tariffs)
+    ]
+    return json_response(TARIFFS_ADAPTER.dump_json(versions))
+
+
+async def tariffs_handler() -> Response:
+    """
+    Обработчик тарифов (для управляющих компаний).
+
+    Проверяет токен из заголовка `Authorization: Bearer <IMPORT_TOKEN>`.
+
+    GET-запрос:
+     - Возвращает расписание тарифов, по которому считает долг процесс, обработавший запрос.
+
+    POST-запрос:
+     - Принимает JSON {"effective_from", "electricity", "cold_water", "hot_water", "gas"} и добавляет
+       (или заменяет) версию тарифов с указанной даты; возвращает новое расписание.
+     - Процесс, обработавший запрос, перезагружает тарифы сразу, остальные — при следующей проверке
+       тарифов (TARIFF_CHECK_INTERVAL).
+    """
+
+    if not is_manager_request():
+        return json_error("forbidden", 403)
+
+    if qa.request.method == "POST":
+        version = await parse_body(TariffVersion)
+        if isinstance(version, Response):
+            return version
+
+        if not await set_tariff(version.effective_from, {meter: getattr(version, meter) for meter in METERS}):
+            return json_error("internal error", 500)
+
+    return schedule_response()
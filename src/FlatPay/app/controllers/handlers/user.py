@@ -1,10 +1,11 @@
 import quart as qa
-from quart import g, session, url_for, Response
+from quart import session, url_for, Response
 from aiosqlite import Connection
-from pydantic import ValidationError
+from pydantic import EmailStr, ValidationError
 
-from FlatPay.services.user import register_user
-from FlatPay.utils.validators import is_correct_password, is_authenticated
+from FlatPay.core.middlewares import get_db_connection, account_etag, render_conditional
+from FlatPay.services.user import register_user, authenticate_user, get_account_summary
+from FlatPay.utils.validators import is_authenticated
 from FlatPay.app.models import User
 
 
@@ -37,8 +38,6 @@ async def register_handler() -> Response | str:
     """
 
     request = qa.request
-    # Получаем соединение с базой данных
-    connection: Connection = g.db_conn
 
     if request.method == "GET":
         # Показываем форму регистрации
@@ -55,7 +54,7 @@ async def register_handler() -> Response | str:
             return await qa.render_template("lose_register.html")
 
         # Пытаемся зарегистрировать пользователя
-        if await register_user(connection, user.email, user.password):
+        if await register_user(user.email, user.password):
             # Устанавливаем сессионные значения
             session["user_email"] = user.email
             session["logged_in"] = True
@@ -81,8 +80,6 @@ async def login_handler() -> Response | str:
     """
 
     request = qa.request
-    # Получаем соединение с базой данных
-    connection: Connection = g.db_conn
     # Получаем email пользователя из сессии
 
     # Обработка GET-запроса: отображение формы входа
@@ -100,23 +97,20 @@ async def login_handler() -> Response | str:
             # Ошибка валидации формы (например, пустой email или короткий пароль)
             return await qa.render_template("lose_login.html")
 
-        try:
-            # Проверяем, корректен ли пароль (с учётом соли)
-            if await is_correct_password(connection, user.email, user.password):
-                # Устанавливаем сессию при успешной авторизации
-                session["user_email"] = user.email
-                session["logged_in"] = True
+        # Получаем соединение с базой данных (из пула — при первом обращении)
+        connection: Connection = await get_db_connection()
 
-                # Перенаправляем пользователя в его кабинет
-                return qa.redirect(url_for("blueprint.homepage"))
+        # Проверяем пароль (хеширование выполняется вне цикла событий)
+        if await authenticate_user(connection, user.email, user.password):
+            # Устанавливаем сессию при успешной авторизации
+            session["user_email"] = user.email
+            session["logged_in"] = True
 
-            else:
-                # Если пароль не совпал
-                return await qa.render_template("lose_login.html")
+            # Перенаправляем пользователя в его кабинет
+            return qa.redirect(url_for("blueprint.homepage"))
 
-        except TypeError:
-            # Если пользователь не зарегистрирован, то salt = None — is_correct_password вызывает TypeError
-            return await qa.render_template("lose_login.html")
+        # Если пароль не совпал или пользователь не зарегистрирован
+        return await qa.render_template("lose_login.html")
 
 
 def dashboard_handler() -> Response | None:
@@ -144,16 +138,28 @@ async def homepage_handler() -> Response | str:
     """
     Обработчик домашней страницы пользователя.
 
-    Проверяет, авторизован ли пользователь, и отображает домашнюю
-    страницу с адресом его электронной почты, только при активной сессии.
-    В противном случае перенаправляет на страницу входа.
+    Проверяет, авторизован ли пользователь, и отображает домашнюю страницу со сводкой
+    по аккаунту (долг, последний платёж, оценка долга за месяц, последние показания),
+    только при активной сессии. В противном случае перенаправляет на страницу входа.
+    Если у клиента актуальная версия страницы (If-None-Match), отвечает 304 без рендеринга.
 
     Возвращаемое значение:
-     - Response | str: HTML-страница homepage.html или редирект на страницу входа.
+     - Response | str: HTML-страница homepage.html, ответ 304 или редирект на страницу входа.
     """
 
     if is_authenticated():
-        return await qa.render_template("homepage.html", email=session.get("user_email"))
+        email: EmailStr = session.get("user_email")
+
+        # Получаем соединение с базой данных (из пула — при первом обращении)
+        connection: Connection = await get_db_connection()
+
+        # Сводка читается одним запросом (или из кэша аккаунтов); без неё страница показывает только ссылки
+        summary = await get_account_summary(connection, email)
+        if summary is False:
+            return await qa.render_template("homepage.html", email=email, summary=None)
+
+        return await render_conditional(account_etag(email, summary.version), "homepage.html",
+                                        email=email, summary=summary)
 
     return qa.redirect(url_for("blueprint.login"))  # Перенаправляют на страницу авторизации
 
@@ -1 +1,2 @@
 from .routes import blueprint
+from .api import api_blueprint
@@ -0,0 +1,62 @@
+import quart as qa
+
+from FlatPay.app.controllers.handlers import (
+    api_login_handler, api_logout_handler, api_account_handler, api_debt_handler, api_get_readings_handler,
+    api_update_readings_handler, api_get_payments_handler, api_apply_payment_handler, api_debts_batch_handler,
+    api_readings_batch_handler
+)
+
+
+# JSON API версии 1. Имена POST-маршрутов совпадают с HTML-маршрутами (login, update_readings, update_debt),
+# поэтому на них действуют те же ограничения частоты запросов (RATE_LIMITS)
+api_blueprint = qa.Blueprint('api_v1', __name__)
+
+
+@api_blueprint.route("/login", methods=["POST"])
+async def login():
+    return await api_login_handler()
+
+
+@api_blueprint.route("/logout", methods=["POST"])
+async def logout():
+    return await api_logout_handler()
+
+
+@api_blueprint.route("/account", methods=["GET"])
+async def account():
+    return await api_account_handler()
+
+
+@api_blueprint.route("/debt", methods=["GET"])
+async def debt():
+    return await api_debt_handler()
+
+
+@api_blueprint.route("/readings", methods=["GET"])
+async def readings():
+    return await api_get_readings_handler()
+
+
+@api_blueprint.route("/readings", methods=["POST"])
+async def update_readings():
+    return await api_update_readings_handler()
+
+
+@api_blueprint.route("/payments", methods=["GET"])
+async def payments():
+    return await api_get_payments_handler()
+
+
+@api_blueprint.route("/payments", methods=["POST"])
+async def update_debt():
+    return await api_apply_payment_handler()
+
+
+@api_blueprint.route("/debts/batch", methods=["POST"])
+async def debts_batch():
+    return await api_debts_batch_handler()
+
+
+@api_blueprint.route("/readings/batch", methods=["POST"])
+async def readings_batch():
+    return await api_readings_batch_handler()
@@ -2,7 +2,9 @@ import quart as qa
 
 from FlatPay.app.controllers.handlers import (
     index_handler, register_handler, dashboard_handler, homepage_handler, update_user_readings,
-    login_handler, get_readings_info, apply_user_payment, get_user_current_debt, logout_handler
+    login_handler, get_readings_info, apply_user_payment, get_user_current_debt, logout_handler,
+    get_user_payments_history, import_readings_handler, get_anomalies_handler, get_analytics_handler,
+    get_arrears_handler, get_leader_handler, get_pool_stats_handler, tariffs_handler
 )
 
 
@@ -49,6 +51,41 @@ async def get_readings():
     return await get_readings_info()
 
 
+@blueprint.route("/import_readings", methods=["POST"])
+async def import_readings():
+    return await import_readings_handler()
+
+
+@blueprint.route("/anomalies", methods=["GET"])
+async def anomalies():
+    return await get_anomalies_handler()
+
+
+@blueprint.route("/analytics", methods=["GET"])
+async def analytics():
+    return await get_analytics_handler()
+
+
+@blueprint.route("/analytics/arrears", methods=["GET"])
+async def analytics_arrears():
+    return await get_arrears_handler()
+
+
+@blueprint.route("/leader", methods=["GET"])
+async def leader():
+    return await get_leader_handler()
+
+
+@blueprint.route("/pool", methods=["GET"])
+async def pool():
+    return await get_pool_stats_handler()
+
+
+@blueprint.route("/tariffs", methods=["GET", "POST"])
+async def tariffs():
+    return await tariffs_handler()
+
+
 @blueprint.route("/update_debt", methods=["POST", "GET"])
 async def update_debt():
     return await apply_user_payment()
@@ -57,3 +94,8 @@ async def update_debt():
 @blueprint.route("/get_debt", methods=["POST", "GET"])
 async def get_debt():
     return await get_user_current_debt()
+
+
+@blueprint.route("/payments_history", methods=["GET"])
+async def payments_history():
+    return await get_user_payments_history()
@@ -1 +1,5 @@
-from .models import Readings, Payment, User
+from .models import (
+    Readings, Payment, User, PaymentRecord, ReadingsRecord, ReadingsImportRow, ImportRowError, ImportReport,
+    SubmittedReadings, ReadingsAnomaly, MonthlyRollup, YearlyRollup, ArrearsBucket, AccountSummary,
+    AccountDebt, AccountsRequest, ReadingsBatchRequest, TariffVersion
+)
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field, EmailStr
+from datetime import date
+
+from pydantic import BaseModel, Field, EmailStr, NonNegativeInt, field_validator
 
 
 class User(BaseModel):
@@ -31,9 +33,279 @@ class Payment(BaseModel):
     """
     Модель для регистрации нового платежа.
 
+    Параметры:
+     - amount (float): Сумма платежа: конечное положительное число (отрицательная сумма увеличила бы долг,
+                       а inf/nan попали бы в журнал платежей и агрегаты аналитики).
+     - idempotency_key (str | None): Ключ идемпотентности — повторная отправка платежа
+                                     с тем же ключом не списывает сумму повторно.
+    """
+
+    amount: float = Field(gt=0, allow_inf_nan=False)
+    idempotency_key: str | None = Field(default=None, min_length=1, max_length=64)
+
+
+
+class PaymentRecord(BaseModel):
+    """
+    Модель записи журнала платежей.
+
     Параметры:
      - amount (float): Сумма платежа.
+     - balance_after (float): Остаток долга после платежа.
+     - created_at (str): Дата и время платежа (UTC).
     """
 
     amount: float
+    balance_after: float
+    created_at: str
+
+
+class ReadingsRecord(BaseModel):
+    """
+    Модель записи истории показаний счётчиков за период.
+
+    Параметры:
+     - period (str): Период показаний (YYYY-MM).
+     - meter_readings (dict[str, int]): Показания счётчиков на конец периода.
+     - consumption (dict[str, int]): Расход за период (разница с предыдущими показаниями).
+     - anomaly_score (float): Наибольший |z| расхода по счётчикам на момент отправки.
+    """
+
+    period: str
+    meter_readings: dict[str, int]
+    consumption: dict[str, int]
+    anomaly_score: float = 0.0
+
+
+class ReadingsImportRow(Readings):
+    """
+    Модель строки массового импорта показаний: показания счётчиков пользователя.
+
+    Email проверяется упрощённо: строка всё равно сверяется с таблицей пользователей,
+    а полная проверка EmailStr занимает большую часть времени импорта.
+
+    Параметры:
+     - email (str): Электронная почта пользователя (домен приводится к нижнему регистру, как в EmailStr).
+     - meter_readings (dict[str, NonNegativeInt]): Текущие значения счётчиков (не меньше нуля).
+    """
+
+    email: str = Field(pattern=r"^[^@\s]+@[^@\s]+$", max_length=254)
+    meter_readings: dict[str, NonNegativeInt]
+
+    @field_validator("email", mode="after")
+    @classmethod
+    def normalize_domain(cls, email: str) -> str:
+        local, _, domain = email.rpartition("@")
+        return f"{local}@{domain.lower()}"
+
+
+class ImportRowError(BaseModel):
+    """
+    Модель ошибки в строке массового импорта.
+
+    Параметры:
+     - line (int): Номер строки файла (заголовок — строка 1).
+     - email (str | None): Email из строки, если он есть.
+     - error (str): Описание ошибки.
+    """
+
+    line: int
+    email: str | None = None
+    error: str
+
+
+class ImportReport(BaseModel):
+    """
+    Модель отчёта о массовом импорте показаний.
+
+    Параметры:
+     - period (str): Период показаний (YYYY-MM).
+     - rows (int): Количество строк с данными.
+     - imported (int): Количество сохранённых строк.
+     - failed (int): Количество отклонённых строк.
+     - seconds (float): Время импорта, сек.
+     - errors (list[ImportRowError]): Ошибки по строкам.
+     - warnings (list[ImportRowError]): Сохранённые строки с аномальным расходом.
+    """
+
+    period: str
+    rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    errors: list[ImportRowError] = Field(default_factory=list)
+    warnings: list[ImportRowError] = Field(default_factory=list)
+
+
+class SubmittedReadings(BaseModel):
+    """
+    Модель результата отправки показаний.
+
+    Параметры:
+     - consumption (Readings): Расход за период.
+     - anomalies (dict[str, float]): Счётчики с аномальным расходом и их z-score (пусто — расход правдоподобен).
+    """
+
+    consumption: Readings
+    anomalies: dict[str, float] = Field(default_factory=dict)
+
+
+class ReadingsAnomaly(BaseModel):
+    """
+    Модель аномального расхода пользователя за период.
+
+    Параметры:
+     - email (str): Электронная почта пользователя.
+     - period (str): Период (YYYY-MM).
+     - consumption (dict[str, int]): Расход за период по счётчикам.
+     - expected (dict[str, float]): Средний расход пользователя по счётчикам.
+     - scores (dict[str, float]): z-score счётчиков с аномальным расходом.
+    """
+
+    email: str
+    period: str
+    consumption: dict[str, int]
+    expected: dict[str, float]
+    scores: dict[str, float]
+
+
+class MonthlyRollup(BaseModel):
+    """
+    Модель итогов за месяц.
+
+    Параметры:
+     - period (str): Период (YYYY-MM).
+     - accounts (int): Количество пользователей, передавших показания за период.
+     - consumption (dict[str, int]): Суммарный расход по счётчикам.
+     - billed (float): Начислено при закрытии месяца.
+     - paid (float): Оплачено в течение месяца.
+     - payments (int): Количество платежей в течение месяца.
+    """
+
+    period: str
+    accounts: int = 0
+    consumption: dict[str, int] = Field(default_factory=dict)
+    billed: float = 0.0
+    paid: float = 0.0
+    payments: int = 0
+
+
+class YearlyRollup(BaseModel):
+    """
+    Модель итогов за год: суммы по месяцам и сами месяцы.
+
+    Параметры:
+     - year (int): Год.
+     - consumption (dict[str, int]): Суммарный расход по счётчикам.
+     - billed (float): Начислено за год.
+     - paid (float): Оплачено за год.
+     - payments (int): Количество платежей за год.
+     - months (list[MonthlyRollup]): Итоги по месяцам, в которых были показания или платежи.
+    """
+
+    year: int
+    consumption: dict[str, int] = Field(default_factory=dict)
+    billed: float = 0.0
+    paid: float = 0.0
+    payments: int = 0
+    months: list[MonthlyRollup] = Field(default_factory=list)
+
+
+class ArrearsBucket(BaseModel):
+    """
+    Модель корзины распределения текущего долга.
+
+    Параметры:
+     - debt_from (float | None): Нижняя граница долга (не включительно), None — без ограничения.
+     - debt_to (float | None): Верхняя граница долга (включительно), None — без ограничения.
+     - accounts (int): Количество пользователей в корзине.
+     - debt (float): Суммарный долг пользователей корзины.
+    """
+
+    debt_from: float | None
+    debt_to: float | None
+    accounts: int = 0
+    debt: float = 0.0
+
+
+class AccountSummary(BaseModel):
+    """
+    Модель сводки по аккаунту пользователя: всё, что показывают его страницы, из одного запроса.
+
+    Параметры:
+     - email (str): Электронная почта пользователя.
+     - version (int): Версия аккаунта: растёт при каждом изменении показанных здесь данных.
+     - current_debt (float): Текущий долг.
+     - last_payment (float): Сумма последнего платежа.
+     - next_month_debt (float): Оценка долга за текущий месяц по уже переданным показаниям.
+     - history (list[ReadingsRecord]): Последние периоды истории показаний (от новых к старым).
+    """
+
+    email: str
+    version: int = 0
+    current_debt: float = 0.0
+    last_payment: float = 0.0
+    next_month_debt: float = 0.0
+    history: list[ReadingsRecord] = Field(default_factory=list)
+
+    @property
+    def readings(self) -> ReadingsRecord | None:
+        """Последние переданные показания (None — показаний ещё нет)."""
+
+        return self.history[0] if self.history else None
+
+
+class AccountDebt(BaseModel):
+    """
+    Модель текущего долга пользователя (ответ JSON API).
+
+    Параметры:
+     - email (str): Электронная почта пользователя.
+     - current_debt (float | None): Текущий долг (None — пользователь не найден).
+    """
+
+    email: str
+    current_debt: float | None = None
+
+
+class AccountsRequest(BaseModel):
+    """
+    Модель пакетного запроса JSON API по списку пользователей.
+
+    Параметры:
+     - emails (list[str]): Электронные почты пользователей.
+    """
+
+    emails: list[str] = Field(min_length=1)
+
+
+class ReadingsBatchRequest(BaseModel):
+    """
+    Модель пакетной отправки показаний через JSON API (для управляющих компаний).
+
+    Параметры:
+     - period (str | None): Период показаний (YYYY-MM, по умолчанию — текущий месяц).
+     - readings (list[ReadingsImportRow]): Показания пользователей.
+    """
+
+    period: str | None = None
+    readings: list[ReadingsImportRow] = Field(min_length=1)
+
+
+class TariffVersion(BaseModel):
+    """
+    Модель версии тарифов (действует с указанной даты до начала следующей версии).
+
+    Параметры:
+     - effective_from (date): Дата начала действия тарифов.
+     - electricity (float): Тариф на электроэнергию, руб./кВт·ч.
+     - cold_water (float): Тариф на холодную воду, руб./м³.
+     - hot_water (float): Тариф на горячую воду, руб./м³.
+     - gas (float): Тариф на газ, руб./м³.
+    """
 
+    effective_from: date
+    electricity: float = Field(ge=0, allow_inf_nan=False)
+    cold_water: float = Field(ge=0, allow_inf_nan=False)
+    hot_water: float = Field(ge=0, allow_inf_nan=False)
+    gas: float = Field(ge=0, allow_inf_nan=False)
@@ -1,8 +1,13 @@
-from .config import SettingsManager, Config
+from .config import SettingsManager, Config, SQLiteProfile, SQLITE_PROFILES, RateLimit, RATE_LIMITS
 from .logger import setup_logger
 from .exceptions import (
     LoggerSetupError, ConfigLoadError, ConfigGetError, SchedulerStartupError, SchedulerAddTasksError,
-    DatabaseConnectionError, DatabaseCloseError
+    DatabaseError, DatabaseConnectionError, DatabaseCloseError, DatabasePoolTimeoutError,
+    DatabaseMigrationError, PasswordHasherError, ReadingsError, ReadingsDecreasedError, PaymentError,
+    IdempotencyKeyConflictError
+)
+from .setup_app import setup_app, create_app
+from .middlewares import (
+    rate_limit_request, get_db_connection, teardown_request, is_manager_request,
+    static_url_defaults, cache_static_response, compress_response, account_etag, render_conditional
 )
-from .setup_app import setup_app
-from .middlewares import before_request, after_request
@@ -1 +1 @@
-from .settings import SettingsManager, Config
+from .settings import SettingsManager, Config, SQLiteProfile, SQLITE_PROFILES, RateLimit, RATE_LIMITS
@@ -1,10 +1,117 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 
 from environs import Env
 
 from FlatPay.core.exceptions import ConfigLoadError, ConfigGetError
 
 
+@dataclass(frozen=True)
+class SQLiteProfile:
+    """
+    Неизменяемый набор PRAGMA-настроек SQLite, применяемых к каждому соединению.
+
+    Атрибуты:
+     - journal_mode (str): Режим журнала (WAL позволяет читать во время записи).
+     - synchronous (str): Уровень синхронизации с диском (OFF, NORMAL, FULL, EXTRA).
+     - mmap_size (int): Размер отображаемой в память области файла БД, байт (0 — отключено).
+     - cache_size (int): Размер страничного кэша (отрицательное значение — в КиБ).
+     - busy_timeout (int): Время ожидания снятия блокировки, мс.
+     - temp_store (str): Где хранить временные таблицы и индексы (DEFAULT, FILE, MEMORY).
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "FULL"
+    mmap_size: int = 0
+    cache_size: int = -2000
+    busy_timeout: int = 5000
+    temp_store: str = "DEFAULT"
+
+    def __post_init__(self) -> None:
+        # Значения подставляются в PRAGMA как есть, поэтому проверяем их заранее
+        if self.journal_mode.upper() not in {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}:
+            raise ValueError(f"Недопустимый journal_mode: {self.journal_mode}")
+        if self.synchronous.upper() not in {"OFF", "NORMAL", "FULL", "EXTRA"}:
+            raise ValueError(f"Недопустимый synchronous: {self.synchronous}")
+        if self.temp_store.upper() not in {"DEFAULT", "FILE", "MEMORY"}:
+            raise ValueError(f"Недопустимый temp_store: {self.temp_store}")
+        if self.mmap_size < 0 or self.busy_timeout < 0:
+            raise ValueError("mmap_size и busy_timeout не могут быть отрицательными")
+
+    @property
+    def pragmas(self) -> tuple[str, ...]:
+        """PRAGMA-запросы для применения профиля к соединению."""
+
+        return (
+            f"PRAGMA journal_mode = {self.journal_mode.upper()}",
+            f"PRAGMA synchronous = {self.synchronous.upper()}",
+            f"PRAGMA mmap_size = {int(self.mmap_size)}",
+            f"PRAGMA cache_size = {int(self.cache_size)}",
+            f"PRAGMA busy_timeout = {int(self.busy_timeout)}",
+            f"PRAGMA temp_store = {self.temp_store.upper()}"
+        )
+
+
+# Именованные профили производительности SQLite
+SQLITE_PROFILES: dict[str, SQLiteProfile] = {
+    # Максимальная надёжность: каждая транзакция синхронизируется с диском
+    "durable": SQLiteProfile(),
+    # Компромисс: в режиме WAL при synchronous=NORMAL теряются лишь последние транзакции при сбое ОС
+    "balanced": SQLiteProfile(
+        synchronous="NORMAL",
+        mmap_size=64 * 1024 * 1024,
+        cache_size=-16000,
+        temp_store="MEMORY"
+    ),
+    # Максимальная скорость: без fsync, большой mmap и кэш (для тестовых стендов и импорта)
+    "fast": SQLiteProfile(
+        synchronous="OFF",
+        mmap_size=256 * 1024 * 1024,
+        cache_size=-64000,
+        temp_store="MEMORY"
+    )
+}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Ограничение частоты запросов к маршруту (параметры корзины токенов).
+
+    Атрибуты:
+     - requests (int): Сколько запросов можно сделать подряд (ёмкость корзины).
+     - period (float): За сколько секунд корзина полностью восстанавливается.
+    """
+
+    requests: int
+    period: float
+
+    def __post_init__(self) -> None:
+        if self.requests < 1 or self.period <= 0:
+            raise ValueError(f"Недопустимое ограничение частоты: {self.requests}/{self.period}")
+
+    @property
+    def refill_rate(self) -> float:
+        """Скорость пополнения корзины, токенов в секунду."""
+
+        return self.requests / self.period
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Создаёт ограничение из строки вида «10/60» (10 запросов за 60 секунд)."""
+
+        requests, period = value.split("/")
+        return cls(requests=int(requests), period=float(period))
+
+
+# Ограничения частоты POST-запросов по умолчанию (ключ — имя маршрута в blueprint), действуют в каждом воркере
+RATE_LIMITS: dict[str, RateLimit] = {
+    "login": RateLimit(requests=10, period=60),
+    "register": RateLimit(requests=5, period=600),
+    "update_debt": RateLimit(requests=20, period=60),
+    "update_readings": RateLimit(requests=20, period=60)
+}
+
+
 @dataclass(frozen=True)
 class Config:
     """
@@ -13,11 +120,95 @@ class Config:
     Атрибуты:
      - DATABASE_PATH (str): Путь к файлу базы данных.
      - LOG_CONFIG_PATH (str): Путь к файлу конфига логирования.
+     - SECRET_KEY (str): Секретный ключ для подписи cookies и сессий.
+     - DB_POOL_SIZE (int): Максимальное количество соединений в пуле.
+     - DB_POOL_TIMEOUT (float): Время ожидания свободного соединения из пула, сек.
+     - SQLITE_PROFILE (SQLiteProfile): PRAGMA-настройки SQLite для каждого соединения.
+     - WRITER_BATCH_SIZE (int): Максимальное количество операций записи в одной транзакции.
+     - WRITER_BATCH_WINDOW (float): Окно набора пачки операций записи, сек.
+     - MONTH_CLOSE_CHUNK_SIZE (int): Количество пользователей в одной порции закрытия месяца.
+     - PASSWORD_HASH_WORKERS (int): Количество потоков для хеширования и проверки паролей.
+     - PASSWORD_SCRYPT_N (int): Параметр стоимости scrypt для новых хешей паролей (степень двойки).
+     - AUTH_CACHE_SIZE (int): Максимальное количество email в кэше учётных данных.
+     - AUTH_CACHE_TTL (float): Время жизни учётных данных в кэше, сек.
+     - AUTH_CACHE_NEGATIVE_TTL (float): Время жизни записи «пользователь не найден», сек.
+     - ACCOUNT_CACHE_SIZE (int): Максимальное количество сводок аккаунтов в кэше.
+     - ACCOUNT_CACHE_TTL (float): Время жизни данных аккаунта в кэше, сек. (ограничивает устаревание
+                                  между воркерами: запись инвалидирует кэш только своего процесса).
+     - RATE_LIMITS (dict[str, RateLimit]): Ограничения частоты POST-запросов по маршрутам — для каждого воркера
+                                           (корзины в памяти процесса): при SERVER_WORKERS > 1 клиент может
+                                           получить до limit × SERVER_WORKERS запросов за период.
+     - RATE_LIMIT_MAX_KEYS (int): Максимальное количество корзин токенов в памяти.
+     - SERVER_MODE (str): Режим запуска сервера: development (автоперезапуск) или production.
+     - SERVER_HOST (str): Адрес, на котором сервер принимает соединения.
+     - SERVER_PORT (int): Порт сервера.
+     - SERVER_WORKERS (int): Количество процессов-воркеров (в режиме production).
+     - SERVER_KEEPALIVE (int): Сколько держать простаивающее keep-alive соединение, сек.
+     - SERVER_BACKLOG (int): Максимальная очередь ещё не принятых соединений.
+     - LEADER_LEASE_TTL (float): Срок аренды лидера фоновых задач, сек.
+     - LEADER_HEARTBEAT (float): Период продления аренды лидера, сек.
+     - TARIFF_CHECK_INTERVAL (float): Период проверки изменения тарифов в БД, сек. (за это время
+                                      изменение тарифов, сделанное в одном воркере, доходит до остальных).
+     - IMPORT_TOKEN (str | None): Токен управляющих компаний для массового импорта показаний
+                                  (None — импорт через HTTP отключён).
+     - IMPORT_BATCH_SIZE (int): Количество строк в одной пачке массового импорта показаний.
+     - API_BATCH_LIMIT (int): Максимальное количество элементов в одном пакетном запросе JSON API.
+     - COMPRESSION_MIN_SIZE (int): Ответы меньше этого размера (байт) не сжимаются.
+     - COMPRESSION_GZIP_LEVEL (int): Степень сжатия gzip для динамических ответов (1..9).
+     - COMPRESSION_BROTLI_QUALITY (int): Качество brotli для динамических ответов (0..11).
+     - COMPRESSION_OFFLOAD_SIZE (int): Ответы от этого размера (байт) сжимаются в пуле потоков.
+     - ANOMALY_THRESHOLD (float): Порог |z-score| расхода, выше которого показания считаются аномальными.
+     - ANOMALY_WINDOW (int): Сколько последних месяцев учитывает статистика расхода.
+     - ANOMALY_MIN_PERIODS (int): Сколько месяцев истории нужно, прежде чем оценивать расход.
     """
 
     DATABASE_PATH: str
     LOG_CONFIG_PATH: str
     SECRET_KEY: str
+    DB_POOL_SIZE: int = 5
+    DB_POOL_TIMEOUT: float = 5.0
+    SQLITE_PROFILE: SQLiteProfile = SQLITE_PROFILES["durable"]
+    WRITER_BATCH_SIZE: int = 128
+    WRITER_BATCH_WINDOW: float = 0.002
+    MONTH_CLOSE_CHUNK_SIZE: int = 5000
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_SCRYPT_N: int = 16384
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_CACHE_TTL: float = 300.0
+    AUTH_CACHE_NEGATIVE_TTL: float = 30.0
+    ACCOUNT_CACHE_SIZE: int = 10000
+    ACCOUNT_CACHE_TTL: float = 60.0
+    RATE_LIMITS: dict[str, RateLimit] = field(default_factory=lambda: dict(RATE_LIMITS))
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    SERVER_MODE: str = "development"
+    SERVER_HOST: str = "127.0.0.1"
+    SERVER_PORT: int = 5005
+    SERVER_WORKERS: int = 1
+    SERVER_KEEPALIVE: int = 5
+    SERVER_BACKLOG: int = 2048
+    LEADER_LEASE_TTL: float = 30.0
+    LEADER_HEARTBEAT: float = 10.0
+    TARIFF_CHECK_INTERVAL: float = 10.0
+    IMPORT_TOKEN: str | None = None
+    IMPORT_BATCH_SIZE: int = 2000
+    API_BATCH_LIMIT: int = 1000
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_OFFLOAD_SIZE: int = 65536
+    ANOMALY_THRESHOLD: float = 4.0
+    ANOMALY_WINDOW: int = 12
+    ANOMALY_MIN_PERIODS: int = 3
+
+    def __post_init__(self) -> None:
+        if self.SERVER_MODE not in {"development", "production"}:
+            raise ValueError(f"Неизвестный режим сервера: {self.SERVER_MODE}. Доступны: development, production")
+        if self.SERVER_WORKERS < 1:
+            raise ValueError("Количество воркеров должно быть больше нуля")
+        if self.IMPORT_BATCH_SIZE < 1:
+            raise ValueError("Размер пачки импорта должен быть больше нуля")
+        if self.API_BATCH_LIMIT < 1:
+            raise ValueError("Размер пакетного запроса API должен быть больше нуля")
 
 
 class SettingsManager:
@@ -48,7 +239,41 @@ class SettingsManager:
             config = Config(
                 DATABASE_PATH=env.str("DATABASE_PATH"),
                 LOG_CONFIG_PATH=env.str("LOG_CONFIG_PATH"),
-                SECRET_KEY=env.str("SECRET_KEY")
+                SECRET_KEY=env.str("SECRET_KEY"),
+                DB_POOL_SIZE=env.int("DB_POOL_SIZE", 5),
+                DB_POOL_TIMEOUT=env.float("DB_POOL_TIMEOUT", 5.0),
+                SQLITE_PROFILE=cls._load_sqlite_profile(env),
+                WRITER_BATCH_SIZE=env.int("WRITER_BATCH_SIZE", 128),
+                WRITER_BATCH_WINDOW=env.float("WRITER_BATCH_WINDOW", 0.002),
+                MONTH_CLOSE_CHUNK_SIZE=env.int("MONTH_CLOSE_CHUNK_SIZE", 5000),
+                PASSWORD_HASH_WORKERS=env.int("PASSWORD_HASH_WORKERS", 4),
+                PASSWORD_SCRYPT_N=env.int("PASSWORD_SCRYPT_N", 16384),
+                AUTH_CACHE_SIZE=env.int("AUTH_CACHE_SIZE", 10000),
+                AUTH_CACHE_TTL=env.float("AUTH_CACHE_TTL", 300.0),
+                AUTH_CACHE_NEGATIVE_TTL=env.float("AUTH_CACHE_NEGATIVE_TTL", 30.0),
+                ACCOUNT_CACHE_SIZE=env.int("ACCOUNT_CACHE_SIZE", 10000),
+                ACCOUNT_CACHE_TTL=env.float("ACCOUNT_CACHE_TTL", 60.0),
+                RATE_LIMITS=cls._load_rate_limits(env),
+                RATE_LIMIT_MAX_KEYS=env.int("RATE_LIMIT_MAX_KEYS", 100000),
+                SERVER_MODE=env.str("SERVER_MODE", "development"),
+                SERVER_HOST=env.str("SERVER_HOST", "127.0.0.1"),
+                SERVER_PORT=env.int("SERVER_PORT", 5005),
+                SERVER_WORKERS=env.int("SERVER_WORKERS", 1),
+                SERVER_KEEPALIVE=env.int("SERVER_KEEPALIVE", 5),
+                SERVER_BACKLOG=env.int("SERVER_BACKLOG", 2048),
+                LEADER_LEASE_TTL=env.float("LEADER_LEASE_TTL", 30.0),
+                LEADER_HEARTBEAT=env.float("LEADER_HEARTBEAT", 10.0),
+                TARIFF_CHECK_INTERVAL=env.float("TARIFF_CHECK_INTERVAL", 10.0),
+                IMPORT_TOKEN=env.str("IMPORT_TOKEN", None),
+                IMPORT_BATCH_SIZE=env.int("IMPORT_BATCH_SIZE", 2000),
+                API_BATCH_LIMIT=env.int("API_BATCH_LIMIT", 1000),
+                COMPRESSION_MIN_SIZE=env.int("COMPRESSION_MIN_SIZE", 1024),
+                COMPRESSION_GZIP_LEVEL=env.int("COMPRESSION_GZIP_LEVEL", 6),
+                COMPRESSION_BROTLI_QUALITY=env.int("COMPRESSION_BROTLI_QUALITY", 4),
+                COMPRESSION_OFFLOAD_SIZE=env.int("COMPRESSION_OFFLOAD_SIZE", 65536),
+                ANOMALY_THRESHOLD=env.float("ANOMALY_THRESHOLD", 4.0),
+                ANOMALY_WINDOW=env.int("ANOMALY_WINDOW", 12),
+                ANOMALY_MIN_PERIODS=env.int("ANOMALY_MIN_PERIODS", 3)
             )
             # Сохраняем объект в классовую переменную
             cls._config = config
@@ -57,6 +282,55 @@ class SettingsManager:
             # Если что-то пошло не так — выбрасываем собственное исключение
             raise ConfigLoadError(f"Ошибка загрузки конфигурации: {e}")
 
+    @staticmethod
+    def _load_sqlite_profile(env: Env) -> SQLiteProfile:
+        """
+        Собирает профиль SQLite: берёт именованный пресет (SQLITE_PROFILE)
+        и переопределяет отдельные PRAGMA, если они заданы в окружении.
+
+        Параметры:
+         - env (Env): Объект окружения.
+
+        Возвращает:
+         - SQLiteProfile: Итоговый профиль.
+        """
+
+        name = env.str("SQLITE_PROFILE", "durable")
+        if name not in SQLITE_PROFILES:
+            raise ValueError(f"Неизвестный профиль SQLite: {name}. Доступны: {', '.join(SQLITE_PROFILES)}")
+
+        # Переопределения отдельных PRAGMA (None — оставить значение из пресета)
+        overrides = {
+            "journal_mode": env.str("SQLITE_JOURNAL_MODE", None),
+            "synchronous": env.str("SQLITE_SYNCHRONOUS", None),
+            "mmap_size": env.int("SQLITE_MMAP_SIZE", None),
+            "cache_size": env.int("SQLITE_CACHE_SIZE", None),
+            "busy_timeout": env.int("SQLITE_BUSY_TIMEOUT", None),
+            "temp_store": env.str("SQLITE_TEMP_STORE", None)
+        }
+
+        return replace(SQLITE_PROFILES[name], **{k: v for k, v in overrides.items() if v is not None})
+
+    @staticmethod
+    def _load_rate_limits(env: Env) -> dict[str, RateLimit]:
+        """
+        Собирает ограничения частоты: значения по умолчанию, переопределённые
+        переменной RATE_LIMITS вида «login=10/60,register=5/600».
+
+        Параметры:
+         - env (Env): Объект окружения.
+
+        Возвращает:
+         - dict[str, RateLimit]: Ограничения по именам маршрутов.
+        """
+
+        limits = dict(RATE_LIMITS)
+
+        for route, value in env.dict("RATE_LIMITS", {}).items():
+            limits[route] = RateLimit.parse(value)
+
+        return limits
+
     @classmethod
     def get_config(cls) -> Config:
         """Возвращает текущий объект конфигурации."""
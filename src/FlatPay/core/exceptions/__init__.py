@@ -1,4 +1,6 @@
 from .exceptions import (
     LoggerSetupError, ConfigLoadError, ConfigGetError, SchedulerStartupError, SchedulerAddTasksError,
-    DatabaseConnectionError, DatabaseCloseError
+    DatabaseError, DatabaseConnectionError, DatabaseCloseError, DatabasePoolTimeoutError,
+    DatabaseMigrationError, PasswordHasherError, ReadingsError, ReadingsDecreasedError, PaymentError,
+    IdempotencyKeyConflictError
 )
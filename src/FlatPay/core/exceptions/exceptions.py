@@ -57,6 +57,34 @@ class DatabaseConnectionError(DatabaseError):
     """
 
 
+class DatabasePoolTimeoutError(DatabaseError):
+    """
+    Исключение, возникающее, когда пул не смог выдать соединение за отведённое время.
+
+    Причина возникновения:
+    - Все соединения пула заняты долгими запросами.
+    - Размер пула слишком мал для текущей нагрузки.
+
+    Решение:
+    - Увеличьте DB_POOL_SIZE или DB_POOL_TIMEOUT.
+    - Проверьте, что соединения своевременно возвращаются в пул.
+    """
+
+
+class DatabaseMigrationError(DatabaseError):
+    """
+    Исключение, возникающее при ошибке применения миграций схемы базы данных.
+
+    Причина возникновения:
+    - Ошибка в SQL-запросе миграции.
+    - База данных заблокирована другим процессом или недоступна для записи.
+
+    Решение:
+    - Проверьте SQL-запросы миграций и логи приложения.
+    - Убедитесь, что файл базы данных доступен для записи.
+    """
+
+
 class DatabaseCloseError(DatabaseError):
     """
     Исключение, возникающее при ошибке закрытия соединения с базой данных.
@@ -127,3 +155,60 @@ class ConfigGetError(ConfigError):
     Решение:
      - Вызовите метод `load_config()` перед получением конфигурации.
     """
+
+
+class SecurityError(Exception):
+    """
+    Базовое исключение для ошибок, связанных с хешированием и проверкой паролей.
+    """
+
+
+class PasswordHasherError(SecurityError):
+    """
+    Исключение, возникающее при неправильном использовании пула хеширования паролей.
+
+    Причины возникновения:
+     - Пул хеширования не был создан до первого входа или регистрации.
+     - Повторная инициализация пула.
+
+    Решение:
+     - Убедитесь, что HasherManager.init_hasher() вызывается один раз при старте приложения.
+    """
+
+
+class ReadingsError(Exception):
+    """
+    Базовое исключение для ошибок, связанных с показаниями счётчиков.
+    """
+
+
+class ReadingsDecreasedError(ReadingsError):
+    """
+    Исключение, возникающее, если новое показание счётчика меньше предыдущего.
+
+    Причины возникновения:
+     - Опечатка при вводе показаний.
+     - Вместо показаний счётчика введён расход за месяц.
+
+    Решение:
+     - Введите текущие значения со счётчиков (не меньше показаний прошлого месяца).
+    """
+
+
+class PaymentError(Exception):
+    """
+    Базовое исключение для ошибок, связанных с платежами.
+    """
+
+
+class IdempotencyKeyConflictError(PaymentError):
+    """
+    Исключение, возникающее, если ключ идемпотентности уже использован для другого платежа.
+
+    Причины возникновения:
+     - Клиент повторно использовал ключ для платежа с другой суммой.
+     - Ключ уже использован другим пользователем.
+
+    Решение:
+     - Создавайте новый ключ идемпотентности для каждого нового платежа; повтор отправляйте с той же суммой.
+    """
@@ -1 +1,4 @@
-from .middlewares import before_request, after_request
\ No newline at end of file
+from .middlewares import (
+    rate_limit_request, get_db_connection, teardown_request, is_manager_request,
+    static_url_defaults, cache_static_response, compress_response, account_etag, render_conditional
+)
@@ -1,50 +1,276 @@
-from quart import g, Response
+import hashlib
+import hmac
+from math import ceil
+from typing import Any
+
+import quart as qa
+from quart import g, session, Response
+from quart.wrappers.response import DataBody
 from aiosqlite import Connection
 
-from FlatPay.database import get_connection, close_connection
-from FlatPay.core import SettingsManager
+from FlatPay.core.config import SettingsManager
+from FlatPay.database import PoolManager
+from FlatPay.utils.assets import AssetManager, DIGEST_SIZE, IMMUTABLE_MAX_AGE
+from FlatPay.utils.compression import CompressionManager, available_encodings, is_compressible
+from FlatPay.utils.rate_limit import RateLimiterManager
 
 
-async def before_request() -> None:
+async def rate_limit_request() -> Response | None:
     """
-    Мидлварь для инициализации соединения с БД и сохранения его в g.
+    Мидлварь для ограничения частоты отправки форм.
 
     - Вызывается перед каждым запросом.
-    - Проверяет, есть ли уже соединение с БД в объекте `g`.
-    - Если нет — создаёт новое асинхронное соединение и сохраняет его в `g.db_conn`.
-    - Это позволяет всем маршрутам в рамках одного запроса использовать общее подключение.
+    - Ограничивает только POST-запросы к маршрутам из конфигурации RATE_LIMITS.
+    - Забирает токен из корзины IP-адреса клиента, а затем — из корзины email
+      (из сессии, из формы или из JSON-тела запроса к API), поэтому перебор паролей не обходится
+      ни сменой email, ни сменой IP.
+    - Отклонённый запрос получает ответ 429 с заголовком Retry-After (HTML-страницу или JSON для API)
+      и не доходит ни до базы данных, ни до хеширования пароля.
+
+    Возвращаемое значение:
+     - Response | None: Ответ 429, если лимит исчерпан; None — запрос обрабатывается дальше.
     """
 
-    # Проверяем, есть ли уже подключение в контексте `g`
-    if not hasattr(g, 'db_conn'):
-        # Получаем путь к базе из конфигурации
-        db_path = SettingsManager.get_config().DATABASE_PATH
+    request = qa.request
+    limiter = RateLimiterManager.get_limiter()
+
+    if limiter is None or request.method != "POST" or request.endpoint is None:
+        return None
+
+    # Имя маршрута без имени blueprint: "blueprint.login" -> "login"
+    route = request.endpoint.rsplit(".", 1)[-1]
+    limit = RateLimiterManager.get_limit(route)
+    if limit is None:
+        return None
+
+    retry_after = limiter.hit(f"{route}:ip:{request.remote_addr}", limit)
 
-        # Открываем соединение с базой
-        db_conn = await get_connection(path=db_path)
+    if not retry_after:
+        # Разбор формы не обращается к БД; для вошедших пользователей email берём из сессии
+        if request.is_json:
+            body = await request.get_json(silent=True)
+            email = session.get("user_email") or (body.get("email") if isinstance(body, dict) else None)
+        else:
+            email = session.get("user_email") or (await request.form).get("email")
+        if isinstance(email, str) and email:
+            retry_after = limiter.hit(f"{route}:email:{email.strip().lower()}", limit)
 
-        # Сохраняем соединение в контексте текущего запроса
-        g.db_conn = db_conn
+    if retry_after:
+        if request.is_json:
+            response = Response('{"error": "too many requests"}', status=429, mimetype="application/json")
+        else:
+            response = Response(await qa.render_template("too_many_requests.html"), status=429)
+        response.headers["Retry-After"] = str(ceil(retry_after))
+        return response
 
+    return None
 
-async def after_request(response: Response) -> Response:
+
+async def get_db_connection() -> Connection:
     """
-    Мидлварь для закрытия соединения с базой данных.
+    Возвращает соединение с БД для текущего запроса, получая его из пула при первом обращении.
 
-    - Вызывается после обработки запроса, но до отправки ответа клиенту.
-    - Извлекает соединение из объекта `g` (если оно было создано).
-    - Закрывает соединение, освобождая ресурсы.
+    - Соединение сохраняется в `g.db_conn` и переиспользуется до конца запроса.
+    - Маршруты, которые не обращаются к базе данных (главная страница, формы, статика),
+      не берут соединение из пула вовсе.
+    - Соединение возвращается в пул в teardown_request.
 
     Возвращаемое значение:
-     - response (Response): Ответ клиенту.
+     - Connection: Асинхронное соединение с базой данных.
+    """
+
+    # Берём соединение из пула только при первом обращении в рамках запроса
+    if "db_conn" not in g:
+        g.db_conn = await PoolManager.get_pool().acquire()
+
+    return g.db_conn
+
+
+def is_manager_request() -> bool:
+    """
+    Проверяет токен управляющей компании из заголовка `Authorization: Bearer <IMPORT_TOKEN>`.
+
+    - Используется маршрутами для управляющих компаний (импорт показаний, аналитика).
+    - Если IMPORT_TOKEN не задан, такие запросы через HTTP отключены.
+
+    Возвращаемое значение:
+     - bool: True, если токен задан и совпадает.
+    """
+
+    config = SettingsManager.get_config()
+
+    # Сравнение за постоянное время, чтобы токен нельзя было подобрать по задержке ответа
+    token = qa.request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+    return bool(config.IMPORT_TOKEN) and hmac.compare_digest(token.encode(), config.IMPORT_TOKEN.encode())
+
+
+def static_url_defaults(endpoint: str, values: dict[str, Any]) -> None:
+    """
+    Добавляет к URL статики отпечаток содержимого файла: `url_for('static', filename='styles.css')`
+    даёт `/static/styles.css?v=<отпечаток>`.
+
+    - Шаблоны не меняются: отпечаток подставляется при построении URL.
+    - После выкладки с изменённым файлом меняется и его URL, поэтому браузер не использует старую копию.
+
+    Параметры:
+     - endpoint (str): Имя маршрута, для которого строится URL.
+     - values (dict[str, Any]): Параметры URL (дополняются на месте).
+    """
+
+    if endpoint == "static" and "v" not in values:
+        digest = AssetManager.get_manifest().digest(values.get("filename", ""))
+        if digest is not None:
+            values["v"] = digest
+
+
+async def cache_static_response(response: Response) -> Response:
+    """
+    Мидлварь для долгого кэширования статики, запрошенной по URL с отпечатком.
+
+    - Если отпечаток в URL совпадает с текущим содержимым файла, ответ помечается
+      `Cache-Control: public, max-age=<год>, immutable`: браузер не перепроверяет файл вовсе.
+    - Запросы без отпечатка (или со старым) кэшируются как обычно, с перепроверкой по ETag.
+
+    Параметры:
+     - response (Response): Ответ обработчика.
+
+    Возвращаемое значение:
+     - Response: Тот же ответ.
+    """
+
+    request = qa.request
+    if request.endpoint != "static" or response.status_code not in (200, 304):
+        return response
+
+    digest = AssetManager.get_manifest().digest((request.view_args or {}).get("filename", ""))
+    if digest is not None and request.args.get("v") == digest:
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+
+    return response
+
+
+async def compress_response(response: Response) -> Response:
+    """
+    Мидлварь для сжатия ответов (gzip, brotli — если установлен).
+
+    - Кодировка выбирается по заголовку Accept-Encoding клиента; к сжимаемым ответам добавляется
+      `Vary: Accept-Encoding`, чтобы кэши не отдали сжатый ответ клиенту без поддержки сжатия.
+    - Не сжимаются ответы с кодом, отличным от 200, уже сжатые ответы и уже сжатые типы (PNG, архивы).
+    - Статика не сжимается на каждый запрос: отдаются варианты, сжатые при старте приложения.
+    - Динамические ответы меньше COMPRESSION_MIN_SIZE не сжимаются, а от COMPRESSION_OFFLOAD_SIZE —
+      сжимаются в пуле потоков, не блокируя цикл событий.
+    - Сильный ETag сжатого ответа становится слабым: байты отличаются от несжатых, а условные запросы
+      (304) продолжают работать.
+
+    Параметры:
+     - response (Response): Ответ обработчика.
+
+    Возвращаемое значение:
+     - Response: Сжатый или исходный ответ.
+    """
+
+    request = qa.request
+    if not is_compressible(response.mimetype):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if response.status_code != 200 or "Content-Encoding" in response.headers:
+        return response
+
+    encoding = request.accept_encodings.best_match(available_encodings())
+    if encoding is None:
+        return response
+
+    if request.endpoint == "static":
+        data = AssetManager.get_manifest().variants((request.view_args or {}).get("filename", "")).get(encoding)
+        if data is None:
+            return response
+        # Диапазоны байт относятся к несжатому файлу
+        response.headers.pop("Accept-Ranges", None)
+    else:
+        # Потоковые ответы (файлы, генераторы) не читаются в память целиком
+        compressor = CompressionManager.get_compressor()
+        if not isinstance(response.response, DataBody) or response.content_length < compressor.min_size:
+            return response
+        data = await compressor.compress(await response.get_data(), encoding)
+
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+
+    etag, weak = response.get_etag()
+    if etag is not None and not weak:
+        response.set_etag(etag, weak=True)
+
+    return response
+
+
+def account_etag(email: str, version: int, *parts: Any) -> str:
+    """
+    Строит ETag страницы пользователя по версии его аккаунта.
+
+    - Версия растёт при каждом изменении данных аккаунта (в тех же UPDATE, что меняют данные), поэтому одинаковый ETag
+      означает ту же страницу, и её не нужно рендерить повторно.
+    - В ETag входят email (браузер могут использовать несколько пользователей по очереди)
+      и отпечаток выкладки (после изменения шаблонов страницы рендерятся заново).
+
+    Параметры:
+     - email (str): Электронная почта пользователя.
+     - version (int): Версия аккаунта.
+     - parts (Any): Прочие данные, от которых зависит страница (например, настройки отображения).
+
+    Возвращаемое значение:
+     - str: Значение ETag (без кавычек).
+    """
+
+    key = "\x00".join(map(str, (email, version, AssetManager.get_manifest().release, *parts)))
+    return hashlib.blake2b(key.encode(), digest_size=DIGEST_SIZE).hexdigest()
+
+
+async def render_conditional(etag: str, template: str, **context: Any) -> Response:
+    """
+    Отвечает на условный GET: 304 без рендеринга, если у клиента актуальная версия страницы,
+    иначе рендерит шаблон и добавляет ETag.
+
+    - Страницы пользователя помечаются `Cache-Control: private, no-cache`: браузер хранит копию,
+      но перед показом перепроверяет её запросом с If-None-Match.
+
+    Параметры:
+     - etag (str): ETag страницы (см. account_etag).
+     - template (str): Имя шаблона.
+     - context (Any): Переменные шаблона.
+
+    Возвращаемое значение:
+     - Response: Ответ 304 или 200 с HTML-страницей.
+    """
+
+    if qa.request.if_none_match.contains_weak(etag):
+        response = Response("", status=304)
+    else:
+        response = Response(await qa.render_template(template, **context))
+
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+async def teardown_request(exception: BaseException | None = None) -> None:
+    """
+    Мидлварь для возврата соединения с базой данных в пул.
+
+    - Вызывается после обработки запроса, в том числе если обработчик упал с исключением.
+    - Извлекает соединение из объекта `g` (если обработчик его получал через get_db_connection).
+    - Возвращает соединение в пул, не закрывая его.
+
+    Параметры:
+     - exception (BaseException | None): Исключение, прервавшее обработку запроса (если было).
     """
 
     # Извлекаем подключение к БД из `g`, если оно есть (и сразу удаляем)
     db_conn: Connection = g.pop('db_conn', None)
 
-    # Если соединение было создано — закрываем его
+    # Если соединение было получено — возвращаем его в пул
     if db_conn is not None:
-        await close_connection(connection=db_conn)
-
-    # Возвращаем HTTP-ответ дальше по цепочке
-    return response
+        await PoolManager.get_pool().release(db_conn)
@@ -1,8 +1,145 @@
+import os
+from functools import partial
+
 import quart as qa
 from quart import Quart
 
-from FlatPay.app.controllers.routes import blueprint
-from FlatPay.core.middlewares import before_request, after_request
+from FlatPay.app.controllers.routes import blueprint, api_blueprint
+from FlatPay.core.config import SettingsManager
+from FlatPay.core.logger import setup_logger
+from FlatPay.core.middlewares import (
+    rate_limit_request, teardown_request, static_url_defaults, cache_static_response, compress_response
+)
+from FlatPay.database import PoolManager, WriterManager, run_migrations
+from FlatPay.services.user import CREDENTIALS_CACHE, ACCOUNT_CACHE
+from FlatPay.tasks import SchedulerManager, LeaderManager, resume_month_close
+from FlatPay.utils.anomaly import AnomalyManager
+from FlatPay.utils.assets import AssetManager
+from FlatPay.utils.cache import CacheManager
+from FlatPay.utils.compression import CompressionManager
+from FlatPay.utils.rate_limit import RateLimiterManager
+from FlatPay.utils.security import HasherManager
+from FlatPay.utils.tariffs import TariffManager
+
+
+async def startup() -> None:
+    """
+    Выполняется один раз перед тем, как сервер начнёт принимать запросы.
+
+    - Применяет миграции схемы базы данных.
+    - Создаёт общий пул соединений с базой данных.
+    - Загружает расписание тарифов в память и настраивает детектор аномальных показаний.
+    - Запускает единственного писателя с групповой фиксацией транзакций.
+    - Создаёт пул потоков для хеширования паролей, кэш учётных данных и кэш данных аккаунтов.
+    - Создаёт ограничитель частоты отправки форм и настраивает сжатие ответов.
+    - Запускает планировщик задач и выбор лидера, выполняющего закрытие месяца.
+    """
+
+    config = SettingsManager.get_config()
+
+    # Приводим схему базы данных к последней версии (один раз на процесс)
+    await run_migrations(path=config.DATABASE_PATH, profile=config.SQLITE_PROFILE)
+
+    # Создаём пул соединений, общий для обработчиков запросов и фоновых задач
+    PoolManager.init_pool(
+        path=config.DATABASE_PATH,
+        size=config.DB_POOL_SIZE,
+        timeout=config.DB_POOL_TIMEOUT,
+        profile=config.SQLITE_PROFILE
+    )
+
+    # Загружаем тарифы: дальше расчёт долга не обращается к БД за тарифами
+    async with PoolManager.get_pool().connection() as connection:
+        await TariffManager.reload(connection)
+
+    # Оценка правдоподобия расхода по статистике прошлых месяцев пользователя
+    AnomalyManager.init_detector(
+        threshold=config.ANOMALY_THRESHOLD,
+        window=config.ANOMALY_WINDOW,
+        min_periods=config.ANOMALY_MIN_PERIODS
+    )
+
+    # Запускаем писателя: все операции записи проходят через его очередь
+    await WriterManager.init_writer(
+        path=config.DATABASE_PATH,
+        profile=config.SQLITE_PROFILE,
+        batch_size=config.WRITER_BATCH_SIZE,
+        batch_window=config.WRITER_BATCH_WINDOW
+    )
+
+    # Хеширование паролей выполняется вне цикла событий, в ограниченном пуле потоков
+    HasherManager.init_hasher(workers=config.PASSWORD_HASH_WORKERS, n=config.PASSWORD_SCRYPT_N)
+
+    # Кэш учётных данных: повторные входы (и попытки входа с неизвестными email) не обращаются к БД
+    CacheManager.init_cache(
+        CREDENTIALS_CACHE,
+        max_size=config.AUTH_CACHE_SIZE,
+        ttl=config.AUTH_CACHE_TTL,
+        negative_ttl=config.AUTH_CACHE_NEGATIVE_TTL
+    )
+
+    # Кэш данных аккаунтов: повторные просмотры страниц долга и показаний не обращаются к БД
+    CacheManager.init_cache(ACCOUNT_CACHE, max_size=config.ACCOUNT_CACHE_SIZE, ttl=config.ACCOUNT_CACHE_TTL)
+
+    # Ограничитель частоты отправки форм (состояние — в памяти процесса)
+    RateLimiterManager.init_limiter(limits=config.RATE_LIMITS, max_keys=config.RATE_LIMIT_MAX_KEYS)
+
+    # Пороги и степени сжатия динамических ответов (статика сжата заранее в AssetManager)
+    CompressionManager.init_compressor(
+        min_size=config.COMPRESSION_MIN_SIZE,
+        gzip_level=config.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=config.COMPRESSION_BROTLI_QUALITY,
+        offload_size=config.COMPRESSION_OFFLOAD_SIZE
+    )
+
+    # Планировщик запускается после пула и писателя: его задачи используют их
+    scheduler = SchedulerManager.start()
+
+    # Лидер (один процесс на все воркеры и хосты с общей БД) выполняет закрытие месяца
+    await LeaderManager.init_elector(
+        name="month_close",
+        ttl=config.LEADER_LEASE_TTL,
+        heartbeat=config.LEADER_HEARTBEAT,
+        on_elected=partial(resume_month_close, scheduler)
+    )
+
+
+async def shutdown() -> None:
+    """
+    Выполняется один раз после остановки сервера.
+
+    - Останавливает планировщик задач и освобождает аренду лидера.
+    - Выполняет оставшиеся в очереди операции записи и останавливает писателя.
+    - Дожидается возврата занятых соединений и закрывает пул.
+    - Останавливает пул хеширования паролей и логирует статистику кэшей и ограничителя запросов.
+    """
+
+    SchedulerManager.stop()
+    await LeaderManager.close_elector()
+    await WriterManager.close_writer()
+    await PoolManager.close_pool()
+    HasherManager.close_hasher()
+    CacheManager.close_caches()
+    RateLimiterManager.close_limiter()
+
+
+def create_app() -> Quart:
+    """
+    Фабрика приложения для ASGI-сервера.
+
+    Сервер импортирует её по строке "FlatPay.core:create_app" в каждом процессе-воркере,
+    поэтому конфигурация и логирование настраиваются здесь, а не в run.py.
+
+    Возвращает:
+     - app (Quart): Настроенное приложение.
+    """
+
+    # Загружаем конфигурацию из .env и настраиваем логирование процесса
+    SettingsManager.load_config()
+    config = SettingsManager.get_config()
+    setup_logger(config=config)
+
+    return setup_app(config.SECRET_KEY)
 
 
 def setup_app(secret_key: str) -> Quart:
@@ -25,13 +162,27 @@ def setup_app(secret_key: str) -> Quart:
     # Устанавливаем секретный ключ для безопасности сессий
     app.secret_key = secret_key
 
+    # Отпечатки статики (для URL с отпечатком) и шаблонов (для ETag страниц), а также сжатые варианты статики —
+    # один раз при создании приложения
+    AssetManager.init_assets(app.static_folder, os.path.join(app.root_path, app.template_folder))
+    app.url_defaults(static_url_defaults)  # Добавляет отпечаток содержимого к URL статики
+
     # Регистрируем маршруты через blueprint (группировка view-функций)
     # url_prefix добавляет ко всем маршрутам префикс /FlatPay
     app.register_blueprint(blueprint, url_prefix="/FlatPay")
+    # JSON API для мобильного приложения и интеграций: те же сервисы, ответы — JSON
+    app.register_blueprint(api_blueprint, url_prefix="/FlatPay/api/v1")
+
+    # Подключаем хуки жизненного цикла приложения
+    app.before_serving(startup)  # Создаёт пул соединений и писателя при старте сервера
+    app.after_serving(shutdown)  # Останавливает писателя и закрывает пул при остановке сервера
 
-    # Подключаем middleware-функции
-    app.before_request(before_request)  # Выполняется до каждого запроса и открывает соединение с базой данных
-    app.after_request(after_request)  # Выполняется до каждого запроса и закрывает соединение с базой данных
+    # Подключаем middleware-функции (в порядке вызова)
+    app.before_request(rate_limit_request)  # Отклоняет слишком частые отправки форм до обращения к БД
+    # Соединение с БД берётся лениво (get_db_connection) — только маршрутами, которым оно нужно
+    app.after_request(cache_static_response)  # Статика по URL с отпечатком кэшируется как неизменяемая
+    app.after_request(compress_response)  # Сжимает ответы (статику — готовыми вариантами)
+    app.teardown_request(teardown_request)  # Выполняется после каждого запроса и возвращает соединение в пул
 
     # Возвращаем готовое приложение
     return app
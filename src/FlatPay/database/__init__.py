@@ -1 +1,4 @@
 from .connection import get_connection, close_connection
+from .pool import ConnectionPool, PoolManager, PoolStats
+from .migrations import run_migrations, MIGRATIONS
+from .writer import GroupCommitWriter, WriterManager, WriterStats
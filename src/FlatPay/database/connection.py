@@ -2,18 +2,20 @@ import logging
 
 from aiosqlite import Connection, connect
 
+from FlatPay.core.config import SQLiteProfile
 from FlatPay.core.exceptions import DatabaseConnectionError, DatabaseCloseError
 
 
 connection_logger = logging.getLogger("connection")
 
 
-async def get_connection(path: str) -> Connection:
+async def get_connection(path: str, profile: SQLiteProfile | None = None) -> Connection:
     """
     Утилита для получения асинхронного соединения с базой данных.
 
     Параметры:
      - path (str): Путь к базе данных.
+     - profile (SQLiteProfile | None): PRAGMA-настройки, применяемые к соединению (None — настройки SQLite по умолчанию).
 
     Возвращаемое значение:
      - connection (Connection): Асинхронное соединение с базой данных.
@@ -23,10 +25,13 @@ async def get_connection(path: str) -> Connection:
     """
 
     try:
-        # Подключаемся к базе данных асинхронно
+        # Подключаемся к базе данных асинхронно (схема создаётся миграциями при старте приложения)
         connection: Connection = await connect(path, check_same_thread=False)
-        # Создаем таблицу, если её нет (если таблица уже есть, она не будет перезаписана)
-        await create_table(connection)
+
+        # Применяем профиль производительности (журнал, синхронизация, кэш и т.д.)
+        if profile is not None:
+            await apply_profile(connection, profile)
+
         return connection
 
     except Exception as e:
@@ -34,34 +39,17 @@ async def get_connection(path: str) -> Connection:
         raise DatabaseConnectionError(f"Не удалось подключиться к базе данных") from e
 
 
-async def create_table(connection: Connection) -> None:
+async def apply_profile(connection: Connection, profile: SQLiteProfile) -> None:
     """
-    Утилита для создания таблицы `Taxpayers` в базе данных, если она не существует.
+    Утилита для применения PRAGMA-настроек профиля к соединению.
 
     Параметры:
      - connection (Connection): Асинхронное соединение с базой данных.
-
-    Примечание:
-     - Если таблица уже существует, она не будет перезаписана.
+     - profile (SQLiteProfile): Профиль производительности SQLite.
     """
 
-    # SQL запрос для создания таблицы
-    await connection.execute('''
-    CREATE TABLE IF NOT EXISTS Taxpayers ( 
-        email TEXT PRIMARY KEY,
-        password TEXT,
-        salt TEXT,
-        electricity INTEGER DEFAULT 0,
-        cold_water INTEGER DEFAULT 0,
-        hot_water INTEGER DEFAULT 0,
-        gas INTEGER DEFAULT 0,
-        current_month_debt DECIMAL DEFAULT 0.0,
-        last_payment DECIMAL DEFAULT 0.0,
-        next_month_debt DECIMAL DEFAULT 0.0
-    )
-    ''')
-
-    await connection.commit()
+    for pragma in profile.pragmas:
+        await connection.execute(pragma)
 
 
 async def close_connection(connection: Connection) -> None:
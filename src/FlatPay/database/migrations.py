@@ -0,0 +1,513 @@
+import logging
+from dataclasses import dataclass
+
+from aiosqlite import Connection
+
+from FlatPay.core.config import SQLiteProfile
+from FlatPay.core.exceptions import DatabaseMigrationError
+from FlatPay.database.connection import get_connection, close_connection
+
+
+migrations_logger = logging.getLogger("migrations")
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    Одна версия схемы базы данных.
+
+    Атрибуты:
+     - version (int): Номер версии (строго возрастает).
+     - description (str): Краткое описание изменений.
+     - statements (tuple[str, ...]): SQL-запросы, выполняемые в одной транзакции.
+    """
+
+    version: int
+    description: str
+    statements: tuple[str, ...]
+
+
+# Список миграций. Новые версии добавляются только в конец, уже применённые не изменяются.
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(
+        version=1,
+        description="Таблица налогоплательщиков Taxpayers",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS Taxpayers (
+                email TEXT PRIMARY KEY,
+                password TEXT,
+                salt TEXT,
+                electricity INTEGER DEFAULT 0,
+                cold_water INTEGER DEFAULT 0,
+                hot_water INTEGER DEFAULT 0,
+                gas INTEGER DEFAULT 0,
+                current_month_debt DECIMAL DEFAULT 0.0,
+                last_payment DECIMAL DEFAULT 0.0,
+                next_month_debt DECIMAL DEFAULT 0.0
+            )
+            """,
+        )
+    ),
+    Migration(
+        version=2,
+        description="Ключи идемпотентности платежей payment_requests",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS payment_requests (
+                idempotency_key TEXT PRIMARY KEY,
+                email TEXT NOT NULL,
+                amount DECIMAL NOT NULL,
+                current_month_debt DECIMAL,
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            ) WITHOUT ROWID
+            """,
+        )
+    ),
+    Migration(
+        version=3,
+        description="Журнал платежей payments",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS payments (
+                id INTEGER PRIMARY KEY,
+                email TEXT NOT NULL,
+                amount DECIMAL NOT NULL,
+                balance_after DECIMAL NOT NULL,
+                created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_payments_email_created_at ON payments (email, created_at)
+            """,
+        )
+    ),
+    Migration(
+        version=4,
+        description="Версионированные тарифы tariffs",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS tariffs (
+                effective_from TEXT PRIMARY KEY,
+                electricity DECIMAL NOT NULL,
+                cold_water DECIMAL NOT NULL,
+                hot_water DECIMAL NOT NULL,
+                gas DECIMAL NOT NULL
+            ) WITHOUT ROWID
+            """,
+            # Казанские тарифы, действовавшие до появления таблицы
+            """
+            INSERT OR IGNORE INTO tariffs (effective_from, electricity, cold_water, hot_water, gas)
+            VALUES ('1970-01-01', 5.09, 29.41, 226.7, 7.47)
+            """,
+        )
+    ),
+    Migration(
+        version=5,
+        description="Контрольные точки закрытия месяца month_close_checkpoints",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS month_close_checkpoints (
+                job TEXT NOT NULL,
+                period TEXT NOT NULL,
+                last_email TEXT NOT NULL DEFAULT '',
+                processed INTEGER NOT NULL DEFAULT 0,
+                completed INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (job, period)
+            ) WITHOUT ROWID
+            """,
+            # Прошедший месяц до появления таблицы уже закрыт ежемесячной задачей (или закрывать нечего,
+            # если база новая): отметка не даёт новому лидеру закрыть его повторно (см. catch_up_month_close)
+            """
+            INSERT OR IGNORE INTO month_close_checkpoints (job, period, completed)
+            VALUES ('month_close', strftime('%Y-%m', 'now', 'localtime', 'start of month', '-1 month'), 1)
+            """,
+        )
+    ),
+    Migration(
+        version=6,
+        description="Время выполнения этапов закрытия месяца month_close_stages",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS month_close_stages (
+                period TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                seconds REAL NOT NULL DEFAULT 0,
+                rows INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (period, stage)
+            ) WITHOUT ROWID
+            """,
+        )
+    ),
+    Migration(
+        version=7,
+        description="Аренды для выбора лидера между процессами leases",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                acquired_at REAL NOT NULL,
+                renewed_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            ) WITHOUT ROWID
+            """,
+        )
+    ),
+    Migration(
+        version=8,
+        description="История показаний счётчиков readings_history",
+        statements=(
+            # Таблица без rowid хранится прямо в B-дереве первичного ключа (email, period):
+            # ключ — покрывающий индекс, диапазон периодов пользователя читается без обращений к таблице
+            """
+            CREATE TABLE IF NOT EXISTS readings_history (
+                email TEXT NOT NULL,
+                period TEXT NOT NULL,
+                electricity INTEGER NOT NULL,
+                cold_water INTEGER NOT NULL,
+                hot_water INTEGER NOT NULL,
+                gas INTEGER NOT NULL,
+                electricity_used INTEGER NOT NULL,
+                cold_water_used INTEGER NOT NULL,
+                hot_water_used INTEGER NOT NULL,
+                gas_used INTEGER NOT NULL,
+                submitted_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+                PRIMARY KEY (email, period)
+            ) WITHOUT ROWID
+            """,
+        )
+    ),
+    Migration(
+        version=9,
+        description="Статистика расхода consumption_stats и оценка аномальности показаний",
+        statements=(
+            # Скользящие среднее и дисперсия расхода по каждому счётчику; period — последний учтённый период
+            """
+            CREATE TABLE IF NOT EXISTS consumption_stats (
+                email TEXT PRIMARY KEY,
+                period TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                electricity_mean REAL NOT NULL,
+                cold_water_mean REAL NOT NULL,
+                hot_water_mean REAL NOT NULL,
+                gas_mean REAL NOT NULL,
+                electricity_var REAL NOT NULL,
+                cold_water_var REAL NOT NULL,
+                hot_water_var REAL NOT NULL,
+                gas_var REAL NOT NULL
+            ) WITHOUT ROWID
+            """,
+            # Наибольший |z| расхода по счётчикам на момент отправки показаний
+            """
+            ALTER TABLE readings_history ADD COLUMN anomaly_score REAL NOT NULL DEFAULT 0
+            """,
+        )
+    ),
+    Migration(
+        version=10,
+        description="Агрегаты для аналитики monthly_rollups и arrears_rollups",
+        statements=(
+            # Итоги по периодам: расход (по показаниям за период), начисления (при закрытии месяца)
+            # и оплаты (по месяцу платежа)
+            """
+            CREATE TABLE IF NOT EXISTS monthly_rollups (
+                period TEXT PRIMARY KEY,
+                accounts INTEGER NOT NULL DEFAULT 0,
+                electricity_used INTEGER NOT NULL DEFAULT 0,
+                cold_water_used INTEGER NOT NULL DEFAULT 0,
+                hot_water_used INTEGER NOT NULL DEFAULT 0,
+                gas_used INTEGER NOT NULL DEFAULT 0,
+                billed REAL NOT NULL DEFAULT 0,
+                paid REAL NOT NULL DEFAULT 0,
+                payments INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+            """,
+            # Распределение текущего долга по корзинам:
+            # 0 — нет долга, 1 — до 1000, 2 — до 5000, 3 — до 20000, 4 — больше 20000
+            """
+            CREATE TABLE IF NOT EXISTS arrears_rollups (
+                bucket INTEGER PRIMARY KEY,
+                accounts INTEGER NOT NULL DEFAULT 0,
+                debt REAL NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+            """,
+            # Начальные значения по уже накопленным данным (как rebuild_rollups_repo): дальше их меняют
+            # только триггеры, прибавляя и вычитая разницу. Начисления за прошедшие периоды в SQL не пересчитать,
+            # их заполняет backfill_rollups.py
+            """
+            INSERT INTO monthly_rollups (
+                period, accounts, electricity_used, cold_water_used, hot_water_used, gas_used
+            )
+            SELECT period, COUNT(*), SUM(electricity_used), SUM(cold_water_used), SUM(hot_water_used), SUM(gas_used)
+            FROM readings_history
+            GROUP BY period
+            """,
+            """
+            INSERT INTO monthly_rollups (period, paid, payments)
+            SELECT substr(created_at, 1, 7), SUM(amount), COUNT(*)
+            FROM payments
+            WHERE true
+            GROUP BY substr(created_at, 1, 7)
+            ON CONFLICT (period) DO UPDATE
+            SET paid = excluded.paid, payments = excluded.payments
+            """,
+            """
+            INSERT INTO arrears_rollups (bucket, accounts, debt)
+            SELECT CASE
+                       WHEN current_month_debt <= 0 THEN 0
+                       WHEN current_month_debt <= 1000 THEN 1
+                       WHEN current_month_debt <= 5000 THEN 2
+                       WHEN current_month_debt <= 20000 THEN 3
+                       ELSE 4
+                   END AS bucket,
+                   COUNT(*), SUM(current_month_debt)
+            FROM Taxpayers
+            GROUP BY bucket
+            """,
+            # Триггеры обновляют агрегаты в той же транзакции, что и исходную строку,
+            # поэтому их поддерживают все пути записи: отправка показаний, импорт, платежи, закрытие месяца
+            """
+            CREATE TRIGGER IF NOT EXISTS rollup_readings_insert AFTER INSERT ON readings_history
+            BEGIN
+                INSERT INTO monthly_rollups (
+                    period, accounts, electricity_used, cold_water_used, hot_water_used, gas_used
+                )
+                VALUES (
+                    NEW.period, 1, NEW.electricity_used, NEW.cold_water_used, NEW.hot_water_used, NEW.gas_used
+                )
+                ON CONFLICT (period) DO UPDATE
+                SET accounts = accounts + 1,
+                    electricity_used = electricity_used + excluded.electricity_used,
+                    cold_water_used = cold_water_used + excluded.cold_water_used,
+                    hot_water_used = hot_water_used + excluded.hot_water_used,
+                    gas_used = gas_used + excluded.gas_used;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS rollup_readings_update AFTER UPDATE OF
+                period, electricity_used, cold_water_used, hot_water_used, gas_used ON readings_history
+            BEGIN
+                UPDATE monthly_rollups
+                SET accounts = accounts - 1,
+                    electricity_used = electricity_used - OLD.electricity_used,
+                    cold_water_used = cold_water_used - OLD.cold_water_used,
+                    hot_water_used = hot_water_used - OLD.hot_water_used,
+                    gas_used = gas_used - OLD.gas_used
+                WHERE period = OLD.period;
+
+                INSERT INTO monthly_rollups (
+                    period, accounts, electricity_used, cold_water_used, hot_water_used, gas_used
+                )
+                VALUES (
+                    NEW.period, 1, NEW.electricity_used, NEW.cold_water_used, NEW.hot_water_used, NEW.gas_used
+                )
+                ON CONFLICT (period) DO UPDATE
+                SET accounts = accounts + 1,
+                    electricity_used = electricity_used + excluded.electricity_used,
+                    cold_water_used = cold_water_used + excluded.cold_water_used,
+                    hot_water_used = hot_water_used + excluded.hot_water_used,
+                    gas_used = gas_used + excluded.gas_used;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS rollup_readings_delete AFTER DELETE ON readings_history
+            BEGIN
+                UPDATE monthly_rollups
+                SET accounts = accounts - 1,
+                    electricity_used = electricity_used - OLD.electricity_used,
+                    cold_water_used = cold_water_used - OLD.cold_water_used,
+                    hot_water_used = hot_water_used - OLD.hot_water_used,
+                    gas_used = gas_used - OLD.gas_used
+                WHERE period = OLD.period;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS rollup_payments_insert AFTER INSERT ON payments
+            BEGIN
+                INSERT INTO monthly_rollups (period, paid, payments)
+                VALUES (substr(NEW.created_at, 1, 7), NEW.amount, 1)
+                ON CONFLICT (period) DO UPDATE
+                SET paid = paid + excluded.paid,
+                    payments = payments + 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS rollup_arrears_insert AFTER INSERT ON Taxpayers
+            BEGIN
+                INSERT INTO arrears_rollups (bucket, accounts, debt)
+                VALUES (
+                    CASE
+                        WHEN NEW.current_month_debt <= 0 THEN 0
+                        WHEN NEW.current_month_debt <= 1000 THEN 1
+                        WHEN NEW.current_month_debt <= 5000 THEN 2
+                        WHEN NEW.current_month_debt <= 20000 THEN 3
+                        ELSE 4
+                    END,
+                    1, NEW.current_month_debt
+                )
+                ON CONFLICT (bucket) DO UPDATE
+                SET accounts = accounts + 1,
+                    debt = debt + excluded.debt;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS rollup_arrears_update AFTER UPDATE OF current_month_debt ON Taxpayers
+            WHEN OLD.current_month_debt IS NOT NEW.current_month_debt
+            BEGIN
+                UPDATE arrears_rollups
+                SET accounts = accounts - 1,
+                    debt = debt - OLD.current_month_debt
+                WHERE bucket = CASE
+                    WHEN OLD.current_month_debt <= 0 THEN 0
+                    WHEN OLD.current_month_debt <= 1000 THEN 1
+                    WHEN OLD.current_month_debt <= 5000 THEN 2
+                    WHEN OLD.current_month_debt <= 20000 THEN 3
+                    ELSE 4
+                END;
+
+                INSERT INTO arrears_rollups (bucket, accounts, debt)
+                VALUES (
+                    CASE
+                        WHEN NEW.current_month_debt <= 0 THEN 0
+                        WHEN NEW.current_month_debt <= 1000 THEN 1
+                        WHEN NEW.current_month_debt <= 5000 THEN 2
+                        WHEN NEW.current_month_debt <= 20000 THEN 3
+                        ELSE 4
+                    END,
+                    1, NEW.current_month_debt
+                )
+                ON CONFLICT (bucket) DO UPDATE
+                SET accounts = accounts + 1,
+                    debt = debt + excluded.debt;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS rollup_arrears_delete AFTER DELETE ON Taxpayers
+            BEGIN
+                UPDATE arrears_rollups
+                SET accounts = accounts - 1,
+                    debt = debt - OLD.current_month_debt
+                WHERE bucket = CASE
+                    WHEN OLD.current_month_debt <= 0 THEN 0
+                    WHEN OLD.current_month_debt <= 1000 THEN 1
+                    WHEN OLD.current_month_debt <= 5000 THEN 2
+                    WHEN OLD.current_month_debt <= 20000 THEN 3
+                    ELSE 4
+                END;
+            END
+            """,
+        )
+    ),
+    Migration(
+        version=11,
+        description="Версия аккаунта для условных запросов (ETag) к страницам пользователя",
+        statements=(
+            # Версию увеличивают сами запросы записи, меняющие данные страниц пользователя (долг, платёж,
+            # показания): отдельная запись строки Taxpayers в триггере заметно замедляла массовый импорт
+            "ALTER TABLE Taxpayers ADD COLUMN version INTEGER NOT NULL DEFAULT 0",
+        )
+    ),
+)
+
+
+async def get_schema_version(connection: Connection) -> int:
+    """
+    Возвращает номер последней применённой миграции (0, если миграций ещё не было).
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+    """
+
+    async with connection.execute("SELECT MAX(version) FROM schema_version") as cursor:
+        row = await cursor.fetchone()
+
+    return row[0] or 0
+
+
+async def apply_migrations(connection: Connection, migrations: tuple[Migration, ...] = MIGRATIONS) -> int:
+    """
+    Применяет к базе данных все миграции, версия которых больше текущей.
+
+    Все миграции выполняются в одной транзакции BEGIN IMMEDIATE, поэтому
+    несколько процессов, стартующих одновременно, не применят их дважды.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - migrations (tuple[Migration, ...]): Список миграций.
+
+    Возвращаемое значение:
+     - int: Версия схемы после применения миграций.
+    """
+
+    await connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    await connection.commit()
+
+    # Захватываем блокировку на запись до чтения версии, чтобы исключить гонку между процессами
+    await connection.execute("BEGIN IMMEDIATE")
+
+    try:
+        current_version = await get_schema_version(connection)
+
+        for migration in migrations:
+            if migration.version <= current_version:
+                continue
+
+            for statement in migration.statements:
+                await connection.execute(statement)
+
+            await connection.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (migration.version, migration.description)
+            )
+            migrations_logger.info(f"Применена миграция {migration.version}: {migration.description}")
+            current_version = migration.version
+
+        await connection.commit()
+
+    except Exception:
+        await connection.rollback()
+        raise
+
+    return current_version
+
+
+async def run_migrations(path: str, profile: SQLiteProfile | None = None) -> int:
+    """
+    Открывает отдельное соединение и приводит схему базы данных к последней версии.
+
+    Вызывается один раз при старте процесса, до создания пула соединений.
+
+    Параметры:
+     - path (str): Путь к базе данных.
+     - profile (SQLiteProfile | None): PRAGMA-настройки (в том числе режим журнала, который сохраняется в файле БД).
+
+    Возвращаемое значение:
+     - int: Версия схемы после применения миграций.
+
+    Исключения:
+     - DatabaseMigrationError: Ошибка при применении миграций.
+    """
+
+    connection = await get_connection(path=path, profile=profile)
+
+    try:
+        version = await apply_migrations(connection)
+        migrations_logger.info(f"Схема базы данных актуальна (версия {version})")
+        return version
+
+    except Exception as e:
+        migrations_logger.error(f"Ошибка при применении миграций: {e}")
+        raise DatabaseMigrationError("Не удалось применить миграции базы данных") from e
+
+    finally:
+        await close_connection(connection)
@@ -0,0 +1,284 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import AsyncIterator
+
+from aiosqlite import Connection
+
+from FlatPay.core.config import SQLiteProfile
+from FlatPay.core.exceptions import DatabaseConnectionError, DatabasePoolTimeoutError
+from FlatPay.database.connection import get_connection, close_connection
+
+
+pool_logger = logging.getLogger("connection_pool")
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """
+    Снимок состояния пула соединений.
+
+    Атрибуты:
+     - size (int): Максимальное количество соединений в пуле.
+     - opened (int): Количество уже открытых соединений.
+     - in_use (int): Количество соединений, выданных обработчикам.
+     - idle (int): Количество свободных открытых соединений.
+     - waiting (int): Количество корутин, ожидающих свободное соединение.
+     - acquisitions (int): Общее количество выданных соединений.
+     - timeouts (int): Количество неудачных попыток получить соединение по таймауту.
+     - total_wait_time (float): Суммарное время ожидания соединений, сек.
+     - max_wait_time (float): Максимальное время ожидания соединения, сек.
+    """
+
+    size: int
+    opened: int
+    in_use: int
+    idle: int
+    waiting: int
+    acquisitions: int
+    timeouts: int
+    total_wait_time: float
+    max_wait_time: float
+
+    @property
+    def avg_wait_time(self) -> float:
+        """Среднее время ожидания соединения, сек."""
+
+        return self.total_wait_time / self.acquisitions if self.acquisitions else 0.0
+
+
+class ConnectionPool:
+    """
+    Ограниченный пул асинхронных соединений с SQLite.
+
+    Соединения открываются лениво (по мере необходимости), но не более `size` штук,
+    и переиспользуются между запросами и фоновыми задачами.
+    Если все соединения заняты, вызывающая сторона ждёт не дольше `timeout` секунд.
+    """
+
+    def __init__(
+            self, path: str, size: int = 5, timeout: float = 5.0, profile: SQLiteProfile | None = None
+    ) -> None:
+        """
+        Параметры:
+         - path (str): Путь к базе данных.
+         - size (int): Максимальное количество одновременно открытых соединений.
+         - timeout (float): Максимальное время ожидания свободного соединения, сек.
+         - profile (SQLiteProfile | None): PRAGMA-настройки для каждого нового соединения.
+        """
+
+        if size < 1:
+            raise ValueError("Размер пула должен быть больше нуля")
+
+        self._path = path
+        self._size = size
+        self._timeout = timeout
+        self._profile = profile
+
+        self._semaphore = asyncio.Semaphore(size)  # Ограничивает количество выданных соединений
+        self._idle: list[Connection] = []  # Свободные соединения (LIFO — «тёплые» соединения первыми)
+        self._opened = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+        self._drained = asyncio.Event()  # Выставляется, когда все соединения возвращены в пул
+        self._drained.set()
+
+        # Счётчики для статистики
+        self._acquisitions = 0
+        self._timeouts = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    async def acquire(self) -> Connection:
+        """
+        Выдаёт соединение из пула, открывая новое, если свободных нет и лимит не исчерпан.
+
+        Возвращаемое значение:
+         - Connection: Асинхронное соединение с базой данных.
+
+        Исключения:
+         - DatabaseConnectionError: Пул уже закрыт или не удалось открыть соединение.
+         - DatabasePoolTimeoutError: Свободное соединение не появилось за `timeout` секунд.
+        """
+
+        if self._closed:
+            raise DatabaseConnectionError("Пул соединений закрыт")
+
+        started = perf_counter()
+        self._waiting += 1
+
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self._timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            pool_logger.warning(f"Не удалось получить соединение из пула за {self._timeout} сек.")
+            raise DatabasePoolTimeoutError("Превышено время ожидания свободного соединения")
+        finally:
+            self._waiting -= 1
+
+        try:
+            # Берём свободное соединение или открываем новое
+            if self._idle:
+                connection = self._idle.pop()
+            else:
+                connection = await get_connection(path=self._path, profile=self._profile)
+                self._opened += 1
+
+        except Exception:
+            self._semaphore.release()
+            raise
+
+        waited = perf_counter() - started
+        self._acquisitions += 1
+        self._total_wait_time += waited
+        self._max_wait_time = max(self._max_wait_time, waited)
+
+        self._in_use += 1
+        self._drained.clear()
+        return connection
+
+    async def release(self, connection: Connection) -> None:
+        """
+        Возвращает соединение в пул.
+
+        Если соединение осталось внутри незавершённой транзакции, она откатывается,
+        чтобы следующий владелец получил «чистое» соединение.
+        После закрытия пула возвращённые соединения сразу закрываются.
+
+        Параметры:
+         - connection (Connection): Ранее выданное пулом соединение.
+        """
+
+        try:
+            if connection.in_transaction:
+                await connection.rollback()
+
+            if self._closed:
+                await close_connection(connection)
+                self._opened -= 1
+            else:
+                self._idle.append(connection)
+
+        except Exception as e:
+            # Повреждённое соединение не возвращаем в пул
+            pool_logger.error(f"Ошибка при возврате соединения в пул: {e}")
+            self._opened -= 1
+
+        finally:
+            self._in_use -= 1
+            self._semaphore.release()
+            if self._in_use == 0:
+                self._drained.set()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Connection]:
+        """
+        Контекстный менеджер: выдаёт соединение и гарантированно возвращает его в пул.
+
+        Пример:
+            async with pool.connection() as connection:
+                ...
+        """
+
+        connection = await self.acquire()
+        try:
+            yield connection
+        finally:
+            await self.release(connection)
+
+    async def close(self, timeout: float | None = None) -> None:
+        """
+        Закрывает пул: перестаёт выдавать соединения, дожидается возврата
+        занятых соединений и закрывает все открытые.
+
+        Параметры:
+         - timeout (float | None): Сколько ждать возврата занятых соединений, сек.
+                                   По умолчанию используется таймаут пула.
+        """
+
+        self._closed = True
+
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout=timeout or self._timeout)
+        except asyncio.TimeoutError:
+            pool_logger.warning(f"Пул закрыт, но {self._in_use} соединений всё ещё используются")
+
+        while self._idle:
+            connection = self._idle.pop()
+            try:
+                await close_connection(connection)
+            finally:
+                self._opened -= 1
+
+    @property
+    def stats(self) -> PoolStats:
+        """Текущая статистика пула соединений."""
+
+        return PoolStats(
+            size=self._size,
+            opened=self._opened,
+            in_use=self._in_use,
+            idle=len(self._idle),
+            waiting=self._waiting,
+            acquisitions=self._acquisitions,
+            timeouts=self._timeouts,
+            total_wait_time=self._total_wait_time,
+            max_wait_time=self._max_wait_time
+        )
+
+
+class PoolManager:
+    """
+    Глобальное хранилище для пула соединений.
+    Пул создаётся один раз при старте приложения и используется
+    обработчиками запросов и фоновыми задачами.
+    """
+
+    _pool: ConnectionPool | None = None
+
+    @classmethod
+    def init_pool(
+            cls, path: str, size: int, timeout: float, profile: SQLiteProfile | None = None
+    ) -> ConnectionPool:
+        """
+        Создаёт пул соединений и сохраняет его в классовую переменную.
+
+        Параметры:
+         - path (str): Путь к базе данных.
+         - size (int): Максимальное количество соединений.
+         - timeout (float): Время ожидания свободного соединения, сек.
+         - profile (SQLiteProfile | None): PRAGMA-настройки для соединений пула.
+
+        Возвращает:
+         - ConnectionPool: Созданный пул.
+        """
+
+        if cls._pool is not None:
+            raise DatabaseConnectionError("Пул соединений уже инициализирован")
+
+        cls._pool = ConnectionPool(path=path, size=size, timeout=timeout, profile=profile)
+        pool_logger.info(f"Пул соединений создан (size={size}, timeout={timeout})")
+        return cls._pool
+
+    @classmethod
+    def get_pool(cls) -> ConnectionPool:
+        """Возвращает текущий пул соединений."""
+
+        if cls._pool is None:
+            raise DatabaseConnectionError("Пул соединений не инициализирован! Сначала вызови init_pool().")
+
+        return cls._pool
+
+    @classmethod
+    async def close_pool(cls) -> None:
+        """Закрывает пул соединений и логирует итоговую статистику."""
+
+        if cls._pool is None:
+            return
+
+        pool, cls._pool = cls._pool, None
+        await pool.close()
+        pool_logger.info(f"Пул соединений закрыт: {pool.stats}")
@@ -0,0 +1,133 @@
+from aiosqlite import Connection
+
+
+async def add_billed_repo(connection: Connection, period: str, amount: float) -> None:
+    """
+    Репозиторий для учёта начислений за период в итогах месяца.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - period (str): Период (YYYY-MM).
+     - amount (float): Сумма начислений.
+    """
+
+    await connection.execute(
+        """
+        INSERT INTO monthly_rollups (period, billed) 
+        VALUES (?, ?)
+        ON CONFLICT (period) DO UPDATE 
+        SET billed = billed + excluded.billed
+        """, (period, amount)
+    )
+
+
+async def fetch_monthly_rollups_repo(connection: Connection, first_period: str, last_period: str) -> list[tuple]:
+    """
+    Репозиторий для получения итогов по месяцам диапазона периодов (диапазон первичного ключа).
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - first_period (str): Первый период (YYYY-MM) включительно.
+     - last_period (str): Последний период (YYYY-MM) включительно.
+
+    Возвращаемое значение:
+     - list[tuple]: Кортежи (period, accounts, 4 значения расхода, billed, paid, payments) по возрастанию периода.
+    """
+
+    async with connection.execute(
+            """
+            SELECT period, accounts,
+                   electricity_used, cold_water_used, hot_water_used, gas_used,
+                   billed, paid, payments
+            FROM monthly_rollups
+            WHERE period >= ? AND period <= ?
+            ORDER BY period
+            """, (first_period, last_period)
+    ) as cursor:
+        rollups = await cursor.fetchall()
+
+    return list(rollups)
+
+
+async def fetch_arrears_rollups_repo(connection: Connection) -> list[tuple]:
+    """
+    Репозиторий для получения распределения текущего долга по корзинам.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+
+    Возвращаемое значение:
+     - list[tuple]: Кортежи (bucket, accounts, debt) по возрастанию корзины.
+    """
+
+    async with connection.execute(
+            """
+            SELECT bucket, accounts, debt 
+            FROM arrears_rollups 
+            ORDER BY bucket
+            """
+    ) as cursor:
+        rollups = await cursor.fetchall()
+
+    return list(rollups)
+
+
+async def rebuild_rollups_repo(connection: Connection, billed: list[tuple[str, float]]) -> None:
+    """
+    Репозиторий для пересчёта агрегатов по исходным таблицам (полное сканирование).
+
+    Итоги по расходу, оплатам и распределение долга пересчитываются запросами GROUP BY
+    с теми же правилами, что и в триггерах миграции 10; начисления подставляются готовыми.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - billed (list[tuple[str, float]]): Пары (period, сумма начислений) по закрытым периодам.
+    """
+
+    await connection.execute("DELETE FROM monthly_rollups")
+    await connection.execute(
+        """
+        INSERT INTO monthly_rollups (
+            period, accounts, electricity_used, cold_water_used, hot_water_used, gas_used
+        )
+        SELECT period, COUNT(*), SUM(electricity_used), SUM(cold_water_used), SUM(hot_water_used), SUM(gas_used)
+        FROM readings_history
+        GROUP BY period
+        """
+    )
+    await connection.execute(
+        """
+        INSERT INTO monthly_rollups (period, paid, payments)
+        SELECT substr(created_at, 1, 7), SUM(amount), COUNT(*)
+        FROM payments
+        WHERE true
+        GROUP BY substr(created_at, 1, 7)
+        ON CONFLICT (period) DO UPDATE 
+        SET paid = excluded.paid, payments = excluded.payments
+        """
+    )
+    await connection.executemany(
+        """
+        INSERT INTO monthly_rollups (period, billed) 
+        VALUES (?, ?)
+        ON CONFLICT (period) DO UPDATE 
+        SET billed = excluded.billed
+        """, billed
+    )
+
+    await connection.execute("DELETE FROM arrears_rollups")
+    await connection.execute(
+        """
+        INSERT INTO arrears_rollups (bucket, accounts, debt)
+        SELECT CASE
+                   WHEN current_month_debt <= 0 THEN 0
+                   WHEN current_month_debt <= 1000 THEN 1
+                   WHEN current_month_debt <= 5000 THEN 2
+                   WHEN current_month_debt <= 20000 THEN 3
+                   ELSE 4
+               END AS bucket,
+               COUNT(*), SUM(current_month_debt)
+        FROM Taxpayers
+        GROUP BY bucket
+        """
+    )
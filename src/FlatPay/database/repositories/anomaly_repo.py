@@ -0,0 +1,146 @@
+import json
+
+from aiosqlite import Connection
+
+
+# Столбцы статистики в порядке (count, средние по METERS, дисперсии по METERS)
+_STATS_COLUMNS = """
+    count,
+    electricity_mean, cold_water_mean, hot_water_mean, gas_mean,
+    electricity_var, cold_water_var, hot_water_var, gas_var
+"""
+
+
+async def fetch_consumption_stats_repo(connection: Connection, period: str, emails: list[str]) -> dict:
+    """
+    Репозиторий для получения статистики расхода пользователей, накопленной до периода.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - period (str): Оцениваемый период (YYYY-MM): статистика, уже учитывающая его, не возвращается.
+     - emails (list[str]): Электронные почты пользователей.
+
+    Возвращаемое значение:
+     - dict: email -> кортеж (count, 4 средних, 4 дисперсии); пользователей без статистики в словаре нет.
+    """
+
+    async with connection.execute(
+            f"""
+            SELECT email, {_STATS_COLUMNS}
+            FROM consumption_stats
+            WHERE email IN (SELECT value FROM json_each(?)) AND period < ?
+            """, (json.dumps(emails), period)
+    ) as cursor:
+        rows = await cursor.fetchall()
+
+    return {email: stats for email, *stats in rows}
+
+
+async def fetch_stats_update_range_repo(
+        connection: Connection, period: str, after_email: str, last_email: str
+) -> list[tuple]:
+    """
+    Репозиторий для получения расхода за период, который ещё не учтён в статистике (диапазон пользователей).
+
+    Учитываются только настоящие измерения: показания за период есть, и они не первые у пользователя
+    (по первым показаниям расход нулевой). Пользователи, у которых период уже учтён, пропускаются,
+    поэтому повторный запуск не учитывает период дважды.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - period (str): Период (YYYY-MM).
+     - after_email (str): Нижняя граница диапазона email (не включительно).
+     - last_email (str): Верхняя граница диапазона email (включительно).
+
+    Возвращаемое значение:
+     - list[tuple]: Кортежи (email, 4 значения расхода, count, 4 средних, 4 дисперсии);
+                    у пользователей без статистики — нули.
+    """
+
+    async with connection.execute(
+            """
+            SELECT h.email,
+                   h.electricity_used, h.cold_water_used, h.hot_water_used, h.gas_used,
+                   COALESCE(s.count, 0),
+                   COALESCE(s.electricity_mean, 0), COALESCE(s.cold_water_mean, 0),
+                   COALESCE(s.hot_water_mean, 0), COALESCE(s.gas_mean, 0),
+                   COALESCE(s.electricity_var, 0), COALESCE(s.cold_water_var, 0),
+                   COALESCE(s.hot_water_var, 0), COALESCE(s.gas_var, 0)
+            FROM Taxpayers AS t
+            JOIN readings_history AS h ON h.email = t.email AND h.period = ?
+            LEFT JOIN consumption_stats AS s ON s.email = t.email
+            WHERE t.email > ? AND t.email <= ?
+              AND (s.period IS NULL OR s.period < h.period)
+              AND EXISTS (SELECT 1 FROM readings_history AS p WHERE p.email = h.email AND p.period < h.period)
+            ORDER BY t.email
+            """, (period, after_email, last_email)
+    ) as cursor:
+        rows = await cursor.fetchall()
+
+    return list(rows)
+
+
+async def upsert_consumption_stats_repo(connection: Connection, rows: list[tuple]) -> None:
+    """
+    Репозиторий для пакетного сохранения статистики расхода.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - rows (list[tuple]): Кортежи (email, period, count, 4 средних, 4 дисперсии).
+    """
+
+    await connection.executemany(
+        f"""
+        INSERT INTO consumption_stats (email, period, {_STATS_COLUMNS})
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (email) DO UPDATE
+        SET period = excluded.period,
+            count = excluded.count,
+            electricity_mean = excluded.electricity_mean,
+            cold_water_mean = excluded.cold_water_mean,
+            hot_water_mean = excluded.hot_water_mean,
+            gas_mean = excluded.gas_mean,
+            electricity_var = excluded.electricity_var,
+            cold_water_var = excluded.cold_water_var,
+            hot_water_var = excluded.hot_water_var,
+            gas_var = excluded.gas_var
+        """, rows
+    )
+
+
+async def fetch_anomaly_scan_chunk_repo(
+        connection: Connection, period: str, after_email: str, limit: int
+) -> list[tuple]:
+    """
+    Репозиторий для постраничного чтения расхода за период вместе со статистикой до периода
+    (keyset-пагинация по email).
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - period (str): Период (YYYY-MM).
+     - after_email (str): Последний email предыдущей страницы ("" — с начала таблицы).
+     - limit (int): Размер страницы.
+
+    Возвращаемое значение:
+     - list[tuple]: Кортежи (email, 4 значения расхода, count, 4 средних, 4 дисперсии), упорядоченные по email;
+                    пользователи без показаний за период или без статистики пропускаются.
+    """
+
+    async with connection.execute(
+            """
+            SELECT t.email,
+                   h.electricity_used, h.cold_water_used, h.hot_water_used, h.gas_used,
+                   s.count,
+                   s.electricity_mean, s.cold_water_mean, s.hot_water_mean, s.gas_mean,
+                   s.electricity_var, s.cold_water_var, s.hot_water_var, s.gas_var
+            FROM Taxpayers AS t
+            JOIN readings_history AS h ON h.email = t.email AND h.period = ?
+            JOIN consumption_stats AS s ON s.email = t.email AND s.period < h.period
+            WHERE t.email > ?
+            ORDER BY t.email
+            LIMIT ?
+            """, (period, after_email, limit)
+    ) as cursor:
+        rows = await cursor.fetchall()
+
+    return list(rows)
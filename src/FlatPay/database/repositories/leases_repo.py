@@ -0,0 +1,57 @@
+from aiosqlite import Connection
+
+
+async def acquire_lease_repo(connection: Connection, name: str, holder: str, now: float, ttl: float) -> bool:
+    """
+    Репозиторий для захвата или продления аренды.
+
+    Аренда достаётся процессу, если она свободна, уже принадлежит ему (продление)
+    или срок прежнего владельца истёк (перехват). Проверка и запись выполняются
+    одним запросом, поэтому два процесса не могут захватить аренду одновременно.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - name (str): Название аренды.
+     - holder (str): Идентификатор процесса-претендента.
+     - now (float): Текущее время (UNIX time), сек.
+     - ttl (float): Срок аренды, сек.
+
+    Возвращаемое значение:
+     - bool: True, если аренда принадлежит процессу до now + ttl, иначе False.
+    """
+
+    async with connection.execute(
+            """
+            INSERT INTO leases (name, holder, acquired_at, renewed_at, expires_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (name) DO UPDATE
+            SET holder = excluded.holder,
+                acquired_at = CASE WHEN leases.holder = excluded.holder
+                                   THEN leases.acquired_at ELSE excluded.acquired_at END,
+                renewed_at = excluded.renewed_at,
+                expires_at = excluded.expires_at
+            WHERE leases.holder = excluded.holder OR leases.expires_at <= excluded.renewed_at
+            RETURNING holder
+            """, (name, holder, now, now, now + ttl)
+    ) as cursor:
+        row = await cursor.fetchone()
+
+    return row is not None
+
+
+async def release_lease_repo(connection: Connection, name: str, holder: str) -> None:
+    """
+    Репозиторий для освобождения аренды её владельцем (другой процесс сможет захватить её сразу).
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - name (str): Название аренды.
+     - holder (str): Идентификатор процесса-владельца.
+    """
+
+    await connection.execute(
+        """
+        DELETE FROM leases WHERE name = ? AND holder = ?
+        """, (name, holder)
+    )
+
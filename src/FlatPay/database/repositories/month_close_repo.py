@@ -0,0 +1,199 @@
+from aiosqlite import Connection
+
+
+async def fetch_checkpoint_repo(connection: Connection, job: str, period: str) -> tuple | None:
+    """
+    Репозиторий для получения контрольной точки задачи закрытия месяца.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - job (str): Название задачи.
+     - period (str): Закрываемый период (YYYY-MM).
+
+    Возвращаемое значение:
+     - tuple | None: Кортеж (last_email, processed, completed), если задача уже запускалась; иначе None.
+    """
+
+    async with connection.execute(
+            """
+            SELECT last_email, processed, completed 
+            FROM month_close_checkpoints 
+            WHERE job = ? AND period = ?
+            """, (job, period)
+    ) as cursor:
+        checkpoint = await cursor.fetchone()
+
+    return checkpoint
+
+
+async def fetch_unfinished_periods_repo(connection: Connection, job: str) -> list[str]:
+    """
+    Репозиторий для получения периодов, для которых задача закрытия месяца начата, но не завершена.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - job (str): Название задачи.
+
+    Возвращаемое значение:
+     - list[str]: Периоды (YYYY-MM) по возрастанию.
+    """
+
+    async with connection.execute(
+            """
+            SELECT period 
+            FROM month_close_checkpoints 
+            WHERE job = ? AND completed = 0
+            ORDER BY period
+            """, (job,)
+    ) as cursor:
+        periods = await cursor.fetchall()
+
+    return [period for period, in periods]
+
+
+async def fetch_latest_period_repo(connection: Connection, job: str) -> str | None:
+    """
+    Репозиторий для получения последнего периода, для которого задача закрытия месяца запускалась
+    (завершена или начата).
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - job (str): Название задачи.
+
+    Возвращаемое значение:
+     - str | None: Период (YYYY-MM); None, если задача ещё не запускалась.
+    """
+
+    async with connection.execute(
+            """
+            SELECT MAX(period) 
+            FROM month_close_checkpoints 
+            WHERE job = ?
+            """, (job,)
+    ) as cursor:
+        period = await cursor.fetchone()
+
+    return period[0]
+
+
+async def fetch_chunk_upper_bound_repo(connection: Connection, after_email: str, chunk_size: int) -> str | None:
+    """
+    Репозиторий для поиска верхней границы следующей порции пользователей (keyset-пагинация по email).
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - after_email (str): Последний обработанный email ("" — с начала таблицы).
+     - chunk_size (int): Размер порции.
+
+    Возвращаемое значение:
+     - str | None: Последний email порции; None, если пользователей после `after_email` нет.
+    """
+
+    async with connection.execute(
+            """
+            SELECT MAX(email) 
+            FROM (SELECT email FROM Taxpayers WHERE email > ? ORDER BY email LIMIT ?)
+            """, (after_email, chunk_size)
+    ) as cursor:
+        upper_bound = await cursor.fetchone()
+
+    return upper_bound[0]
+
+
+async def save_checkpoint_repo(
+        connection: Connection, job: str, period: str, last_email: str, processed: int, completed: bool
+) -> None:
+    """
+    Репозиторий для сохранения контрольной точки задачи закрытия месяца.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - job (str): Название задачи.
+     - period (str): Закрываемый период (YYYY-MM).
+     - last_email (str): Последний обработанный email.
+     - processed (int): Количество обработанных порций.
+     - completed (bool): Завершена ли задача.
+    """
+
+    await connection.execute(
+        """
+        INSERT INTO month_close_checkpoints (job, period, last_email, processed, completed, updated_at) 
+        VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT (job, period) DO UPDATE 
+        SET last_email = excluded.last_email, 
+            processed = excluded.processed, 
+            completed = excluded.completed, 
+            updated_at = excluded.updated_at
+        """, (job, period, last_email, processed, int(completed))
+    )
+
+
+async def add_stage_timing_repo(connection: Connection, period: str, stage: str, seconds: float, rows: int) -> None:
+    """
+    Репозиторий для накопления времени выполнения этапа закрытия месяца.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - period (str): Закрываемый период (YYYY-MM).
+     - stage (str): Название этапа.
+     - seconds (float): Время выполнения этапа на очередной порции, сек.
+     - rows (int): Количество пользователей в порции.
+    """
+
+    await connection.execute(
+        """
+        INSERT INTO month_close_stages (period, stage, seconds, rows) 
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (period, stage) DO UPDATE 
+        SET seconds = seconds + excluded.seconds, rows = rows + excluded.rows
+        """, (period, stage, seconds, rows)
+    )
+
+
+async def fetch_stage_timings_repo(connection: Connection, period: str) -> list[tuple]:
+    """
+    Репозиторий для получения времени выполнения этапов закрытия месяца.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - period (str): Закрываемый период (YYYY-MM).
+
+    Возвращаемое значение:
+     - list[tuple]: Кортежи (stage, seconds, rows).
+    """
+
+    async with connection.execute(
+            """
+            SELECT stage, seconds, rows 
+            FROM month_close_stages 
+            WHERE period = ?
+            """, (period,)
+    ) as cursor:
+        timings = await cursor.fetchall()
+
+    return list(timings)
+
+
+async def fetch_completed_periods_repo(connection: Connection, job: str) -> list[str]:
+    """
+    Репозиторий для получения периодов, для которых задача закрытия месяца завершена.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - job (str): Название задачи.
+
+    Возвращаемое значение:
+     - list[str]: Периоды (YYYY-MM) по возрастанию.
+    """
+
+    async with connection.execute(
+            """
+            SELECT period 
+            FROM month_close_checkpoints 
+            WHERE job = ? AND completed = 1
+            ORDER BY period
+            """, (job,)
+    ) as cursor:
+        periods = await cursor.fetchall()
+
+    return [period for period, in periods]
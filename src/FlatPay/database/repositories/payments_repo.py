@@ -1,110 +1,215 @@
+import json
+
 from aiosqlite import Connection
 from pydantic import EmailStr
 
 from FlatPay.app.models import Payment
+from FlatPay.core.exceptions import IdempotencyKeyConflictError
 
 
-async def update_current_month_debt_repo(connection: Connection) -> None:
+async def rollover_debt_repo(connection: Connection, after_email: str, last_email: str) -> None:
     """
-    Репозиторий для обновления долга за текущий месяц:
-    складывает current_month_debt и next_month_debt.
+    Репозиторий для переноса долга на текущий месяц для диапазона пользователей:
+    складывает current_month_debt и next_month_debt и обнуляет next_month_debt одним запросом.
+    Версия аккаунта увеличивается только у пользователей, чей долг изменился.
 
     Параметры:
      - connection (Connection): Асинхронное соединение с базой данных.
+     - after_email (str): Нижняя граница диапазона email (не включительно).
+     - last_email (str): Верхняя граница диапазона email (включительно).
     """
 
     await connection.execute(
         """
         UPDATE Taxpayers 
-        SET debt = current_month_debt + next_month_debt
-        """
+        SET current_month_debt = current_month_debt + next_month_debt, next_month_debt = 0,
+            version = version + (next_month_debt != 0)
+        WHERE email > ? AND email <= ?
+        """, (after_email, last_email)
     )
 
-    await connection.commit()
-
 
-async def reset_next_month_debt_repo(connection: Connection) -> None:
+async def update_next_month_debt_repo(connection: Connection, debt: float, email: EmailStr) -> None:
     """
-    Репозиторий для сброса долга в столбце next_month_debt.
+    Репозиторий для обновления долга пользователя за следующий месяц (и версии аккаунта).
 
     Параметры:
      - connection (Connection): Асинхронное соединение с базой данных.
+     - debt (float): Долг, который нужно установить на следующий месяц.
+     - email (EmailStr): Электронная почта пользователя.
     """
 
     await connection.execute(
         """
         UPDATE Taxpayers 
-        SET next_month_debt = 0
-        """
+        SET next_month_debt = ?, version = version + 1
+        WHERE email = ?
+        """, (debt, email)
     )
 
-    await connection.commit()
 
-
-async def update_next_month_debt_repo(connection: Connection, debt: float, email: EmailStr) -> None:
+async def update_next_month_debts_repo(connection: Connection, debts: list[tuple[float, str]]) -> None:
     """
-    Репозиторий для обновления долга пользователя за следующий месяц.
+    Репозиторий для пакетного обновления долга за следующий месяц (и версии аккаунта) у множества пользователей.
 
     Параметры:
      - connection (Connection): Асинхронное соединение с базой данных.
-     - debt (float): Долг, который нужно установить на следующий месяц.
-     - email (EmailStr): Электронная почта пользователя.
+     - debts (list[tuple[float, str]]): Пары (долг, email).
     """
 
-    await connection.execute(
+    await connection.executemany(
         """
         UPDATE Taxpayers 
-        SET next_month_debt = ? 
+        SET next_month_debt = ?, version = version + 1
         WHERE email = ?
-        """, (debt, email)
+        """, debts
     )
 
-    await connection.commit()
+
+async def fetch_current_debts_repo(connection: Connection, emails: list[str]) -> dict[str, float]:
+    """
+    Репозиторий для получения текущего долга сразу для множества пользователей.
+
+    Список email передаётся одним JSON-параметром, поэтому размер пачки не ограничен
+    максимальным количеством параметров запроса SQLite.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - emails (list[str]): Электронные почты пользователей.
+
+    Возвращаемое значение:
+     - dict[str, float]: email -> текущий долг. Email, которых нет в таблице пользователей, в словарь не попадают.
+    """
+
+    async with connection.execute(
+            """
+            SELECT email, current_month_debt
+            FROM Taxpayers
+            WHERE email IN (SELECT value FROM json_each(?))
+            """, (json.dumps(emails),)
+    ) as cursor:
+        rows = await cursor.fetchall()
+
+    return dict(rows)
 
 
-async def apply_user_payment_repo(
-        connection: Connection, new_payment: Payment, new_debt: float, email: EmailStr
-) -> None:
+async def apply_user_payment_repo(connection: Connection, email: EmailStr, payment: Payment) -> float:
     """
     Репозиторий для оплаты задолжности пользователя.
 
+    Списывает платёж одним запросом UPDATE ... RETURNING, поэтому параллельные
+    платежи одного пользователя не теряют обновления, и в той же транзакции
+    добавляет запись в журнал платежей вместе с остатком долга после платежа.
+    Если у платежа есть ключ идемпотентности и он уже использовался для того же платежа
+    (тот же пользователь и та же сумма), повторное списание не выполняется.
+
     Параметры:
      - connection (Connection): Асинхронное соединение с базой данных.
-     - new_payment (NewPayment): Данные о новом платеже.
-     - new_debt (float): Новый долг после учёта платежа.
      - email (EmailStr): Электронная почта пользователя.
+     - payment (Payment): Данные о новом платеже.
+
+    Возвращаемое значение:
+     - float: Долг после учёта платежа.
+
+    Исключения:
+     - ValueError: Пользователь не найден.
+     - IdempotencyKeyConflictError: Ключ идемпотентности уже использован другим пользователем
+       или для платежа с другой суммой.
     """
 
+    if payment.idempotency_key is not None:
+        # Регистрируем ключ; если он уже есть — это повтор уже применённого платежа
+        async with connection.execute(
+                """
+                INSERT OR IGNORE INTO payment_requests (idempotency_key, email, amount) 
+                VALUES (?, ?, ?)
+                """, (payment.idempotency_key, email, payment.amount)
+        ) as cursor:
+            is_new_request = cursor.rowcount == 1
+
+        if not is_new_request:
+            async with connection.execute(
+                    """
+                    SELECT amount, current_month_debt 
+                    FROM payment_requests 
+                    WHERE idempotency_key = ? AND email = ?
+                    """, (payment.idempotency_key, email)
+            ) as cursor:
+                previous = await cursor.fetchone()
+
+            if previous is None:
+                raise IdempotencyKeyConflictError("Ключ идемпотентности уже использован другим пользователем")
+
+            # Тот же ключ с другой суммой — другой платёж: молча вернуть прежний результат значило бы его потерять
+            if previous[0] != payment.amount:
+                raise IdempotencyKeyConflictError(
+                    f"Ключ идемпотентности уже использован для платежа на сумму {previous[0]}"
+                )
+
+            return previous[1]
+
+    async with connection.execute(
+            """
+            UPDATE Taxpayers 
+            SET last_payment = ?, current_month_debt = current_month_debt - ?, version = version + 1
+            WHERE email = ?
+            RETURNING current_month_debt
+            """, (payment.amount, payment.amount, email)
+    ) as cursor:
+        row = await cursor.fetchone()
+
+    if row is None:
+        raise ValueError(f"Пользователь {email} не найден")
+
+    # Добавляем платёж в журнал; остаток долга фиксируется в момент платежа
     await connection.execute(
         """
-        UPDATE Taxpayers 
-        SET last_payment = ?, current_month_debt = ? 
-        WHERE email = ?
-        """, (new_payment.amount, new_debt, email)
+        INSERT INTO payments (email, amount, balance_after) 
+        VALUES (?, ?, ?)
+        """, (email, payment.amount, row[0])
     )
 
-    await connection.commit()
+    if payment.idempotency_key is not None:
+        # Запоминаем результат, чтобы повторный запрос вернул тот же ответ
+        await connection.execute(
+            """
+            UPDATE payment_requests 
+            SET current_month_debt = ? 
+            WHERE idempotency_key = ?
+            """, (row[0], payment.idempotency_key)
+        )
+
+    return row[0]
 
 
-async def fetch_current_debt_repo(connection: Connection, email: EmailStr) -> float:
+async def fetch_payment_history_repo(
+        connection: Connection, email: EmailStr, since: str | None = None, until: str | None = None, limit: int = 50
+) -> list[tuple]:
     """
-    Репозиторий для извлечения долга пользователя из столбца current_month_debt.
+    Репозиторий для получения истории платежей пользователя (от новых к старым).
+
+    Запрос читает диапазон индекса (email, created_at), не пересчитывая остатки.
 
     Параметры:
      - connection (Connection): Асинхронное соединение с базой данных.
      - email (EmailStr): Электронная почта пользователя.
+     - since (str | None): Начало периода включительно (ISO-дата), None — без ограничения.
+     - until (str | None): Конец периода не включительно (ISO-дата), None — без ограничения.
+     - limit (int): Максимальное количество записей.
 
     Возвращаемое значение:
-     - float: Текущий долг пользователя.
+     - list[tuple]: Кортежи (amount, balance_after, created_at).
     """
 
     async with connection.execute(
             """
-            SELECT current_month_debt 
-            FROM Taxpayers 
-            WHERE email = ?
-            """, (email,)
+            SELECT amount, balance_after, created_at 
+            FROM payments 
+            WHERE email = ? AND created_at >= ? AND created_at < ?
+            ORDER BY created_at DESC
+            LIMIT ?
+            """, (email, since or "", until or "9999", limit)
     ) as cursor:
-        current_debt = await cursor.fetchone()
+        history = await cursor.fetchall()
 
-    return current_debt[0]
+    return list(history)
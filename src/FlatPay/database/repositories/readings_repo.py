@@ -1,68 +1,222 @@
+import json
+
 from aiosqlite import Connection
 from pydantic import EmailStr
 
-from FlatPay.app.models.models import Readings
+
+# Сохранение показаний за период: повторная отправка в том же периоде заменяет строку
+_UPSERT_READING = """
+    INSERT INTO readings_history (
+        email, period, electricity, cold_water, hot_water, gas,
+        electricity_used, cold_water_used, hot_water_used, gas_used, anomaly_score
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (email, period) DO UPDATE
+    SET electricity = excluded.electricity,
+        cold_water = excluded.cold_water,
+        hot_water = excluded.hot_water,
+        gas = excluded.gas,
+        electricity_used = excluded.electricity_used,
+        cold_water_used = excluded.cold_water_used,
+        hot_water_used = excluded.hot_water_used,
+        gas_used = excluded.gas_used,
+        anomaly_score = excluded.anomaly_score,
+        submitted_at = excluded.submitted_at
+"""
 
 
-async def reset_meter_readings_repo(connection: Connection) -> None:
+async def fetch_last_reading_repo(connection: Connection, email: EmailStr, period: str) -> tuple | None:
     """
-    Репозиторий для сброса показаний счётчиков всех пользователей.
+    Репозиторий для получения последних показаний пользователя до периода.
 
     Параметры:
     - connection (Connection): Асинхронное соединение с базой данных.
+    - email (EmailStr): Электронная почта пользователя.
+    - period (str): Период (YYYY-MM), показания берутся из более ранних периодов.
+
+    Возвращаемое значение:
+    - tuple | None: Кортеж (electricity, cold_water, hot_water, gas); None, если показаний ещё не было.
     """
 
-    await connection.execute(
-        """
-        UPDATE Taxpayers 
-        SET electricity = 0, cold_water = 0, hot_water = 0, gas = 0
-        """
-    )
-    await connection.commit()
+    async with connection.execute(
+            """
+            SELECT electricity, cold_water, hot_water, gas
+            FROM readings_history
+            WHERE email = ? AND period < ?
+            ORDER BY period DESC
+            LIMIT 1
+            """, (email, period)
+    ) as cursor:
+        previous = await cursor.fetchone()
+
+    return previous
 
 
-async def fetch_user_readings_repo(connection: Connection, email: EmailStr) -> tuple | None:
+async def fetch_previous_readings_repo(connection: Connection, period: str, emails: list[str]) -> dict:
     """
-    Репозиторий для получения показаний счётчиков пользователя.
+    Репозиторий для получения последних показаний до периода сразу для множества пользователей.
+
+    Список email передаётся одним JSON-параметром, поэтому размер пачки не ограничен
+    максимальным количеством параметров запроса SQLite.
 
     Параметры:
     - connection (Connection): Асинхронное соединение с базой данных.
-    - email (EmailStr): Электронная почта пользователя.
+    - period (str): Период (YYYY-MM), показания берутся из более ранних периодов.
+    - emails (list[str]): Электронные почты пользователей.
+
+    Возвращаемое значение:
+    - dict: email -> кортеж (electricity, cold_water, hot_water, gas) или None, если показаний ещё не было.
+            Email, которых нет в таблице пользователей, в словарь не попадают.
+    """
+
+    async with connection.execute(
+            """
+            SELECT t.email, h.electricity, h.cold_water, h.hot_water, h.gas
+            FROM Taxpayers AS t
+            LEFT JOIN readings_history AS h ON h.email = t.email AND h.period = (
+                SELECT MAX(period) FROM readings_history WHERE email = t.email AND period < ?
+            )
+            WHERE t.email IN (SELECT value FROM json_each(?))
+            """, (period, json.dumps(emails))
+    ) as cursor:
+        rows = await cursor.fetchall()
+
+    return {email: (None if values[0] is None else values) for email, *values in rows}
+
+
+async def fetch_latest_periods_repo(connection: Connection, emails: list[str]) -> dict[str, str]:
+    """
+    Репозиторий для получения последнего периода с показаниями сразу для множества пользователей.
+
+    Параметры:
+    - connection (Connection): Асинхронное соединение с базой данных.
+    - emails (list[str]): Электронные почты пользователей.
 
     Возвращаемое значение:
-    - tuple | None: Кортеж с показаниями (electricity, cold_water, hot_water, gas), если данные найдены; иначе None.
+    - dict[str, str]: email -> последний период (YYYY-MM). Пользователи без показаний в словарь не попадают.
     """
 
     async with connection.execute(
             """
-            SELECT electricity, cold_water, hot_water, gas 
-            FROM Taxpayers 
-            WHERE email = ?
-            """, (email,)
+            SELECT email, MAX(period)
+            FROM readings_history
+            WHERE email IN (SELECT value FROM json_each(?))
+            GROUP BY email
+            """, (json.dumps(emails),)
     ) as cursor:
-        readings = await cursor.fetchone()
+        rows = await cursor.fetchall()
 
-    return readings
+    return dict(rows)
 
 
-async def update_user_readings_repo(connection: Connection, email: EmailStr, readings: Readings) -> None:
+async def upsert_readings_repo(connection: Connection, rows: list[tuple]) -> None:
     """
-    Репозиторий для обновления показаний счётчиков пользователя в базе данных.
+    Репозиторий для пакетного сохранения показаний (один executemany на пачку).
+
+    Параметры:
+    - connection (Connection): Асинхронное соединение с базой данных.
+    - rows (list[tuple]): Кортежи (email, period, electricity, cold_water, hot_water, gas,
+                          electricity_used, cold_water_used, hot_water_used, gas_used, anomaly_score).
+    """
+
+    await connection.executemany(_UPSERT_READING, rows)
+
+
+async def fetch_readings_history_repo(
+        connection: Connection, email: EmailStr, since: str | None = None, until: str | None = None, limit: int = 24
+) -> list[tuple]:
+    """
+    Репозиторий для получения истории показаний пользователя (от новых периодов к старым).
+
+    Запрос читает диапазон первичного ключа (email, period) и не обращается к другим таблицам.
 
     Параметры:
     - connection (Connection): Асинхронное соединение с базой данных.
     - email (EmailStr): Электронная почта пользователя.
-    - readings (Readings): Объект Readings, содержащий новые показания счётчиков для пользователя.
+    - since (str | None): Первый период включительно (YYYY-MM), None — без ограничения.
+    - until (str | None): Последний период включительно (YYYY-MM), None — без ограничения.
+    - limit (int): Максимальное количество периодов.
+
+    Возвращаемое значение:
+    - list[tuple]: Кортежи (period, electricity, cold_water, hot_water, gas,
+                   electricity_used, cold_water_used, hot_water_used, gas_used, anomaly_score).
     """
 
-    await connection.execute(
-        """UPDATE Taxpayers 
-        SET electricity = ?, cold_water = ?, hot_water = ?, gas = ? 
-        WHERE email = ?
-        """, (readings.meter_readings["electricity"],
-              readings.meter_readings["cold_water"],
-              readings.meter_readings["hot_water"],
-              readings.meter_readings["gas"],
-              email)
-    )
-    await connection.commit()
+    async with connection.execute(
+            """
+            SELECT period, electricity, cold_water, hot_water, gas,
+                   electricity_used, cold_water_used, hot_water_used, gas_used, anomaly_score
+            FROM readings_history
+            WHERE email = ? AND period >= ? AND period <= ?
+            ORDER BY period DESC
+            LIMIT ?
+            """, (email, since or "", until or "9999", limit)
+    ) as cursor:
+        history = await cursor.fetchall()
+
+    return list(history)
+
+
+async def fetch_consumption_chunk_repo(connection: Connection, period: str, after_email: str, limit: int) -> list[tuple]:
+    """
+    Репозиторий для постраничного чтения расхода всех пользователей за период (keyset-пагинация по email).
+
+    Параметры:
+    - connection (Connection): Асинхронное соединение с базой данных.
+    - period (str): Период (YYYY-MM).
+    - after_email (str): Последний email предыдущей страницы ("" — с начала таблицы).
+    - limit (int): Размер страницы.
+
+    Возвращаемое значение:
+    - list[tuple]: Кортежи (email, electricity, cold_water, hot_water, gas), упорядоченные по email;
+                   у пользователей без показаний за период расход нулевой.
+    """
+
+    async with connection.execute(
+            """
+            SELECT t.email,
+                   COALESCE(h.electricity_used, 0), COALESCE(h.cold_water_used, 0),
+                   COALESCE(h.hot_water_used, 0), COALESCE(h.gas_used, 0)
+            FROM Taxpayers AS t
+            LEFT JOIN readings_history AS h ON h.email = t.email AND h.period = ?
+            WHERE t.email > ?
+            ORDER BY t.email
+            LIMIT ?
+            """, (period, after_email, limit)
+    ) as cursor:
+        rows = await cursor.fetchall()
+
+    return list(rows)
+
+
+async def fetch_consumption_range_repo(
+        connection: Connection, period: str, after_email: str, last_email: str
+) -> list[tuple]:
+    """
+    Репозиторий для получения расхода диапазона пользователей за период.
+
+    Параметры:
+    - connection (Connection): Асинхронное соединение с базой данных.
+    - period (str): Период (YYYY-MM).
+    - after_email (str): Нижняя граница диапазона email (не включительно).
+    - last_email (str): Верхняя граница диапазона email (включительно).
+
+    Возвращаемое значение:
+    - list[tuple]: Кортежи (email, electricity, cold_water, hot_water, gas), упорядоченные по email;
+                   у пользователей без показаний за период расход нулевой.
+    """
+
+    async with connection.execute(
+            """
+            SELECT t.email,
+                   COALESCE(h.electricity_used, 0), COALESCE(h.cold_water_used, 0),
+                   COALESCE(h.hot_water_used, 0), COALESCE(h.gas_used, 0)
+            FROM Taxpayers AS t
+            LEFT JOIN readings_history AS h ON h.email = t.email AND h.period = ?
+            WHERE t.email > ? AND t.email <= ?
+            ORDER BY t.email
+            """, (period, after_email, last_email)
+    ) as cursor:
+        rows = await cursor.fetchall()
+
+    return list(rows)
@@ -0,0 +1,75 @@
+from datetime import date
+
+from aiosqlite import Connection
+
+
+async def fetch_tariffs_repo(connection: Connection) -> list[tuple]:
+    """
+    Репозиторий для получения всех версий тарифов.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+
+    Возвращаемое значение:
+     - list[tuple]: Кортежи (effective_from, electricity, cold_water, hot_water, gas),
+                    упорядоченные по дате начала действия.
+    """
+
+    async with connection.execute(
+            """
+            SELECT effective_from, electricity, cold_water, hot_water, gas 
+            FROM tariffs 
+            ORDER BY effective_from
+            """
+    ) as cursor:
+        tariffs = await cursor.fetchall()
+
+    return list(tariffs)
+
+
+async def fetch_tariffs_version_repo(connection: Connection) -> tuple:
+    """
+    Репозиторий для получения отпечатка таблицы тарифов: одна строка агрегатов по маленькой таблице.
+
+    Отпечаток меняется при добавлении версии тарифов и при замене тарифов существующей версии,
+    поэтому по нему процесс узнаёт, что расписание в памяти устарело, не перечитывая его целиком.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+
+    Возвращаемое значение:
+     - tuple: Кортеж (количество версий, последняя дата начала действия, суммы тарифов по типам счётчиков).
+    """
+
+    async with connection.execute(
+            """
+            SELECT COUNT(*), MAX(effective_from), 
+                   TOTAL(electricity), TOTAL(cold_water), TOTAL(hot_water), TOTAL(gas) 
+            FROM tariffs
+            """
+    ) as cursor:
+        version = await cursor.fetchone()
+
+    return tuple(version)
+
+
+async def upsert_tariff_repo(connection: Connection, effective_from: date, tariffs: dict[str, float]) -> None:
+    """
+    Репозиторий для добавления (или замены) версии тарифов с указанной даты.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - effective_from (date): Дата начала действия тарифов.
+     - tariffs (dict[str, float]): Тарифы по типам счётчиков, руб./единицу.
+    """
+
+    await connection.execute(
+        """
+        INSERT OR REPLACE INTO tariffs (effective_from, electricity, cold_water, hot_water, gas) 
+        VALUES (?, ?, ?, ?, ?)
+        """, (effective_from.isoformat(),
+              tariffs["electricity"],
+              tariffs["cold_water"],
+              tariffs["hot_water"],
+              tariffs["gas"])
+    )
@@ -1,78 +1,122 @@
+import json
+
 from aiosqlite import Connection
 from pydantic import EmailStr
 
-from FlatPay.utils.security import hash_password
-
 
-async def register_user_repo(connection: Connection, email: EmailStr, password: str) -> None:
+async def register_user_repo(connection: Connection, email: EmailStr, hashed_password: str) -> None:
     """
     Репозиторий для регистрации пользователя в базе данных.
 
     Параметры:
      - connection (Connection): Асинхронное соединение с базой данных.
      - email (EmailStr): Электронная почта пользователя.
-     - password (str): Пароль пользователя.
+     - hashed_password (str): Самоописывающий хеш пароля (соль хранится внутри хеша).
+    """
+
+    await connection.execute(
+        """
+        INSERT INTO Taxpayers (email, password) VALUES (?, ?)
+        """, (email, hashed_password)
+    )
+
+
+async def update_user_password_repo(connection: Connection, email: EmailStr, hashed_password: str) -> None:
     """
+    Репозиторий для замены хеша пароля пользователя.
+
+    Отдельная соль старого формата больше не нужна и очищается.
 
-    hashed_password, salt = hash_password(password)
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - email (EmailStr): Электронная почта пользователя.
+     - hashed_password (str): Новый самоописывающий хеш пароля.
+    """
 
     await connection.execute(
         """
-        INSERT INTO Taxpayers (email, password, salt) VALUES (?, ?, ?)
-        """, (email, hashed_password, salt)
+        UPDATE Taxpayers SET password = ?, salt = NULL WHERE email = ?
+        """, (hashed_password, email)
     )
-    await connection.commit()
 
 
-async def fetch_user_password_repo(connection: Connection, email: EmailStr) -> str | None:
+async def touch_accounts_repo(connection: Connection, emails: list[str]) -> None:
     """
-    Репозиторий для получения хешированного пароля пользователя.
+    Репозиторий для увеличения версии аккаунтов (ETag страниц пользователя) после записи,
+    которая не обновляет строки Taxpayers сама (например, импорт показаний за прошлый период).
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - emails (list[str]): Электронные почты пользователей.
+    """
+
+    await connection.execute(
+        """
+        UPDATE Taxpayers SET version = version + 1 WHERE email IN (SELECT value FROM json_each(?))
+        """, (json.dumps(emails),)
+    )
+
+
+async def fetch_credentials_repo(connection: Connection, email: EmailStr) -> tuple[str, str | None] | None:
+    """
+    Репозиторий для получения учётных данных пользователя одним запросом по первичному ключу.
 
     Параметры:
      - connection (Connection): Асинхронное соединение с базой данных.
      - email (EmailStr): Электронная почта пользователя.
 
     Возвращаемое значение:
-     - str | None: Хешированный пароль пользователя, если он найден; иначе None.
+     - tuple[str, str | None] | None: Хеш пароля и соль старого формата (None для новых хешей);
+                                      None, если пользователь не найден.
     """
 
     async with connection.execute(
             """
-            SELECT password
+            SELECT password, salt
             FROM Taxpayers 
             WHERE email = ?
             """, (email, )
     ) as cursor:
-        password = await cursor.fetchone()
+        credentials = await cursor.fetchone()
 
-    if password:
-        return password[0]
+    if credentials:
+        return credentials[0], credentials[1]
 
     return None
 
 
-async def fetch_password_salt_repo(connection: Connection, email: EmailStr) -> str | None:
+async def fetch_account_summary_repo(connection: Connection, email: EmailStr, limit: int = 24) -> list[tuple]:
     """
-    Репозиторий для получения соли пользователя.
+    Репозиторий для получения сводки по аккаунту одним запросом: долг, последний платёж,
+    долг на следующий месяц и история показаний (от новых периодов к старым).
+
+    Строка пользователя читается по первичному ключу Taxpayers, история — диапазоном
+    первичного ключа readings_history (email, period).
 
     Параметры:
      - connection (Connection): Асинхронное соединение с базой данных.
      - email (EmailStr): Электронная почта пользователя.
+     - limit (int): Максимальное количество периодов истории.
 
     Возвращаемое значение:
-     - str | None: Соль пользователя, если она найдена; иначе None.
+     - list[tuple]: Кортежи (current_month_debt, last_payment, next_month_debt, version, period, electricity,
+                    cold_water, hot_water, gas, electricity_used, cold_water_used, hot_water_used, gas_used,
+                    anomaly_score);
+                    без показаний — одна строка с None вместо полей истории; пусто, если пользователь не найден.
     """
 
     async with connection.execute(
             """
-            SELECT salt
-            FROM Taxpayers 
-            WHERE email = ?
-            """, (email, )
+            SELECT t.current_month_debt, t.last_payment, t.next_month_debt, t.version,
+                   h.period, h.electricity, h.cold_water, h.hot_water, h.gas,
+                   h.electricity_used, h.cold_water_used, h.hot_water_used, h.gas_used, h.anomaly_score
+            FROM Taxpayers AS t
+            LEFT JOIN readings_history AS h ON h.email = t.email
+            WHERE t.email = ?
+            ORDER BY h.period DESC
+            LIMIT ?
+            """, (email, limit)
     ) as cursor:
-        salt = await cursor.fetchone()
-
-    if salt:
-        return salt[0]
+        rows = await cursor.fetchall()
 
-    return None
+    return list(rows)
@@ -0,0 +1,314 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, TypeVar
+
+from aiosqlite import Connection
+
+from FlatPay.core.config import SQLiteProfile
+from FlatPay.core.exceptions import DatabaseConnectionError
+from FlatPay.database.connection import get_connection, close_connection
+
+
+writer_logger = logging.getLogger("group_commit_writer")
+
+T = TypeVar("T")
+
+# Операция записи: корутина, принимающая соединение писателя первым аргументом
+WriteFunction = Callable[..., Awaitable[T]]
+
+
+@dataclass
+class WriteOperation:
+    """
+    Операция записи, ожидающая своей очереди.
+
+    Атрибуты:
+     - function (WriteFunction): Функция репозитория, выполняющая запись.
+     - args (tuple): Позиционные аргументы функции (после соединения).
+     - kwargs (dict): Именованные аргументы функции.
+     - future (asyncio.Future): Результат операции для вызывающей стороны.
+    """
+
+    function: WriteFunction
+    args: tuple
+    kwargs: dict
+    future: asyncio.Future = field(repr=False)
+
+
+@dataclass(frozen=True)
+class WriterStats:
+    """
+    Снимок статистики писателя.
+
+    Атрибуты:
+     - queued (int): Количество операций, ожидающих в очереди.
+     - batches (int): Количество зафиксированных транзакций.
+     - operations (int): Количество выполненных операций.
+     - failed (int): Количество операций, завершившихся ошибкой.
+     - max_batch (int): Максимальный размер пачки.
+    """
+
+    queued: int
+    batches: int
+    operations: int
+    failed: int
+    max_batch: int
+
+    @property
+    def avg_batch(self) -> float:
+        """Средний размер пачки (операций на одну транзакцию)."""
+
+        return self.operations / self.batches if self.batches else 0.0
+
+
+class GroupCommitWriter:
+    """
+    Единственный писатель в базу данных с групповой фиксацией транзакций.
+
+    Операции записи складываются в очередь asyncio, а отдельная задача забирает их
+    пачками (до `batch_size` операций или в течение `batch_window` секунд),
+    выполняет в одной транзакции на собственном соединении и делает один commit.
+    Каждая операция выполняется внутри SAVEPOINT, поэтому ошибка одной операции
+    не отменяет остальные операции пачки.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            profile: SQLiteProfile | None = None,
+            batch_size: int = 128,
+            batch_window: float = 0.002
+    ) -> None:
+        """
+        Параметры:
+         - path (str): Путь к базе данных.
+         - profile (SQLiteProfile | None): PRAGMA-настройки соединения писателя.
+         - batch_size (int): Максимальное количество операций в одной транзакции.
+         - batch_window (float): Сколько ждать новых операций после первой, сек.
+        """
+
+        if batch_size < 1:
+            raise ValueError("Размер пачки должен быть больше нуля")
+
+        self._path = path
+        self._profile = profile
+        self._batch_size = batch_size
+        self._batch_window = batch_window
+
+        self._queue: asyncio.Queue[WriteOperation | None] = asyncio.Queue()
+        self._connection: Connection | None = None
+        self._task: asyncio.Task | None = None
+        self._closed = False
+
+        # Счётчики для статистики
+        self._batches = 0
+        self._operations = 0
+        self._failed = 0
+        self._max_batch = 0
+
+    async def start(self) -> None:
+        """Открывает соединение писателя и запускает задачу обработки очереди."""
+
+        self._connection = await get_connection(path=self._path, profile=self._profile)
+        self._task = asyncio.create_task(self._run(), name="group-commit-writer")
+
+    async def submit(self, function: WriteFunction, *args: Any, **kwargs: Any) -> T:
+        """
+        Ставит операцию записи в очередь и ждёт фиксации её транзакции.
+
+        Параметры:
+         - function (WriteFunction): Функция репозитория вида `fn(connection, *args, **kwargs)`.
+                                     Функция не должна сама вызывать commit().
+         - *args, **kwargs: Аргументы функции.
+
+        Возвращаемое значение:
+         - Результат функции — после того, как транзакция с операцией зафиксирована.
+
+        Исключения:
+         - DatabaseConnectionError: Писатель остановлен.
+         - Любое исключение, выброшенное самой операцией или при фиксации транзакции.
+        """
+
+        if self._closed:
+            raise DatabaseConnectionError("Писатель базы данных остановлен")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(WriteOperation(function, args, kwargs, future))
+        return await future
+
+    async def close(self) -> None:
+        """Перестаёт принимать операции, выполняет уже поставленные в очередь и закрывает соединение."""
+
+        if self._closed:
+            return
+
+        self._closed = True
+        self._queue.put_nowait(None)  # Сигнал остановки — после всех уже поставленных операций
+
+        if self._task is not None:
+            await self._task
+
+        if self._connection is not None:
+            await close_connection(self._connection)
+            self._connection = None
+
+    async def _run(self) -> None:
+        """Основной цикл: собирает операции в пачки и фиксирует их одной транзакцией."""
+
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            operation = await self._queue.get()
+            if operation is None:
+                break
+
+            batch = [operation]
+            deadline = loop.time() + self._batch_window
+
+            # Добираем операции в пачку, пока не истекло окно или не набран лимит
+            try:
+                while len(batch) < self._batch_size:
+                    if self._queue.empty():
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        operation = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    else:
+                        operation = self._queue.get_nowait()
+
+                    if operation is None:
+                        stopping = True
+                        break
+
+                    batch.append(operation)
+
+            except asyncio.TimeoutError:
+                pass
+
+            await self._commit_batch(batch)
+
+    async def _commit_batch(self, batch: list[WriteOperation]) -> None:
+        """
+        Выполняет пачку операций в одной транзакции и разрешает их futures после commit.
+
+        Параметры:
+         - batch (list[WriteOperation]): Операции для выполнения.
+        """
+
+        connection = self._connection
+        outcomes: list[tuple[WriteOperation, Any, BaseException | None]] = []
+
+        try:
+            await connection.execute("BEGIN IMMEDIATE")
+
+            for operation in batch:
+                # Изолируем каждую операцию, чтобы её ошибка не откатила всю пачку
+                await connection.execute("SAVEPOINT write_operation")
+                try:
+                    result = await operation.function(connection, *operation.args, **operation.kwargs)
+                    await connection.execute("RELEASE SAVEPOINT write_operation")
+                    outcomes.append((operation, result, None))
+
+                except Exception as e:
+                    await connection.execute("ROLLBACK TO SAVEPOINT write_operation")
+                    await connection.execute("RELEASE SAVEPOINT write_operation")
+                    outcomes.append((operation, None, e))
+
+            await connection.commit()
+
+        except Exception as e:
+            writer_logger.error(f"Ошибка при фиксации пачки из {len(batch)} операций: {e}")
+            try:
+                await connection.rollback()
+            except Exception as rollback_error:
+                writer_logger.error(f"Ошибка при откате транзакции: {rollback_error}")
+
+            self._failed += len(batch)
+            for operation in batch:
+                if not operation.future.done():
+                    operation.future.set_exception(e)
+            return
+
+        self._batches += 1
+        self._operations += len(batch)
+        self._max_batch = max(self._max_batch, len(batch))
+
+        # Сообщаем результат вызывающим только после успешного commit
+        for operation, result, error in outcomes:
+            if operation.future.done():
+                continue
+            if error is not None:
+                self._failed += 1
+                operation.future.set_exception(error)
+            else:
+                operation.future.set_result(result)
+
+    @property
+    def stats(self) -> WriterStats:
+        """Текущая статистика писателя."""
+
+        return WriterStats(
+            queued=self._queue.qsize(),
+            batches=self._batches,
+            operations=self._operations,
+            failed=self._failed,
+            max_batch=self._max_batch
+        )
+
+
+class WriterManager:
+    """
+    Глобальное хранилище для писателя базы данных.
+    Писатель создаётся один раз при старте приложения, и через него
+    проходят все операции записи репозиториев.
+    """
+
+    _writer: GroupCommitWriter | None = None
+
+    @classmethod
+    async def init_writer(
+            cls, path: str, profile: SQLiteProfile | None, batch_size: int, batch_window: float
+    ) -> GroupCommitWriter:
+        """
+        Создаёт и запускает писателя.
+
+        Параметры:
+         - path (str): Путь к базе данных.
+         - profile (SQLiteProfile | None): PRAGMA-настройки соединения писателя.
+         - batch_size (int): Максимальное количество операций в одной транзакции.
+         - batch_window (float): Окно набора пачки, сек.
+
+        Возвращает:
+         - GroupCommitWriter: Запущенный писатель.
+        """
+
+        if cls._writer is not None:
+            raise DatabaseConnectionError("Писатель базы данных уже инициализирован")
+
+        writer = GroupCommitWriter(path=path, profile=profile, batch_size=batch_size, batch_window=batch_window)
+        await writer.start()
+        cls._writer = writer
+        writer_logger.info(f"Писатель запущен (batch_size={batch_size}, batch_window={batch_window})")
+        return writer
+
+    @classmethod
+    def get_writer(cls) -> GroupCommitWriter:
+        """Возвращает текущего писателя."""
+
+        if cls._writer is None:
+            raise DatabaseConnectionError("Писатель не инициализирован! Сначала вызови init_writer().")
+
+        return cls._writer
+
+    @classmethod
+    async def close_writer(cls) -> None:
+        """Останавливает писателя, дождавшись выполнения поставленных операций."""
+
+        if cls._writer is None:
+            return
+
+        writer, cls._writer = cls._writer, None
+        await writer.close()
+        writer_logger.info(f"Писатель остановлен: {writer.stats}")
@@ -0,0 +1 @@
+from .rollups import get_monthly_rollup, get_yearly_rollup, get_arrears_distribution, rebuild_rollups
@@ -0,0 +1,176 @@
+import logging
+from time import perf_counter
+
+import numpy as np
+from aiosqlite import Connection
+
+from FlatPay.app.models import MonthlyRollup, YearlyRollup, ArrearsBucket
+from FlatPay.database import WriterManager
+from FlatPay.database.repositories.analytics_repo import (
+    fetch_monthly_rollups_repo, fetch_arrears_rollups_repo, rebuild_rollups_repo
+)
+from FlatPay.database.repositories.month_close_repo import fetch_completed_periods_repo
+from FlatPay.database.repositories.readings_repo import fetch_consumption_chunk_repo
+from FlatPay.services.month_close.month_close import MONTH_CLOSE_JOB
+from FlatPay.utils.calculate_base_debt import calculate_base_debts
+from FlatPay.utils.tariffs import METERS, billing_day
+
+
+# Инициализируем логирование
+logger = logging.getLogger("analytics_services")
+
+# Границы корзин долга (bucket -> (от, до]); должны совпадать с CASE в миграции 10
+ARREARS_BUCKETS: tuple[tuple[float | None, float | None], ...] = (
+    (None, 0), (0, 1000), (1000, 5000), (5000, 20000), (20000, None)
+)
+
+
+def _monthly_rollup(row: tuple) -> MonthlyRollup:
+    """Собирает модель итогов месяца из строки monthly_rollups."""
+
+    period, accounts, *used, billed, paid, payments = row
+    return MonthlyRollup(
+        period=period,
+        accounts=accounts,
+        consumption=dict(zip(METERS, used)),
+        billed=round(billed, 2),
+        paid=round(paid, 2),
+        payments=payments
+    )
+
+
+async def get_monthly_rollup(connection: Connection, period: str) -> MonthlyRollup | bool:
+    """
+    Сервис для получения итогов за месяц: одна строка агрегатов, независимо от количества пользователей.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - period (str): Период (YYYY-MM).
+
+    Возвращаемое значение:
+     - MonthlyRollup: Итоги за месяц (нулевые, если за период ещё ничего не было).
+     - bool: False, если произошла ошибка.
+    """
+
+    try:
+        rows = await fetch_monthly_rollups_repo(connection, period, period)
+        return _monthly_rollup(rows[0]) if rows else MonthlyRollup(period=period)
+
+    except Exception as e:
+        logger.exception(f"Ошибка при получении итогов за {period}: {e}")
+        return False
+
+
+async def get_yearly_rollup(connection: Connection, year: int) -> YearlyRollup | bool:
+    """
+    Сервис для получения итогов за год: не больше 12 строк агрегатов.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - year (int): Год.
+
+    Возвращаемое значение:
+     - YearlyRollup: Итоги за год и по месяцам.
+     - bool: False, если произошла ошибка.
+    """
+
+    try:
+        rows = await fetch_monthly_rollups_repo(connection, f"{year:04d}-01", f"{year:04d}-12")
+        months = [_monthly_rollup(row) for row in rows]
+
+        return YearlyRollup(
+            year=year,
+            consumption={meter: sum(month.consumption[meter] for month in months) for meter in METERS},
+            billed=round(sum(month.billed for month in months), 2),
+            paid=round(sum(month.paid for month in months), 2),
+            payments=sum(month.payments for month in months),
+            months=months
+        )
+
+    except Exception as e:
+        logger.exception(f"Ошибка при получении итогов за {year} год: {e}")
+        return False
+
+
+async def get_arrears_distribution(connection: Connection) -> list[ArrearsBucket] | bool:
+    """
+    Сервис для получения распределения текущего долга пользователей по корзинам.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+
+    Возвращаемое значение:
+     - list[ArrearsBucket]: Все корзины по возрастанию долга (пустые — с нулями).
+     - bool: False, если произошла ошибка.
+    """
+
+    try:
+        rollups = {bucket: (accounts, debt) for bucket, accounts, debt in await fetch_arrears_rollups_repo(connection)}
+        distribution = []
+
+        for bucket, (debt_from, debt_to) in enumerate(ARREARS_BUCKETS):
+            accounts, debt = rollups.get(bucket, (0, 0.0))
+            distribution.append(
+                ArrearsBucket(debt_from=debt_from, debt_to=debt_to, accounts=accounts, debt=round(debt, 2))
+            )
+
+        return distribution
+
+    except Exception as e:
+        logger.exception(f"Ошибка при получении распределения долга: {e}")
+        return False
+
+
+async def _billed_for_period(connection: Connection, period: str, chunk_size: int) -> float:
+    """Пересчитывает сумму начислений за закрытый период так же, как этап billing закрытия месяца."""
+
+    day = billing_day(period)
+    last_email = ""
+    billed = 0.0
+
+    while True:
+        rows = await fetch_consumption_chunk_repo(connection, period, last_email, chunk_size)
+        if not rows:
+            break
+
+        emails, *meters = zip(*rows)
+        readings = np.column_stack([np.asarray(column, dtype=np.float64) for column in meters])
+
+        billed += float(calculate_base_debts(readings, day).sum())
+        last_email = emails[-1]
+
+    return billed
+
+
+async def rebuild_rollups(connection: Connection, chunk_size: int = 10000) -> bool:
+    """
+    Сервис для первичного заполнения (или восстановления) агрегатов по уже накопленным данным.
+
+    Начисления за закрытые периоды пересчитываются постранично на соединении для чтения,
+    затем все агрегаты заменяются одной операцией очереди записи, поэтому они согласованы
+    с показаниями и платежами, записанными до неё, а дальше поддерживаются триггерами.
+    Запускать вне закрытия месяца.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных (для чтения).
+     - chunk_size (int): Количество пользователей в одной странице при пересчёте начислений.
+
+    Возвращаемое значение:
+     - bool: True, если агрегаты пересчитаны, иначе False.
+    """
+
+    started = perf_counter()
+
+    try:
+        periods = await fetch_completed_periods_repo(connection, MONTH_CLOSE_JOB)
+        billed = [(period, await _billed_for_period(connection, period, chunk_size)) for period in periods]
+
+        await WriterManager.get_writer().submit(rebuild_rollups_repo, billed)
+        logger.info(
+            f"Агрегаты пересчитаны за {perf_counter() - started:.2f} сек. (закрытых периодов: {len(periods)})"
+        )
+        return True
+
+    except Exception as e:
+        logger.exception(f"Ошибка при пересчёте агрегатов: {e}")
+        return False
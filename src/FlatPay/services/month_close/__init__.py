@@ -0,0 +1,2 @@
+from .chunked import run_chunked_stage
+from .month_close import close_month, resume_month_closes, catch_up_month_close, closed_period, billing_day
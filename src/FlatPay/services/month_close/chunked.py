@@ -0,0 +1,96 @@
+import logging
+from typing import Awaitable, Callable
+
+from aiosqlite import Connection
+
+from FlatPay.database import PoolManager, WriterManager
+from FlatPay.database.repositories.month_close_repo import (
+    fetch_checkpoint_repo, fetch_chunk_upper_bound_repo, save_checkpoint_repo
+)
+
+
+# Инициализируем логирование
+logger = logging.getLogger("month_close_services")
+
+# Этап закрытия месяца: обновляет пользователей в диапазоне (after_email, last_email]
+ChunkStage = Callable[[Connection, str, str], Awaitable[None]]
+
+
+async def _process_chunk(
+        connection: Connection, job: str, period: str, after_email: str, chunk_size: int, processed: int,
+        stage: ChunkStage
+) -> str | None:
+    """
+    Обрабатывает одну порцию пользователей и сохраняет контрольную точку в той же транзакции.
+
+    Возвращаемое значение:
+     - str | None: Последний email обработанной порции; None, если пользователи закончились
+                   или задачу продвинул другой запуск.
+    """
+
+    # Контрольная точка должна совпадать с нашей позицией: иначе задачу параллельно
+    # выполняет другой запуск (например, прежний лидер), и повторно обрабатывать порцию нельзя
+    checkpoint = await fetch_checkpoint_repo(connection, job, period)
+    if checkpoint is not None and (checkpoint[2] or checkpoint[0] != after_email):
+        logger.warning(f"Задачу {job} за {period} продвинул другой запуск, останавливаемся на {after_email!r}")
+        return None
+
+    last_email = await fetch_chunk_upper_bound_repo(connection, after_email, chunk_size)
+
+    if last_email is None:
+        # Пользователи закончились — отмечаем задачу завершённой
+        await save_checkpoint_repo(connection, job, period, after_email, processed, completed=True)
+        return None
+
+    await stage(connection, after_email, last_email)
+    await save_checkpoint_repo(connection, job, period, last_email, processed + 1, completed=False)
+    return last_email
+
+
+async def run_chunked_stage(job: str, period: str, stage: ChunkStage, chunk_size: int) -> bool:
+    """
+    Выполняет этап закрытия месяца порциями по `chunk_size` пользователей (в порядке email).
+
+    Каждая порция — отдельная операция очереди записи: обновление и контрольная точка
+    фиксируются одной транзакцией, а запросы пользователей выполняются между порциями.
+    Повторный запуск продолжает работу с последней контрольной точки,
+    а уже завершённая за период задача не выполняется повторно.
+
+    Параметры:
+     - job (str): Название задачи (ключ контрольной точки).
+     - period (str): Закрываемый период (YYYY-MM).
+     - stage (ChunkStage): Функция репозитория, обновляющая диапазон пользователей.
+     - chunk_size (int): Размер порции.
+
+    Возвращаемое значение:
+     - bool: True, если этап выполнен (сейчас или ранее); False, если выполнение продолжил другой запуск.
+    """
+
+    async with PoolManager.get_pool().connection() as connection:
+        checkpoint = await fetch_checkpoint_repo(connection, job, period)
+
+    last_email, processed, completed = checkpoint or ("", 0, False)
+
+    if completed:
+        logger.info(f"Задача {job} за {period} уже выполнена, пропускаем")
+        return True
+
+    if checkpoint is not None:
+        logger.info(f"Продолжаем задачу {job} за {period} после {last_email!r} ({processed} порций)")
+
+    writer = WriterManager.get_writer()
+
+    while last_email is not None:
+        last_email = await writer.submit(
+            _process_chunk, job, period, last_email, chunk_size, processed, stage
+        )
+        processed += 1
+
+    async with PoolManager.get_pool().connection() as connection:
+        checkpoint = await fetch_checkpoint_repo(connection, job, period)
+
+    if checkpoint is None or not checkpoint[2]:
+        return False
+
+    logger.info(f"Задача {job} за {period} завершена ({checkpoint[1]} порций)")
+    return True
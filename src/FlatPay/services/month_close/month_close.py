@@ -0,0 +1,202 @@
+import logging
+from datetime import date, timedelta
+from functools import partial
+from time import perf_counter
+
+from aiosqlite import Connection
+
+from FlatPay.database import PoolManager
+from FlatPay.database.repositories.analytics_repo import add_billed_repo
+from FlatPay.database.repositories.month_close_repo import (
+    add_stage_timing_repo, fetch_stage_timings_repo, fetch_unfinished_periods_repo, fetch_latest_period_repo
+)
+from FlatPay.database.repositories.payments_repo import rollover_debt_repo
+from FlatPay.database.repositories.readings_repo import fetch_consumption_range_repo
+from FlatPay.services.month_close.chunked import run_chunked_stage
+from FlatPay.services.payments.billing import bill_accounts
+from FlatPay.services.readings.anomalies import update_stats_range
+from FlatPay.services.user.account import invalidate_accounts
+from FlatPay.utils.tariffs import billing_day
+
+
+# Инициализируем логирование
+logger = logging.getLogger("month_close_services")
+
+# Название задачи закрытия месяца (ключ контрольной точки)
+MONTH_CLOSE_JOB = "month_close"
+
+
+def closed_period(today: date | None = None) -> str:
+    """
+    Возвращает период, который закрывается в указанный день: предыдущий календарный месяц.
+
+    Параметры:
+     - today (date | None): Дата запуска (по умолчанию — сегодня).
+
+    Возвращаемое значение:
+     - str: Период в формате YYYY-MM.
+    """
+
+    today = today or date.today()
+    return (today.replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+
+
+async def _bill_range(
+        connection: Connection, after_email: str, last_email: str, period: str, billing_day: date
+) -> int:
+    """
+    Пересчитывает next_month_debt диапазона пользователей по расходу за месяц из истории показаний
+    (тем же пакетным расчётом, что и bill_all_accounts) и добавляет сумму начислений в итоги месяца.
+
+    Возвращаемое значение:
+     - int: Количество пользователей в диапазоне.
+    """
+
+    rows = await fetch_consumption_range_repo(connection, period, after_email, last_email)
+    if not rows:
+        return 0
+
+    billed = await bill_accounts(connection, rows, billing_day)
+    await add_billed_repo(connection, period, billed)
+    return len(rows)
+
+
+async def _close_range(
+        connection: Connection, after_email: str, last_email: str, period: str, billing_day: date
+) -> None:
+    """
+    Закрывает месяц для диапазона пользователей (after_email, last_email].
+
+    Этапы выполняются строго по порядку в одной транзакции писателя:
+     1. billing — долг за месяц по расходу за период и тарифам последнего дня периода;
+     2. rollover — перенос долга за месяц в основной долг;
+     3. stats — учёт расхода за месяц в скользящей статистике для оценки аномальных показаний.
+    Показания не сбрасываются: они хранятся в readings_history по периодам,
+    и расход следующего месяца считается от них.
+    Время каждого этапа накапливается в таблице month_close_stages.
+    """
+
+    started = perf_counter()
+    rows = await _bill_range(connection, after_email, last_email, period, billing_day)
+    billed = perf_counter()
+
+    await rollover_debt_repo(connection, after_email, last_email)
+    rolled = perf_counter()
+
+    await update_stats_range(connection, period, after_email, last_email)
+    finished = perf_counter()
+
+    for stage, seconds in (
+            ("billing", billed - started),
+            ("rollover", rolled - billed),
+            ("stats", finished - rolled)
+    ):
+        await add_stage_timing_repo(connection, period, stage, seconds, rows)
+
+
+async def close_month(period: str, chunk_size: int) -> bool:
+    """
+    Сервис закрытия месяца: пересчёт долга по расходу за месяц, перенос его в основной долг
+    и обновление статистики расхода.
+
+    Все этапы выполняются за один проход по таблице пользователей порциями по `chunk_size`
+    (см. run_chunked_stage): порция и её контрольная точка фиксируются одной транзакцией,
+    поэтому пользователь не может оказаться между этапами.
+
+    Параметры:
+     - period (str): Закрываемый период (YYYY-MM).
+     - chunk_size (int): Размер порции.
+
+    Возвращаемое значение:
+     - bool: True, если месяц закрыт (сейчас или ранее), иначе False.
+    """
+
+    try:
+        # Тарифы берутся на последний день закрываемого месяца (как и при оценке долга по показаниям)
+        stage = partial(_close_range, period=period, billing_day=billing_day(period))
+        closed = await run_chunked_stage(MONTH_CLOSE_JOB, period, stage, chunk_size)
+
+        # Долг меняется у всех пользователей: закэшированные данные аккаунтов сбрасываются целиком
+        invalidate_accounts()
+
+        if closed:
+            async with PoolManager.get_pool().connection() as connection:
+                timings = await fetch_stage_timings_repo(connection, period)
+
+            for stage_name, seconds, rows in timings:
+                logger.info(f"Закрытие {period}, этап {stage_name}: {seconds:.3f} сек. ({rows} пользователей)")
+
+        return closed
+
+    except Exception as e:
+        logger.exception(f"Ошибка при закрытии месяца {period}: {e}")
+        return False
+
+
+async def resume_month_closes(chunk_size: int) -> bool:
+    """
+    Сервис продолжения прерванных закрытий месяца: для каждого периода, у которого есть
+    незавершённая контрольная точка, закрытие продолжается с неё (в порядке периодов).
+
+    Прерванным может оказаться не только прошедший месяц: если прежний лидер остановился
+    посреди закрытия, а новый появился уже в следующем месяце, старый период тоже дозакрывается.
+
+    Параметры:
+     - chunk_size (int): Размер порции.
+
+    Возвращаемое значение:
+     - bool: True, если все прерванные закрытия завершены (или их не было), иначе False.
+    """
+
+    try:
+        async with PoolManager.get_pool().connection() as connection:
+            periods = await fetch_unfinished_periods_repo(connection, MONTH_CLOSE_JOB)
+
+    except Exception as e:
+        logger.exception(f"Ошибка при поиске прерванных закрытий месяца: {e}")
+        return False
+
+    closed = True
+    for period in periods:
+        logger.info(f"Продолжаем прерванное закрытие месяца {period}")
+        closed = await close_month(period, chunk_size) and closed
+
+    return closed
+
+
+async def catch_up_month_close(chunk_size: int, today: date | None = None) -> bool:
+    """
+    Сервис закрытия месяца для процесса, который только что стал лидером.
+
+    Сначала продолжает прерванные закрытия (resume_month_closes), затем закрывает прошедший месяц,
+    но только если запуск по расписанию (1-го числа) действительно пропущен: за прошедший месяц
+    и более поздние периоды закрытие не запускалось. Закрытие переносит next_month_debt в основной долг,
+    поэтому повторный запуск за уже закрытый месяц (например, ежемесячной задачей до появления
+    контрольных точек — их отмечает миграция 5) начислил бы долг второй раз.
+
+    Параметры:
+     - chunk_size (int): Размер порции.
+     - today (date | None): Текущая дата (по умолчанию — сегодня).
+
+    Возвращаемое значение:
+     - bool: True, если прерванные закрытия завершены и прошедший месяц закрыт (сейчас или ранее), иначе False.
+    """
+
+    resumed = await resume_month_closes(chunk_size)
+    period = closed_period(today)
+
+    try:
+        async with PoolManager.get_pool().connection() as connection:
+            latest = await fetch_latest_period_repo(connection, MONTH_CLOSE_JOB)
+
+    except Exception as e:
+        logger.exception(f"Ошибка при проверке пропущенного закрытия месяца: {e}")
+        return False
+
+    # Без отметок неизвестно, закрывался ли месяц: закрытие выполнит запуск по расписанию
+    if latest is None or latest >= period:
+        logger.info(f"Пропущенного закрытия месяца нет (последнее закрытие: {latest})")
+        return resumed
+
+    logger.info(f"Запуск закрытия месяца за {period} пропущен (последнее закрытие: {latest}), закрываем")
+    return await close_month(period, chunk_size) and resumed
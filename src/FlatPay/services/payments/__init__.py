@@ -1,3 +1,4 @@
 from .apply import apply_payment
-from .update import update_current_debt, update_next_debt
-from .getters import get_current_debt
+from .getters import get_current_debt, get_current_debts, get_payment_history
+from .billing import bill_all_accounts
+from .tariffs import reload_tariffs, refresh_tariffs, set_tariff
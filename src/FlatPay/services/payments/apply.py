@@ -1,11 +1,12 @@
 import logging
 
-from aiosqlite import Connection
+from aiosqlite import Error as SQLiteError
 from pydantic import EmailStr
 
-from FlatPay.database.repositories.payments_repo import (
-    apply_user_payment_repo,  fetch_current_debt_repo
-)
+from FlatPay.core.exceptions import DatabaseError, IdempotencyKeyConflictError
+from FlatPay.database import WriterManager
+from FlatPay.database.repositories.payments_repo import apply_user_payment_repo
+from FlatPay.services.user.account import invalidate_account
 from FlatPay.app.models import Payment
 
 
@@ -13,33 +14,39 @@ from FlatPay.app.models import Payment
 logger = logging.getLogger("payments_services")
 
 
-async def apply_payment(connection: Connection, email: EmailStr, payment: Payment) -> bool:
+async def apply_payment(email: EmailStr, payment: Payment) -> bool:
     """
     Сервис для применения оплаты и обновления текущей задолженности.
 
-    Вычитает сумму оплаты из текущего долга и сохраняет новое значение.
+    Вычитает сумму оплаты из текущего долга одним атомарным запросом.
+    Повторная отправка платежа с тем же ключом идемпотентности ничего не списывает,
+    а платёж с уже использованным ключом и другой суммой отклоняется.
 
     Параметры:
-     - connection (Connection): Асинхронное соединение с базой данных.
      - email (EmailStr): Электронная почта пользователя.
-     - new_payment (NewPayment): Данные об оплате.
+     - payment (Payment): Данные об оплате.
 
     Возвращаемое значение:
-     - bool: True, если оплата успешно применена, иначе False.
+     - bool: True, если оплата успешно применена (или уже была применена ранее), иначе False.
     """
 
     try:
-        # Получаем значение из столбца current_month_debt
-        current_month_debt: float = await fetch_current_debt_repo(connection, email)
-
-        # Высчитываем остаток долга за текущий месяц
-        new_debt = current_month_debt - payment.amount
-
-        # Передаем значение new_debt в столбец current_month_debt
-        await apply_user_payment_repo(connection, payment, new_debt, email)
-        logger.info(f"Оплата для {email} прошла успешно")
+        # Списываем оплату из столбца current_month_debt через очередь записи
+        new_debt: float = await WriterManager.get_writer().submit(apply_user_payment_repo, email, payment)
+        # Повтор платежа возвращает сохранённый ранее остаток, поэтому закэшированный долг удаляем, а не заменяем
+        invalidate_account(email)
+        logger.info(f"Оплата для {email} прошла успешно, текущий долг: {new_debt}")
         return True
 
+    except IdempotencyKeyConflictError as e:
+        logger.warning(f"Оплата для {email} отклонена: {e}")
+        return False
+
     except ValueError as e:
-        logger.exception(f"Введён неверный тип данных в параметр new_payment: {e}")
+        logger.exception(f"Не удалось применить оплату для {email}: {e}")
+        return False
+
+    except (DatabaseError, SQLiteError) as e:
+        # Писатель остановлен или пачка не зафиксирована — платёж не применён, показываем страницу ошибки
+        logger.exception(f"Ошибка базы данных при оплате для {email}: {e}")
         return False
@@ -0,0 +1,105 @@
+import logging
+from datetime import date
+from time import perf_counter
+
+import numpy as np
+from aiosqlite import Connection
+
+from FlatPay.database import WriterManager
+from FlatPay.database.repositories.payments_repo import update_next_month_debts_repo
+from FlatPay.database.repositories.readings_repo import fetch_consumption_chunk_repo
+from FlatPay.services.readings.readings import readings_period
+from FlatPay.services.user.account import invalidate_accounts
+from FlatPay.utils.calculate_base_debt import calculate_base_debts
+from FlatPay.utils.tariffs import billing_day
+
+
+# Инициализируем логирование
+logger = logging.getLogger("billing_services")
+
+
+async def bill_accounts(connection: Connection, rows: list[tuple], day: date) -> float:
+    """
+    Пересчитывает next_month_debt страницы пользователей одним матричным умножением и одним `executemany`.
+    Вызывается внутри операции писателя (commit не выполняется).
+
+    Параметры:
+     - connection (Connection): Соединение писателя.
+     - rows (list[tuple]): Кортежи (email, electricity, cold_water, hot_water, gas) — расход за период.
+     - day (date): Дата, на которую берутся тарифы.
+
+    Возвращаемое значение:
+     - float: Сумма начисленных долгов страницы.
+    """
+
+    # email отдельно, расход — матрицей (N, 4)
+    emails, *meters = zip(*rows)
+    readings = np.column_stack([np.asarray(column, dtype=np.float64) for column in meters])
+
+    debts = calculate_base_debts(readings, day)
+    await update_next_month_debts_repo(connection, list(zip(debts.tolist(), emails)))
+    return float(debts.sum())
+
+
+async def _bill_chunk(
+        connection: Connection, period: str, after_email: str, chunk_size: int, day: date
+) -> tuple[str, int] | None:
+    """
+    Пересчитывает долг следующей страницы пользователей после `after_email`.
+
+    Расход читается в той же транзакции писателя, что и запись долга, поэтому показания,
+    отправленные во время пересчёта, не перезаписываются оценкой по старому расходу.
+
+    Возвращаемое значение:
+     - tuple[str, int] | None: Последний email и размер страницы или None, если пользователи закончились.
+    """
+
+    rows = await fetch_consumption_chunk_repo(connection, period, after_email, chunk_size)
+    if not rows:
+        return None
+
+    await bill_accounts(connection, rows, day)
+    return rows[-1][0], len(rows)
+
+
+async def bill_all_accounts(period: str | None = None, chunk_size: int = 10000) -> int | bool:
+    """
+    Сервис для пакетного перерасчёта долга за следующий месяц у всех пользователей, например
+    после изменения тарифов открытого периода.
+
+    Расход за период читается из истории показаний страницами по `chunk_size` пользователей; каждая страница —
+    одна операция очереди записи (матричное умножение и `executemany`). Тарифы берутся на последний день периода,
+    как при отправке показаний и закрытии месяца.
+
+    Параметры:
+     - period (str | None): Период расхода (YYYY-MM, по умолчанию — открытый период показаний).
+     - chunk_size (int): Количество пользователей в одной странице.
+
+    Возвращаемое значение:
+     - int | bool: Количество пользователей, по которым пересчитан долг, или False при ошибке.
+    """
+
+    started = perf_counter()
+    period = period or readings_period()
+    day = billing_day(period)
+    writer = WriterManager.get_writer()
+    last_email = ""
+    billed = 0
+
+    try:
+        while True:
+            chunk = await writer.submit(_bill_chunk, period, last_email, chunk_size, day)
+            if chunk is None:
+                break
+
+            last_email, rows = chunk
+            billed += rows
+    except Exception as e:
+        logger.error(f"Ошибка при перерасчёте долга за {period}: {e}")
+        return False
+    finally:
+        # Оценка долга входит в сводки аккаунтов
+        invalidate_accounts()
+
+    logger.info(f"Долг за {period} пересчитан для {billed} пользователей за {perf_counter() - started:.2f} сек.")
+    return billed
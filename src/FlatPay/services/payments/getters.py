@@ -3,7 +3,9 @@ import logging
 from aiosqlite import Connection
 from pydantic import EmailStr
 
-from FlatPay.database.repositories.payments_repo import fetch_current_debt_repo
+from FlatPay.app.models import AccountDebt, PaymentRecord
+from FlatPay.database.repositories.payments_repo import fetch_current_debts_repo, fetch_payment_history_repo
+from FlatPay.services.user.account import get_account_summary
 
 
 # Инициализируем логирование
@@ -12,7 +14,7 @@ logger = logging.getLogger("payments_services")
 
 async def get_current_debt(connection: Connection, email: EmailStr) -> float | bool:
     """
-    Сервис для получения информации о текущей задолженности пользователя.
+    Сервис для получения информации о текущей задолженности пользователя (из сводки аккаунта).
 
     Параметры:
      - connection (Connection): Асинхронное соединение с базой данных.
@@ -23,11 +25,57 @@ async def get_current_debt(connection: Connection, email: EmailStr) -> float | b
      - bool: False, если произошла ошибка.
     """
 
+    # Сводка уже логирует ошибки и возвращает False
+    summary = await get_account_summary(connection, email)
+    return summary.current_debt if summary else False
+
+
+async def get_current_debts(connection: Connection, emails: list[str]) -> list[AccountDebt] | bool:
+    """
+    Сервис для получения текущей задолженности сразу для множества пользователей (одним запросом).
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - emails (list[str]): Электронные почты пользователей.
+
+    Возвращаемое значение:
+     - list[AccountDebt]: Долги в порядке `emails` (current_debt = None — пользователь не найден).
+     - bool: False, если произошла ошибка.
+    """
+
+    try:
+        debts = await fetch_current_debts_repo(connection, emails)
+        return [AccountDebt(email=email, current_debt=debts.get(email)) for email in emails]
+
+    except Exception as e:
+        logger.exception(f"Ошибка при получении задолженности {len(emails)} пользователей: {e}")
+        return False
+
+
+async def get_payment_history(
+        connection: Connection, email: EmailStr, since: str | None = None, until: str | None = None
+) -> list[PaymentRecord] | bool:
+    """
+    Сервис для получения истории платежей пользователя.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - email (EmailStr): Электронная почта пользователя.
+     - since (str | None): Начало периода (ISO-дата), None — без ограничения.
+     - until (str | None): Конец периода (ISO-дата), None — без ограничения.
+
+    Возвращаемое значение:
+     - list[PaymentRecord]: Платежи от новых к старым.
+     - bool: False, если произошла ошибка.
+    """
+
     try:
-        # Получаем значение из столбца current_month_debt
-        current_debt = await fetch_current_debt_repo(connection, email)
-        return current_debt
+        history = await fetch_payment_history_repo(connection, email, since, until)
+        return [
+            PaymentRecord(amount=amount, balance_after=balance_after, created_at=created_at)
+            for amount, balance_after, created_at in history
+        ]
 
     except Exception as e:
-        logger.exception(f"Ошибка при попытке отобразить данные о задолженности: {e}")
+        logger.exception(f"Ошибка при получении истории платежей: {e}")
         return False
@@ -0,0 +1,82 @@
+import logging
+from datetime import date
+
+from FlatPay.database import PoolManager, WriterManager
+from FlatPay.database.repositories.tariffs_repo import upsert_tariff_repo
+from FlatPay.utils.tariffs import TariffManager, METERS
+
+
+# Инициализируем логирование
+logger = logging.getLogger("tariffs_services")
+
+
+async def reload_tariffs() -> bool:
+    """
+    Сервис для перезагрузки расписания тарифов из базы данных.
+
+    Возвращаемое значение:
+     - bool: True, если расписание успешно перезагружено, иначе False.
+    """
+
+    try:
+        async with PoolManager.get_pool().connection() as connection:
+            schedule = await TariffManager.reload(connection)
+
+        logger.info(f"Тарифы перезагружены, версий: {len(schedule.dates)}")
+        return True
+
+    except Exception as e:
+        logger.exception(f"Ошибка при перезагрузке тарифов: {e}")
+        return False
+
+
+async def refresh_tariffs() -> bool:
+    """
+    Сервис для проверки актуальности тарифов: расписание перезагружается, только если тарифы
+    в базе данных изменились (добавлены или заменены другим процессом).
+
+    Возвращаемое значение:
+     - bool: True, если расписание актуально (перезагружено или не менялось), иначе False.
+    """
+
+    try:
+        async with PoolManager.get_pool().connection() as connection:
+            schedule = await TariffManager.refresh(connection)
+
+        if schedule is not None:
+            logger.info(f"Тарифы изменились и перезагружены, версий: {len(schedule.dates)}")
+        return True
+
+    except Exception as e:
+        logger.exception(f"Ошибка при проверке тарифов: {e}")
+        return False
+
+
+async def set_tariff(effective_from: date, tariffs: dict[str, float]) -> bool:
+    """
+    Сервис для добавления новой версии тарифов.
+
+    Сохраняет тарифы в БД и сразу перезагружает расписание в памяти этого процесса;
+    остальные процессы подхватывают изменение при проверке тарифов (refresh_tariffs).
+
+    Параметры:
+     - effective_from (date): Дата начала действия тарифов.
+     - tariffs (dict[str, float]): Тарифы по всем типам счётчиков, руб./единицу.
+
+    Возвращаемое значение:
+     - bool: True, если тарифы сохранены, иначе False.
+    """
+
+    if set(tariffs) != set(METERS) or any(rate < 0 for rate in tariffs.values()):
+        logger.error(f"Некорректные тарифы: {tariffs}")
+        return False
+
+    try:
+        await WriterManager.get_writer().submit(upsert_tariff_repo, effective_from, tariffs)
+        logger.info(f"Тарифы с {effective_from} сохранены")
+
+    except Exception as e:
+        logger.exception(f"Ошибка при сохранении тарифов: {e}")
+        return False
+
+    return await reload_tariffs()
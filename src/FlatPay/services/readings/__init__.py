@@ -1 +1,3 @@
-from .readings import reset_readings
+from .readings import update_readings, get_readings_history, readings_period, consumption
+from .anomalies import scan_anomalies, update_stats_range, score_consumption
+from .bulk_import import import_readings, submit_readings_batch, iter_csv_rows
@@ -0,0 +1,147 @@
+import logging
+from time import perf_counter
+from typing import Iterable
+
+import numpy as np
+from aiosqlite import Connection
+
+from FlatPay.app.models import ReadingsAnomaly
+from FlatPay.database.repositories.anomaly_repo import (
+    fetch_anomaly_scan_chunk_repo, fetch_stats_update_range_repo, upsert_consumption_stats_repo
+)
+from FlatPay.utils.anomaly import AnomalyManager
+from FlatPay.utils.tariffs import METERS
+
+
+# Инициализируем логирование
+logger = logging.getLogger("anomaly_services")
+
+
+def _stats_arrays(stats: Iterable[tuple | None]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Раскладывает кортежи статистики (count, 4 средних, 4 дисперсии) по массивам (count, mean, var).
+    Отсутствующая статистика (None) — нулевая история.
+    """
+
+    matrix = np.asarray([row or (0,) * 9 for row in stats], dtype=np.float64).reshape(-1, 9)
+    return matrix[:, 0], matrix[:, 1:5], matrix[:, 5:9]
+
+
+def score_consumption(used: np.ndarray, stats: Iterable[tuple | None]) -> np.ndarray:
+    """
+    Оценивает расход относительно статистики пользователей (векторно).
+
+    Параметры:
+     - used (np.ndarray): Расход за период, форма (N, 4), столбцы в порядке METERS.
+     - stats (Iterable[tuple | None]): Статистика каждого пользователя (count, 4 средних, 4 дисперсии) или None.
+
+    Возвращаемое значение:
+     - np.ndarray: z-score формы (N, 4).
+    """
+
+    count, mean, var = _stats_arrays(stats)
+    return AnomalyManager.get_detector().score(count, mean, var, used)
+
+
+def describe_anomalies(scores: np.ndarray) -> dict[str, float]:
+    """Возвращает счётчики одной строки, у которых |z| выше порога, с округлённым z-score."""
+
+    flagged = AnomalyManager.get_detector().flagged(scores)
+    return {meter: round(float(score), 1) for meter, score, flag in zip(METERS, scores, flagged) if flag}
+
+
+async def update_stats_range(connection: Connection, period: str, after_email: str, last_email: str) -> int:
+    """
+    Учитывает расход за период в скользящей статистике диапазона пользователей.
+
+    Выполняется при закрытии месяца, когда показания периода больше не меняются.
+    Каждый пользователь обновляется за O(1) — история показаний не перечитывается.
+
+    Параметры:
+     - connection (Connection): Соединение писателя.
+     - period (str): Закрываемый период (YYYY-MM).
+     - after_email (str): Нижняя граница диапазона email (не включительно).
+     - last_email (str): Верхняя граница диапазона email (включительно).
+
+    Возвращаемое значение:
+     - int: Количество обновлённых пользователей.
+    """
+
+    rows = await fetch_stats_update_range_repo(connection, period, after_email, last_email)
+    if not rows:
+        return 0
+
+    emails = [row[0] for row in rows]
+    matrix = np.asarray([row[1:] for row in rows], dtype=np.float64)
+    used, count, mean, var = matrix[:, 0:4], matrix[:, 4], matrix[:, 5:9], matrix[:, 9:13]
+
+    count, mean, var = AnomalyManager.get_detector().update(count, mean, var, used)
+
+    await upsert_consumption_stats_repo(connection, [
+        (email, period, int(row_count), *row_mean, *row_var)
+        for email, row_count, row_mean, row_var in zip(emails, count.tolist(), mean.tolist(), var.tolist())
+    ])
+    return len(rows)
+
+
+async def scan_anomalies(connection: Connection, period: str, chunk_size: int = 10000) -> list[ReadingsAnomaly] | bool:
+    """
+    Сервис для поиска аномального расхода за период по всем пользователям.
+
+    Читает расход и статистику страницами по `chunk_size` пользователей и оценивает
+    каждую страницу одним векторным расчётом.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - period (str): Период (YYYY-MM).
+     - chunk_size (int): Количество пользователей в одной странице.
+
+    Возвращаемое значение:
+     - list[ReadingsAnomaly]: Аномалии, упорядоченные по email.
+     - bool: False, если произошла ошибка.
+    """
+
+    started = perf_counter()
+    detector = AnomalyManager.get_detector()
+    anomalies: list[ReadingsAnomaly] = []
+    last_email = ""
+    scanned = 0
+
+    try:
+        while True:
+            rows = await fetch_anomaly_scan_chunk_repo(connection, period, last_email, chunk_size)
+            if not rows:
+                break
+
+            emails = [row[0] for row in rows]
+            matrix = np.asarray([row[1:] for row in rows], dtype=np.float64)
+            used, count, mean, var = matrix[:, 0:4], matrix[:, 4], matrix[:, 5:9], matrix[:, 9:13]
+
+            scores = detector.score(count, mean, var, used)
+            flagged = detector.flagged(scores)
+
+            # В Python переходят только строки с аномалиями
+            for index in np.flatnonzero(flagged.any(axis=1)):
+                anomalies.append(ReadingsAnomaly(
+                    email=emails[index],
+                    period=period,
+                    consumption=dict(zip(METERS, used[index].astype(int).tolist())),
+                    expected=dict(zip(METERS, np.round(mean[index], 1).tolist())),
+                    scores={
+                        meter: round(float(score), 1)
+                        for meter, score, flag in zip(METERS, scores[index], flagged[index]) if flag
+                    }
+                ))
+
+            scanned += len(rows)
+            last_email = emails[-1]
+
+        logger.info(
+            f"Проверка расхода за {period}: {scanned} пользователей, аномалий {len(anomalies)} "
+            f"за {perf_counter() - started:.2f} сек."
+        )
+        return anomalies
+
+    except Exception as e:
+        logger.exception(f"Ошибка при поиске аномального расхода за {period}: {e}")
+        return False
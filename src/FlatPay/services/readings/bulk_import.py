@@ -0,0 +1,333 @@
+import asyncio
+import codecs
+import csv
+import logging
+from datetime import date, datetime
+from time import perf_counter
+from typing import AsyncIterable, AsyncIterator, Iterator
+
+import numpy as np
+from aiosqlite import Connection
+from pydantic import ValidationError
+
+from FlatPay.app.models import ReadingsImportRow, ImportRowError, ImportReport
+from FlatPay.database import WriterManager
+from FlatPay.database.repositories.anomaly_repo import fetch_consumption_stats_repo
+from FlatPay.database.repositories.payments_repo import update_next_month_debts_repo
+from FlatPay.database.repositories.readings_repo import (
+    fetch_previous_readings_repo, fetch_latest_periods_repo, upsert_readings_repo
+)
+from FlatPay.database.repositories.user_repo import touch_accounts_repo
+from FlatPay.services.readings.anomalies import score_consumption, describe_anomalies
+from FlatPay.services.readings.readings import readings_period, consumption
+from FlatPay.services.user.account import invalidate_account
+from FlatPay.utils.calculate_base_debt import calculate_base_debts
+from FlatPay.utils.tariffs import METERS, billing_day
+
+
+# Инициализируем логирование
+logger = logging.getLogger("readings_import")
+
+# Обязательные столбцы файла импорта (порядок в файле — любой)
+IMPORT_COLUMNS: tuple[str, ...] = ("email", *METERS)
+
+
+async def iter_csv_rows(
+        chunks: AsyncIterable[bytes], encoding: str = "utf-8-sig"
+) -> AsyncIterator[tuple[int, list[str]]]:
+    """
+    Потоково разбирает CSV из последовательности кусков байт, не собирая файл в памяти.
+
+    Разделитель (запятая или точка с запятой — как в выгрузках Excel) определяется по заголовку.
+    Пустые строки пропускаются.
+
+    Параметры:
+     - chunks (AsyncIterable[bytes]): Куски файла (тело запроса или чтение файла с диска).
+     - encoding (str): Кодировка файла (по умолчанию UTF-8, BOM допускается).
+
+    Возвращаемое значение:
+     - AsyncIterator[tuple[int, list[str]]]: Пары (номер строки файла, значения столбцов).
+    """
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    delimiter: str | None = None
+    tail = ""
+    line_number = 0
+
+    def parse(lines: list[str]) -> Iterator[tuple[int, list[str]]]:
+        nonlocal delimiter, line_number
+        for line in lines:
+            line_number += 1
+            line = line.rstrip("\r")
+            if not line.strip():
+                continue
+            if delimiter is None:
+                delimiter = ";" if line.count(";") > line.count(",") else ","
+            yield line_number, next(csv.reader((line,), delimiter=delimiter))
+
+    async for chunk in chunks:
+        # Последняя неполная строка куска дописывается следующим куском
+        lines = (tail + decoder.decode(chunk)).split("\n")
+        tail = lines.pop()
+        for row in parse(lines):
+            yield row
+
+    for row in parse([tail + decoder.decode(b"", final=True)]):
+        yield row
+
+
+def _describe(error: ValidationError) -> str:
+    """Кратко описывает ошибки валидации строки: «поле: причина; ...»."""
+
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+
+def pricing_day(period: str, today: date | None = None) -> date | None:
+    """
+    Возвращает дату тарифов для пересчёта долга на следующий месяц по показаниям за период.
+
+    Долг на следующий месяц — это начисление за открытый (текущий) период: показания за прошлые периоды
+    его не меняют (их долг уже перенесён закрытием месяца).
+
+    Параметры:
+     - period (str): Период показаний (YYYY-MM).
+     - today (date | None): Текущая дата (по умолчанию — сегодня).
+
+    Возвращаемое значение:
+     - date | None: Дата тарифов периода (billing_day — та же, что при закрытии месяца), если это открытый
+                    период; None — долг не пересчитывается.
+    """
+
+    if period != readings_period(today):
+        return None
+
+    return billing_day(period)
+
+
+async def _import_batch(
+        connection: Connection, period: str, batch: list[tuple[int, ReadingsImportRow]], day: date | None
+) -> tuple[list[ImportRowError], list[ImportRowError]]:
+    """
+    Сохраняет пачку проверенных строк одной операцией писателя.
+
+    Расход считается от последних показаний предыдущих периодов (как при вводе через форму);
+    оценка аномальности и долг на следующий месяц — векторно, одним расчётом на пачку.
+    Строки пользователей, у которых уже есть показания за более поздний период, отклоняются:
+    иначе расход следующих периодов остался бы посчитанным от прежних показаний.
+    Долг на следующий месяц пересчитывается только при `day` (см. pricing_day) — по тарифам на этот день.
+
+    Возвращаемое значение:
+     - tuple: (строки, отклонённые при сверке с базой данных; сохранённые строки с аномальным расходом).
+    """
+
+    emails = [row.email for _, row in batch]
+    previous = await fetch_previous_readings_repo(connection, period, emails)
+    latest = await fetch_latest_periods_repo(connection, emails)
+    stats = await fetch_consumption_stats_repo(connection, period, emails)
+
+    errors: list[ImportRowError] = []
+    accepted: list[tuple[int, str, tuple, tuple]] = []
+
+    for line, row in batch:
+        if row.email not in previous:
+            errors.append(ImportRowError(line=line, email=row.email, error="Пользователь не найден"))
+            continue
+
+        if latest.get(row.email, period) > period:
+            errors.append(ImportRowError(
+                line=line, email=row.email, error=f"Уже есть показания за более поздний период {latest[row.email]}"
+            ))
+            continue
+
+        current = tuple(row.meter_readings[meter] for meter in METERS)
+        used = consumption(current, previous[row.email])
+
+        if min(used) < 0:
+            errors.append(ImportRowError(
+                line=line, email=row.email, error=f"Показания {current} меньше предыдущих {previous[row.email]}"
+            ))
+            continue
+
+        accepted.append((line, row.email, current, used))
+
+    warnings: list[ImportRowError] = []
+    if not accepted:
+        return errors, warnings
+
+    used_matrix = np.asarray([used for *_, used in accepted], dtype=np.float64)
+    scores = score_consumption(used_matrix, (stats.get(email) for _, email, _, _ in accepted))
+
+    for (line, email, _, _), row_scores in zip(accepted, scores):
+        anomalies = describe_anomalies(row_scores)
+        if anomalies:
+            warnings.append(ImportRowError(line=line, email=email, error=f"Аномальный расход: {anomalies}"))
+
+    await upsert_readings_repo(connection, [
+        (email, period, *current, *used, score)
+        for (_, email, current, used), score in zip(accepted, np.abs(scores).max(axis=1).tolist())
+    ])
+    if day is not None:
+        # Тот же запрос увеличивает версии аккаунтов пачки (ETag страниц пользователя)
+        debts = calculate_base_debts(used_matrix, day)
+        await update_next_month_debts_repo(
+            connection, [(debt, email) for (_, email, _, _), debt in zip(accepted, debts.tolist())]
+        )
+    else:
+        await touch_accounts_repo(connection, [email for _, email, _, _ in accepted])
+
+    return errors, warnings
+
+
+async def _collect(pending: asyncio.Task, batch: list[tuple[int, ReadingsImportRow]], report: ImportReport) -> None:
+    """Дожидается записи пачки и переносит её ошибки и предупреждения в отчёт."""
+
+    try:
+        errors, warnings = await pending
+        report.errors.extend(errors)
+        report.warnings.extend(warnings)
+
+        # История показаний сохранённых строк в кэше аккаунтов устарела
+        for _, row in batch:
+            invalidate_account(row.email)
+
+    except Exception as e:
+        # Пачка не записана целиком: отмечаем все её строки
+        logger.exception(f"Ошибка при записи пачки показаний (строки {batch[0][0]}–{batch[-1][0]}): {e}")
+        report.errors.extend(
+            ImportRowError(line=line, email=row.email, error="Ошибка записи в базу данных") for line, row in batch
+        )
+
+
+def _finish(report: ImportReport, started: float) -> ImportReport:
+    """Подводит итоги импорта: сортирует ошибки по строкам, считает итоги и время, логирует отчёт."""
+
+    report.errors.sort(key=lambda item: item.line)
+    report.warnings.sort(key=lambda item: item.line)
+    report.failed = len(report.errors)
+    report.imported = report.rows - report.failed
+    report.seconds = round(perf_counter() - started, 3)
+
+    logger.info(
+        f"Импорт показаний за {report.period}: строк {report.rows}, сохранено {report.imported}, "
+        f"отклонено {report.failed}, с аномальным расходом {len(report.warnings)} за {report.seconds} сек."
+    )
+    return report
+
+
+async def import_readings(
+        chunks: AsyncIterable[bytes], period: str | None = None, batch_size: int = 2000, today: date | None = None
+) -> ImportReport:
+    """
+    Сервис массового импорта показаний из CSV (выгрузки управляющих компаний).
+
+    Файл разбирается потоково. Строки проверяются моделью ReadingsImportRow и собираются в пачки
+    по `batch_size`; каждая пачка записывается одной операцией писателя (executemany в одной транзакции)
+    вместе с пересчётом долга на следующий месяц (только для текущего периода, см. pricing_day).
+    Пока пишется одна пачка, разбирается следующая.
+    Ошибочные строки не прерывают импорт и попадают в отчёт с номером строки файла;
+    строки с аномальным расходом сохраняются и попадают в предупреждения отчёта.
+
+    Параметры:
+     - chunks (AsyncIterable[bytes]): Куски CSV-файла со столбцами email, electricity, cold_water, hot_water, gas.
+     - period (str | None): Период показаний (YYYY-MM, по умолчанию — текущий месяц).
+     - batch_size (int): Количество строк в одной пачке.
+     - today (date | None): Текущая дата (по умолчанию — сегодня): по ней определяется текущий период.
+
+    Возвращаемое значение:
+     - ImportReport: Отчёт об импорте с ошибками по строкам.
+
+    Исключения:
+     - ValueError: Если период не в формате YYYY-MM.
+    """
+
+    if period is not None:
+        datetime.strptime(period, "%Y-%m")
+
+    started = perf_counter()
+    report = ImportReport(period=period or readings_period(today))
+    day = pricing_day(report.period, today)
+    writer = WriterManager.get_writer()
+
+    columns: dict[str, int] | None = None
+    batch: list[tuple[int, ReadingsImportRow]] = []
+    pending: tuple[asyncio.Task, list] | None = None
+
+    async for line, fields in iter_csv_rows(chunks):
+        if columns is None:
+            # Первая непустая строка — заголовок
+            columns = {name.strip().lower(): index for index, name in enumerate(fields)}
+            missing = [name for name in IMPORT_COLUMNS if name not in columns]
+            if missing:
+                report.errors.append(ImportRowError(line=line, error=f"Нет столбцов: {', '.join(missing)}"))
+                logger.warning(f"Импорт показаний отклонён: нет столбцов {missing}")
+                return report
+            continue
+
+        report.rows += 1
+        email = fields[columns["email"]].strip() if len(fields) > columns["email"] else None
+
+        try:
+            row = ReadingsImportRow(
+                email=email,
+                meter_readings={meter: fields[columns[meter]].strip() for meter in METERS}
+            )
+        except IndexError:
+            report.errors.append(ImportRowError(line=line, email=email, error="Не хватает столбцов"))
+            continue
+        except ValidationError as e:
+            report.errors.append(ImportRowError(line=line, email=email, error=_describe(e)))
+            continue
+
+        batch.append((line, row))
+
+        if len(batch) >= batch_size:
+            if pending is not None:
+                await _collect(*pending, report)
+            pending = (asyncio.create_task(writer.submit(_import_batch, report.period, batch, day)), batch)
+            batch = []
+
+    if pending is not None:
+        await _collect(*pending, report)
+    if batch:
+        await _collect(asyncio.create_task(writer.submit(_import_batch, report.period, batch, day)), batch, report)
+
+    return _finish(report, started)
+
+
+async def submit_readings_batch(
+        rows: list[ReadingsImportRow], period: str | None = None, today: date | None = None
+) -> ImportReport:
+    """
+    Сервис пакетной отправки показаний множества пользователей (JSON API управляющих компаний).
+
+    Строки уже проверены моделью ReadingsImportRow и записываются одной операцией писателя — так же,
+    как пачка массового импорта (сверка с базой, расход, оценка аномальности и долг на следующий месяц).
+    Номер строки в отчёте — позиция показаний в списке `rows`, начиная с 1.
+
+    Параметры:
+     - rows (list[ReadingsImportRow]): Показания пользователей.
+     - period (str | None): Период показаний (YYYY-MM, по умолчанию — текущий месяц).
+     - today (date | None): Текущая дата (по умолчанию — сегодня): по ней определяется текущий период.
+
+    Возвращаемое значение:
+     - ImportReport: Отчёт с ошибками и предупреждениями по строкам.
+
+    Исключения:
+     - ValueError: Если период не в формате YYYY-MM.
+    """
+
+    if period is not None:
+        datetime.strptime(period, "%Y-%m")
+
+    started = perf_counter()
+    report = ImportReport(period=period or readings_period(today), rows=len(rows))
+    batch = list(enumerate(rows, start=1))
+
+    pending = asyncio.create_task(
+        WriterManager.get_writer().submit(_import_batch, report.period, batch, pricing_day(report.period, today))
+    )
+    await _collect(pending, batch, report)
+
+    return _finish(report, started)
@@ -1,26 +1,156 @@
 import logging
+from datetime import date
+
+import numpy as np
 from aiosqlite import Connection
+from pydantic import EmailStr
 
-from FlatPay.database.repositories.readings_repo import reset_meter_readings_repo
+from FlatPay.app.models import Readings, ReadingsRecord, SubmittedReadings
+from FlatPay.core.exceptions import ReadingsDecreasedError
+from FlatPay.database import WriterManager
+from FlatPay.database.repositories.anomaly_repo import fetch_consumption_stats_repo
+from FlatPay.database.repositories.payments_repo import update_next_month_debt_repo
+from FlatPay.database.repositories.readings_repo import (
+    fetch_last_reading_repo, fetch_readings_history_repo, upsert_readings_repo
+)
+from FlatPay.services.readings.anomalies import score_consumption, describe_anomalies
+from FlatPay.services.user.account import get_account_summary, invalidate_account, readings_record
+from FlatPay.utils.calculate_base_debt import calculate_base_debt
+from FlatPay.utils.tariffs import METERS, billing_day
 
 
 # Инициализируем логирование
 logger = logging.getLogger("readings_services")
 
 
-async def reset_readings(connection: Connection) -> None:
+def readings_period(today: date | None = None) -> str:
+    """
+    Возвращает период, к которому относятся показания, отправленные в указанный день: текущий месяц.
+
+    Параметры:
+     - today (date | None): Дата отправки (по умолчанию — сегодня).
+
+    Возвращаемое значение:
+     - str: Период в формате YYYY-MM.
+    """
+
+    return (today or date.today()).strftime("%Y-%m")
+
+
+def consumption(current: tuple, previous: tuple | None) -> tuple:
     """
-    Сервис для обнуления показаний счётчиков всех пользователей.
+    Считает расход за период как разницу с предыдущими показаниями.
+    Первые показания пользователя — начальная точка: расход по ним нулевой.
 
     Параметры:
-     - connection (Connection): Активное подключение к базе данных.
+     - current (tuple): Текущие значения счётчиков в порядке METERS.
+     - previous (tuple | None): Предыдущие значения (None — показаний ещё не было).
+
+    Возвращаемое значение:
+     - tuple: Расход в порядке METERS (отрицательный, если показание уменьшилось).
+    """
+
+    return tuple(value - last for value, last in zip(current, previous or current))
+
+
+async def _save_reading(connection: Connection, email: EmailStr, period: str, readings: Readings) -> tuple:
+    """
+    Сохраняет показания за период и пересчитывает долг на следующий месяц одной операцией писателя:
+    расход и его оценка считаются по предыдущим показаниям и статистике пользователя (два чтения по ключу).
+    Показания и долг фиксируются вместе, поэтому сохранённые показания не остаются с прежним долгом.
+
+    Возвращаемое значение:
+     - tuple: (расход в порядке METERS, z-score по счётчикам).
+
+    Исключения:
+     - ReadingsDecreasedError: Если показание меньше предыдущего.
+    """
+
+    previous = await fetch_last_reading_repo(connection, email, period)
+    current = tuple(readings.meter_readings[meter] for meter in METERS)
+    used = consumption(current, previous)
+
+    if min(used) < 0:
+        raise ReadingsDecreasedError(f"Показания {current} меньше предыдущих {previous}")
+
+    stats = await fetch_consumption_stats_repo(connection, period, [email])
+    scores = score_consumption(np.asarray([used], dtype=np.float64), [stats.get(email)])[0]
+
+    await upsert_readings_repo(connection, [(email, period, *current, *used, float(np.abs(scores).max()))])
+    # Долг по расходу за месяц по тарифам на ту же дату, что и при закрытии месяца;
+    # запрос увеличивает и версию аккаунта (ETag страниц пользователя)
+    debt = calculate_base_debt(Readings(meter_readings=dict(zip(METERS, used))), billing_day(period))
+    await update_next_month_debt_repo(connection, debt, email)
+    return used, scores
+
+
+async def update_readings(email: EmailStr, readings: Readings) -> SubmittedReadings | None:
+    """
+    Сервис для сохранения новых показаний счётчиков пользователя в историю показаний
+    и пересчёта долга на следующий месяц по расходу за месяц (в одной транзакции).
+
+    Расход за месяц сравнивается со статистикой прошлых месяцев пользователя: подозрительные значения
+    (например, лишний ноль) сохраняются, но возвращаются в `anomalies`, чтобы пользователь их перепроверил.
+
+    Параметры:
+     - email (EmailStr): Электронная почта пользователя.
+     - readings (Readings): Текущие значения счётчиков.
+
+    Возвращаемое значение:
+     - SubmittedReadings: Расход за текущий период и аномальные счётчики, если показания сохранены.
+     - None: Если показания меньше предыдущих или произошла ошибка.
+    """
+
+    period = readings_period()
+
+    try:
+        # Сохраняем показания, считаем и оцениваем расход, пересчитываем долг через очередь записи (одна транзакция)
+        used, scores = await WriterManager.get_writer().submit(_save_reading, email, period, readings)
+        invalidate_account(email)
+        anomalies = describe_anomalies(scores)
+
+        if anomalies:
+            logger.warning(f"Аномальный расход у {email} за {period}: {anomalies}")
+        logger.info(f"Показания и next_month_debt для {email} за {period} успешно обновлены.")
+
+        return SubmittedReadings(consumption=Readings(meter_readings=dict(zip(METERS, used))), anomalies=anomalies)
+
+    except ReadingsDecreasedError as e:
+        logger.warning(f"Показания для {email} за {period} отклонены: {e}")
+        return None
+
+    except Exception as e:
+        logger.exception(f"Ошибка при обновлении показаний для {email}: {e}")
+        return None
+
+
+async def get_readings_history(
+        connection: Connection, email: EmailStr, since: str | None = None, until: str | None = None
+) -> list[ReadingsRecord] | bool:
+    """
+    Сервис для получения истории показаний пользователя.
+    История без ограничения периодов (страница показаний) берётся из сводки аккаунта.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - email (EmailStr): Электронная почта пользователя.
+     - since (str | None): Первый период (YYYY-MM), None — без ограничения.
+     - until (str | None): Последний период (YYYY-MM), None — без ограничения.
+
+    Возвращаемое значение:
+     - list[ReadingsRecord]: Показания от новых периодов к старым.
+     - bool: False, если произошла ошибка.
     """
 
     try:
-        # Обнуляем показания счетчиков
-        await reset_meter_readings_repo(connection)
-        logger.info("Все показания счётчиков успешно обнулены.")
+        if since is None and until is None:
+            # Страница показаний берётся из сводки аккаунта (общей с домашней страницей и страницей долга)
+            summary = await get_account_summary(connection, email)
+            return summary.history if summary else False
+
+        history = await fetch_readings_history_repo(connection, email, since, until)
+        return [readings_record(period, values) for period, *values in history]
 
     except Exception as e:
-        logger.exception(f"Ошибка при сбросе показаний счётчиков: {e}")
-    
\ No newline at end of file
+        logger.exception(f"Ошибка при получении истории показаний: {e}")
+        return False
@@ -1 +1,5 @@
 from .user import register_user
+from .auth import authenticate_user, get_credentials, invalidate_credentials, CREDENTIALS_CACHE
+from .account import (
+    get_account_summary, get_account_data, invalidate_account, invalidate_accounts, readings_record, ACCOUNT_CACHE
+)
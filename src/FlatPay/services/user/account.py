@@ -0,0 +1,158 @@
+import logging
+from typing import Awaitable, Callable, Sequence
+
+from aiosqlite import Connection
+from pydantic import EmailStr
+
+from FlatPay.app.models import AccountSummary, ReadingsRecord
+from FlatPay.database.repositories.user_repo import fetch_account_summary_repo
+from FlatPay.utils.cache import CacheManager, MISSING
+from FlatPay.utils.tariffs import METERS
+
+
+# Инициализируем логирование
+logger = logging.getLogger("user_services")
+
+# Имя кэша сводок аккаунтов: email -> AccountSummary
+ACCOUNT_CACHE = "accounts"
+
+# Сколько периодов истории показаний входит в сводку (страница показаний без фильтра)
+SUMMARY_HISTORY = 24
+
+# Незавершённые загрузки сводок: email -> маркеры загрузок, начатых после последней инвалидации.
+# Инвалидация удаляет маркеры, и загрузка, прочитавшая базу до записи, не кладёт в кэш устаревшую сводку
+_loads: dict[str, set[object]] = {}
+
+
+def readings_record(period: str, values: Sequence) -> ReadingsRecord:
+    """
+    Собирает запись истории показаний из строки readings_history.
+
+    Параметры:
+     - period (str): Период (YYYY-MM).
+     - values (Sequence): Показания и расход в порядке METERS, затем оценка аномальности.
+
+    Возвращаемое значение:
+     - ReadingsRecord: Запись истории показаний.
+    """
+
+    return ReadingsRecord(
+        period=period,
+        meter_readings=dict(zip(METERS, values[:4])),
+        consumption=dict(zip(METERS, values[4:8])),
+        anomaly_score=values[8]
+    )
+
+
+async def get_account_data(
+        email: EmailStr, load: Callable[[], Awaitable[AccountSummary | None]]
+) -> AccountSummary | None:
+    """
+    Возвращает сводку аккаунта из кэша, а при промахе загружает её и кэширует (read-through).
+
+    Сводка меняется только при записи самого пользователя (показания, оплата) и при пересчёте долгов,
+    а эти пути записи явно инвалидируют кэш, поэтому повторные просмотры страниц не обращаются к БД.
+    Загруженная сводка не кэшируется, если во время загрузки аккаунт инвалидировали
+    или пользователь не найден.
+
+    Параметры:
+     - email (EmailStr): Электронная почта пользователя.
+     - load (Callable[[], Awaitable[AccountSummary | None]]): Загрузка сводки из базы при промахе.
+
+    Возвращаемое значение:
+     - AccountSummary: Сводка по аккаунту.
+     - None: Пользователь не найден.
+    """
+
+    cache = CacheManager.find_cache(ACCOUNT_CACHE)
+    if cache is None:
+        return await load()
+
+    summary = cache.get(email)
+    if summary is not MISSING:
+        return summary
+
+    marker = object()
+    _loads.setdefault(email, set()).add(marker)
+    try:
+        summary = await load()
+    finally:
+        markers = _loads.get(email)
+        fresh = markers is not None and marker in markers
+        if fresh:
+            markers.discard(marker)
+            if not markers:
+                del _loads[email]
+
+    if fresh and summary is not None:
+        cache.set(email, summary)
+
+    return summary
+
+
+def invalidate_account(email: EmailStr) -> None:
+    """
+    Удаляет сводку аккаунта из кэша. Вызывается после фиксации записи.
+
+    Параметры:
+     - email (EmailStr): Электронная почта пользователя.
+    """
+
+    _loads.pop(email, None)
+    cache = CacheManager.find_cache(ACCOUNT_CACHE)
+    if cache is not None:
+        cache.invalidate(email)
+
+
+def invalidate_accounts() -> None:
+    """Удаляет из кэша сводки всех аккаунтов (после пересчёта долгов и закрытия месяца)."""
+
+    _loads.clear()
+    cache = CacheManager.find_cache(ACCOUNT_CACHE)
+    if cache is not None:
+        cache.clear()
+
+
+async def get_account_summary(connection: Connection, email: EmailStr) -> AccountSummary | bool:
+    """
+    Сервис для получения сводки по аккаунту: долг, последний платёж, оценка долга за текущий месяц
+    и история показаний — одним запросом к базе (или из кэша аккаунтов).
+
+    Домашняя страница, страница долга и страница показаний берут данные из одной сводки,
+    поэтому сессия пользователя стоит одного запроса вместо запроса на каждую страницу.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - email (EmailStr): Электронная почта пользователя.
+
+    Возвращаемое значение:
+     - AccountSummary: Сводка по аккаунту.
+     - bool: False, если пользователь не найден или произошла ошибка.
+    """
+
+    async def load() -> AccountSummary | None:
+        rows = await fetch_account_summary_repo(connection, email, SUMMARY_HISTORY)
+        if not rows:
+            return None
+
+        current_debt, last_payment, next_month_debt, version = rows[0][:4]
+        return AccountSummary(
+            email=email,
+            version=version,
+            current_debt=current_debt,
+            last_payment=last_payment,
+            next_month_debt=next_month_debt,
+            # Без показаний LEFT JOIN возвращает одну строку с NULL вместо периода
+            history=[readings_record(row[4], row[5:]) for row in rows if row[4] is not None]
+        )
+
+    try:
+        summary = await get_account_data(email, load)
+        if summary is None:
+            logger.warning(f"Сводка для {email} не найдена.")
+            return False
+        return summary
+
+    except Exception as e:
+        logger.exception(f"Ошибка при получении сводки по аккаунту {email}: {e}")
+        return False
@@ -0,0 +1,97 @@
+import logging
+
+from aiosqlite import Connection
+from pydantic import EmailStr
+
+from FlatPay.database import WriterManager
+from FlatPay.database.repositories.user_repo import fetch_credentials_repo, update_user_password_repo
+from FlatPay.utils.cache import CacheManager, MISSING
+from FlatPay.utils.security import HasherManager
+
+
+# Инициализируем логирование
+logger = logging.getLogger("user_services")
+
+# Имя кэша учётных данных: email -> (хеш пароля, соль) или None («пользователь не найден»)
+CREDENTIALS_CACHE = "credentials"
+
+
+async def get_credentials(connection: Connection, email: EmailStr) -> tuple[str, str | None] | None:
+    """
+    Сервис для получения учётных данных пользователя через кэш.
+
+    Отсутствующие пользователи тоже кэшируются (на более короткий срок),
+    поэтому серия попыток входа с несуществующими email не нагружает базу данных.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - email (EmailStr): Электронная почта пользователя.
+
+    Возвращаемое значение:
+     - tuple[str, str | None] | None: Хеш пароля и соль старого формата; None, если пользователь не найден.
+    """
+
+    cache = CacheManager.get_cache(CREDENTIALS_CACHE)
+
+    credentials = cache.get(email)
+    if credentials is MISSING:
+        credentials = await fetch_credentials_repo(connection, email)
+        cache.set(email, credentials)
+
+    return credentials
+
+
+def invalidate_credentials(email: EmailStr) -> None:
+    """
+    Удаляет учётные данные пользователя из кэша.
+
+    Вызывается после фиксации регистрации или смены пароля.
+
+    Параметры:
+     - email (EmailStr): Электронная почта пользователя.
+    """
+
+    CacheManager.get_cache(CREDENTIALS_CACHE).invalidate(email)
+
+
+async def authenticate_user(connection: Connection, email: EmailStr, password: str) -> bool:
+    """
+    Сервис для проверки пароля пользователя при входе.
+
+    Проверка выполняется в пуле потоков хеширования. Если пароль верный, а хеш
+    сохранён в старом формате (SHA-256) или с устаревшими параметрами,
+    он прозрачно пересчитывается и сохраняется через очередь записи.
+
+    Параметры:
+     - connection (Connection): Асинхронное соединение с базой данных.
+     - email (EmailStr): Электронная почта пользователя.
+     - password (str): Введённый пользователем пароль.
+
+    Возвращаемое значение:
+     - bool: True, если пароль верный; False, если неверный или пользователь не найден.
+    """
+
+    # Хеш пароля и соль старого формата (для новых хешей соль хранится внутри хеша)
+    credentials = await get_credentials(connection, email)
+    if credentials is None:
+        return False
+
+    stored_password, salt = credentials
+
+    hasher = HasherManager.get_hasher()
+    if not await hasher.verify(password, stored_password, salt):
+        return False
+
+    if hasher.needs_rehash(stored_password):
+        try:
+            # Пароль известен только в момент входа — единственная возможность обновить хеш
+            new_password = await hasher.hash(password)
+            await WriterManager.get_writer().submit(update_user_password_repo, email, new_password)
+            invalidate_credentials(email)
+            logger.info(f"Хеш пароля пользователя {email} обновлён до текущего формата.")
+
+        except Exception as e:
+            # Вход не должен зависеть от обновления хеша
+            logger.exception(f"Ошибка при обновлении хеша пароля для {email}: {e}")
+
+    return True
@@ -1,16 +1,19 @@
 import logging
 
-from aiosqlite import Connection, IntegrityError
+from aiosqlite import IntegrityError
 from pydantic import EmailStr
 
+from FlatPay.database import WriterManager
 from FlatPay.database.repositories.user_repo import register_user_repo
+from FlatPay.services.user.auth import invalidate_credentials
+from FlatPay.utils.security import HasherManager
 
 
 # Инициализируем логирование
 logger = logging.getLogger("user_services")
 
 
-async def register_user(connection: Connection, email: EmailStr, password: str) -> bool:
+async def register_user(email: EmailStr, password: str) -> bool:
     """
     Сервис для регистрации нового пользователя в базе данных.
 
@@ -18,7 +21,6 @@ async def register_user(connection: Connection, email: EmailStr, password: str)
     в базу данных.
 
     Параметры:
-     - connection (Connection): Подключение к базе данных.
      - email (EmailStr): Электронная почта пользователя.
      - password (str): Пароль пользователя.
 
@@ -27,8 +29,14 @@ async def register_user(connection: Connection, email: EmailStr, password: str)
     """
 
     try:
-        # Регистрируем пользователя в системе
-        await register_user_repo(connection, email, password)
+        # Хешируем пароль в пуле потоков, не блокируя цикл событий
+        hashed_password = await HasherManager.get_hasher().hash(password)
+
+        # Регистрируем пользователя в системе через очередь записи
+        await WriterManager.get_writer().submit(register_user_repo, email, hashed_password)
+
+        # Убираем из кэша отрицательный результат «пользователь не найден»
+        invalidate_credentials(email)
         logger.info(f"Пользователь {email} успешно добавлен.")
         return True
 
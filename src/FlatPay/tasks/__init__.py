@@ -1 +1,3 @@
-from .scheduler import run_scheduler, end_scheduler
+from .scheduler import run_scheduler, end_scheduler, SchedulerManager
+from .leader import LeaderManager, LeaderElector, LeaseState
+from .background import resume_month_close
@@ -1,27 +1,38 @@
 import logging
+from datetime import datetime
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
-from FlatPay.core import SchedulerAddTasksError
-from FlatPay.tasks.jobs.reset_readings import schedule_reset_readings
-from FlatPay.tasks.jobs.reset_debt import schedule_reset_debt
+from FlatPay.core import SchedulerAddTasksError, SettingsManager
+from FlatPay.tasks.jobs.month_close import schedule_month_close
+from FlatPay.tasks.jobs.reload_tariffs import schedule_reload_tariffs
 
 
 # Инициализируем логирование
 logger = logging.getLogger("run_scheduler_tasks")
 
 
-def run_scheduler_tasks(scheduler: AsyncIOScheduler, db_path: str) -> AsyncIOScheduler:
+def run_scheduler_tasks(scheduler: AsyncIOScheduler) -> AsyncIOScheduler:
     """
     Запускает фоновые задачи в планировщике APScheduler.
 
     Описание:
-     - Каждый месяц, 1-го числа в 00:00:
+     - Каждый месяц, 1-го числа в 00:00 закрывает прошедший месяц:
+       - Пересчитывает долг за месяц по расходу из истории показаний.
        - Переносит задолженность пользователей в основной долг.
-       - Обнуляет показания счётчиков.
+       - Учитывает расход за месяц в статистике для оценки аномальных показаний
+         (показания хранятся в истории по периодам и не обнуляются).
+     - Каждые TARIFF_CHECK_INTERVAL секунд проверяет, изменились ли тарифы в базе данных,
+       и перечитывает их при изменении.
+     - Закрытие месяца выполняет только процесс-лидер (см. LeaderManager);
+       прерванное или пропущенное закрытие выполняется, когда процесс становится лидером (resume_month_close).
 
     Параметры:
      - scheduler (AsyncIOScheduler): Экземпляр планировщика.
-     - db_path (str): Путь к файлу базы данных.
+
+    Примечание:
+     - Задачи берут соединения из общего пула (PoolManager), поэтому
+       планировщик должен запускаться вместе с приложением.
 
     Исключения:
      - SchedulerAddTasksError: Ошибка при добавлении задач.
@@ -31,22 +42,19 @@ def run_scheduler_tasks(scheduler: AsyncIOScheduler, db_path: str) -> AsyncIOSch
     """
 
     try:
-        # Добавляем задачу на перенос долга (каждое 1-е число месяца в 00:00)
+        # Добавляем задачу закрытия месяца (каждое 1-е число месяца в 00:00)
         scheduler.add_job(
-            schedule_reset_debt,     # функция, которая будет вызвана
+            schedule_month_close,    # функция, которая будет вызвана
             'cron',           # тип расписания — по времени
             day=1,                   # 1-е число каждого месяца
-            hour=0,                  # в 00:00 часов
-            args=[db_path]           # аргументы, передаваемые в задачу
+            hour=0                   # в 00:00 часов
         )
 
-        # Добавляем задачу на сброс показаний (каждое 1-е число месяца в 00:00)
+        # Добавляем задачу проверки тарифов (каждые TARIFF_CHECK_INTERVAL секунд)
         scheduler.add_job(
-            schedule_reset_readings,  # функция, которая будет вызвана
-            'cron',            # тип расписания — по времени
-            day=1,                    # 1-е число каждого месяца
-            hour=0,                   # в 00:00 часов
-            args=[db_path]            # аргументы, передаваемые в задачу
+            schedule_reload_tariffs,  # функция, которая будет вызвана
+            'interval',               # тип расписания — с интервалом
+            seconds=SettingsManager.get_config().TARIFF_CHECK_INTERVAL
         )
 
         logger.info("Задачи успешно добавлены.")
@@ -58,3 +66,19 @@ def run_scheduler_tasks(scheduler: AsyncIOScheduler, db_path: str) -> AsyncIOSch
 
     # Возвращаем настроенный планировщик
     return scheduler
+
+
+def resume_month_close(scheduler: AsyncIOScheduler) -> None:
+    """
+    Ставит в планировщик продолжение прерванного или пропущенного закрытия месяца.
+
+    Вызывается, когда процесс становится лидером: прежний лидер мог завершиться
+    посреди закрытия месяца (новый продолжает его с последней контрольной точки),
+    а в момент запуска по расписанию лидера могло не быть вовсе (новый закрывает прошедший месяц,
+    если закрытие за него не запускалось).
+
+    Параметры:
+     - scheduler (AsyncIOScheduler): Экземпляр планировщика.
+    """
+
+    scheduler.add_job(schedule_month_close, 'date', run_date=datetime.now(), kwargs={"catch_up": True})
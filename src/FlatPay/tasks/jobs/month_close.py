@@ -0,0 +1,41 @@
+import logging
+
+from FlatPay.core.config import SettingsManager
+from FlatPay.services.month_close import close_month, catch_up_month_close, closed_period
+from FlatPay.tasks.leader import LeaderManager
+
+
+# Инициализируем логирование
+logger = logging.getLogger("month_close_task")
+
+
+async def schedule_month_close(catch_up: bool = False) -> None:
+    """
+    Закрывает прошедший месяц.
+
+    Описание:
+    - Выполняется только в процессе-лидере, остальные процессы пропускают задачу.
+    - Пересчитывает долг по расходу за месяц и переносит его в основной долг
+      (показания хранятся в истории по периодам и не обнуляются).
+    - Запись выполняется порциями через общую очередь записи (GroupCommitWriter),
+      после каждой порции сохраняется контрольная точка.
+
+    Параметры:
+    - catch_up (bool): Сначала продолжить прерванные запуски за любые периоды, затем закрыть прошедший месяц,
+                       если запуск по расписанию был пропущен (используется при получении лидерства).
+    """
+
+    if not LeaderManager.is_leader():
+        logger.info("Процесс не лидер — закрытие месяца выполнит другой процесс")
+        return
+
+    try:
+        chunk_size = SettingsManager.get_config().MONTH_CLOSE_CHUNK_SIZE
+
+        if catch_up:
+            await catch_up_month_close(chunk_size)
+        else:
+            await close_month(closed_period(), chunk_size)
+
+    except Exception as e:
+        logger.warning(f"Ошибка при выполнении задачи schedule_month_close: {e}")
@@ -0,0 +1,23 @@
+import logging
+from FlatPay.services.payments import refresh_tariffs
+
+
+# Инициализируем логирование
+logger = logging.getLogger("reload_tariffs_task")
+
+
+async def schedule_reload_tariffs() -> None:
+    """
+    Проверяет, изменились ли тарифы в базе данных, и перечитывает их при изменении.
+
+    Описание:
+    - Подхватывает версии тарифов, добавленные или заменённые другими процессами.
+    - Проверка — один запрос агрегатов по таблице тарифов, поэтому её можно выполнять часто.
+    - Расчёт долга продолжает читать тарифы только из памяти.
+    """
+
+    try:
+        await refresh_tariffs()
+
+    except Exception as e:
+        logger.warning(f"Ошибка при выполнении задачи schedule_reload_tariffs: {e}")
@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import os
+import socket
+from dataclasses import dataclass
+from time import time
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from FlatPay.database import WriterManager
+from FlatPay.database.repositories.leases_repo import acquire_lease_repo, release_lease_repo
+
+
+# Инициализируем логирование
+logger = logging.getLogger("leader_election")
+
+# Вызывается при получении или потере лидерства
+LeadershipCallback = Callable[[], Awaitable[None] | None]
+
+
+@dataclass(frozen=True)
+class LeaseState:
+    """
+    Снимок состояния выбора лидера в текущем процессе.
+
+    Атрибуты:
+     - name (str): Название аренды.
+     - holder (str): Идентификатор этого процесса (хост:pid:случайный суффикс).
+     - is_leader (bool): Является ли процесс лидером прямо сейчас.
+     - expires_at (float): До какого времени (UNIX time) действует аренда процесса; 0 — аренды нет.
+     - elections (int): Сколько раз процесс становился лидером.
+     - renewals (int): Количество успешных продлений аренды.
+     - failures (int): Количество неудачных попыток обратиться к базе данных.
+    """
+
+    name: str
+    holder: str
+    is_leader: bool
+    expires_at: float
+    elections: int
+    renewals: int
+    failures: int
+
+
+class LeaderElector:
+    """
+    Выбор лидера между процессами на аренде (lease), хранящейся в SQLite.
+
+    Каждый процесс раз в `heartbeat` секунд пытается захватить или продлить аренду
+    на `ttl` секунд. Лидер продлевает свою аренду; если он завис или завершился,
+    после истечения срока аренду перехватывает другой процесс.
+    Процесс считает себя лидером только до истечения своей аренды,
+    даже если очередное продление не удалось.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            ttl: float = 30.0,
+            heartbeat: float = 10.0,
+            on_elected: LeadershipCallback | None = None,
+            on_demoted: LeadershipCallback | None = None
+    ) -> None:
+        """
+        Параметры:
+         - name (str): Название аренды (одна аренда — один лидер).
+         - ttl (float): Срок аренды, сек.
+         - heartbeat (float): Период продления аренды, сек. (должен быть заметно меньше ttl).
+         - on_elected (LeadershipCallback | None): Вызывается, когда процесс становится лидером.
+         - on_demoted (LeadershipCallback | None): Вызывается, когда процесс теряет лидерство.
+        """
+
+        if heartbeat >= ttl:
+            raise ValueError("Период продления аренды должен быть меньше её срока")
+
+        self._name = name
+        self._ttl = ttl
+        self._heartbeat = heartbeat
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+
+        self._holder = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._leader = False
+        self._expires_at = 0.0
+        self._task: asyncio.Task | None = None
+
+        # Счётчики для статистики
+        self._elections = 0
+        self._renewals = 0
+        self._failures = 0
+
+    @property
+    def is_leader(self) -> bool:
+        """Является ли процесс лидером (с учётом срока аренды)."""
+
+        return self._leader and time() < self._expires_at
+
+    async def start(self) -> None:
+        """Делает первую попытку захватить аренду и запускает задачу продления."""
+
+        await self._tick()
+        self._task = asyncio.create_task(self._run(), name=f"leader-elector-{self._name}")
+
+    async def stop(self) -> None:
+        """Останавливает продление и освобождает аренду, чтобы её сразу мог захватить другой процесс."""
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._leader:
+            try:
+                await WriterManager.get_writer().submit(release_lease_repo, self._name, self._holder)
+            except Exception as e:
+                logger.error(f"Ошибка при освобождении аренды {self._name}: {e}")
+
+            await self._set_leader(False)
+
+    async def _run(self) -> None:
+        """Цикл продления аренды."""
+
+        while True:
+            await asyncio.sleep(self._heartbeat)
+            await self._tick()
+
+    async def _tick(self) -> None:
+        """Одна попытка захватить или продлить аренду."""
+
+        now = time()
+
+        try:
+            acquired = await WriterManager.get_writer().submit(
+                acquire_lease_repo, self._name, self._holder, now, self._ttl
+            )
+
+        except Exception as e:
+            # База недоступна: остаёмся лидером только до конца уже полученной аренды
+            self._failures += 1
+            logger.warning(f"Не удалось продлить аренду {self._name}: {e}")
+            if self._leader and not self.is_leader:
+                await self._set_leader(False)
+            return
+
+        if acquired:
+            self._expires_at = now + self._ttl
+            self._renewals += 1
+
+        if acquired != self._leader:
+            await self._set_leader(acquired)
+
+    async def _set_leader(self, leader: bool) -> None:
+        """Меняет состояние лидерства и вызывает соответствующий обработчик."""
+
+        self._leader = leader
+
+        if leader:
+            self._elections += 1
+            logger.info(f"Процесс {self._holder} стал лидером ({self._name}, аренда на {self._ttl} сек.)")
+        else:
+            self._expires_at = 0.0
+            logger.info(f"Процесс {self._holder} больше не лидер ({self._name})")
+
+        callback = self._on_elected if leader else self._on_demoted
+        if callback is not None:
+            try:
+                result = callback()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.exception(f"Ошибка в обработчике смены лидерства: {e}")
+
+    @property
+    def state(self) -> LeaseState:
+        """Текущее состояние выбора лидера."""
+
+        return LeaseState(
+            name=self._name,
+            holder=self._holder,
+            is_leader=self.is_leader,
+            expires_at=self._expires_at,
+            elections=self._elections,
+            renewals=self._renewals,
+            failures=self._failures
+        )
+
+
+class LeaderManager:
+    """
+    Глобальное хранилище для выбора лидера.
+    Лидер — единственный процесс (среди воркеров и хостов с общей базой), выполняющий закрытие месяца.
+    """
+
+    _elector: LeaderElector | None = None
+
+    @classmethod
+    async def init_elector(
+            cls,
+            name: str,
+            ttl: float,
+            heartbeat: float,
+            on_elected: LeadershipCallback | None = None,
+            on_demoted: LeadershipCallback | None = None
+    ) -> LeaderElector:
+        """
+        Создаёт и запускает выбор лидера.
+
+        Параметры:
+         - name (str): Название аренды.
+         - ttl (float): Срок аренды, сек.
+         - heartbeat (float): Период продления аренды, сек.
+         - on_elected, on_demoted (LeadershipCallback | None): Обработчики смены лидерства.
+
+        Возвращает:
+         - LeaderElector: Запущенный выбор лидера.
+        """
+
+        elector = LeaderElector(name, ttl=ttl, heartbeat=heartbeat, on_elected=on_elected, on_demoted=on_demoted)
+        cls._elector = elector
+        await elector.start()
+        return elector
+
+    @classmethod
+    def is_leader(cls) -> bool:
+        """Является ли текущий процесс лидером (False, если выбор лидера не запущен)."""
+
+        return cls._elector is not None and cls._elector.is_leader
+
+    @classmethod
+    def get_state(cls) -> LeaseState | None:
+        """Возвращает состояние выбора лидера (None, если он не запущен)."""
+
+        return cls._elector.state if cls._elector is not None else None
+
+    @classmethod
+    async def close_elector(cls) -> None:
+        """Останавливает выбор лидера и освобождает аренду."""
+
+        if cls._elector is None:
+            return
+
+        elector, cls._elector = cls._elector, None
+        await elector.stop()
+        logger.info(f"Выбор лидера остановлен: {elector.state}")
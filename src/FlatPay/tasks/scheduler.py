@@ -9,17 +9,17 @@ from FlatPay.core.exceptions import SchedulerStartupError
 logger = logging.getLogger("scheduler")
 
 
-def run_scheduler(scheduler: AsyncIOScheduler, db_path: str) -> None:
+def run_scheduler(scheduler: AsyncIOScheduler) -> None:
     """
     Инициализирует и запускает асинхронный планировщик задач (APScheduler).
 
     Описание:
      - Создаёт экземпляр `AsyncIOScheduler`.
-     - Запускает фоновый процесс с задачами, используя переданный путь к базе данных.
+     - Запускает фоновый процесс с задачами, использующими общий пул соединений.
      - В случае ошибки логирует исключение и завершает выполнение.
 
     Параметры:
-     - db_path (str): Путь к файлу базы данных.
+     - scheduler (AsyncIOScheduler): Экземпляр планировщика.
 
     Исключения:
      - SchedulerStartupError: Если произошла ошибка при запуске планировщика.
@@ -29,7 +29,7 @@ def run_scheduler(scheduler: AsyncIOScheduler, db_path: str) -> None:
 
     try:
         # Регистрируем задачи в планировщике
-        run_scheduler_tasks(scheduler, db_path)
+        run_scheduler_tasks(scheduler)
 
         # Запускаем планировщик
         scheduler.start()
@@ -51,3 +51,42 @@ def end_scheduler(scheduler: AsyncIOScheduler):
     # Останавливаем планировщик и все связанные задачи
     scheduler.shutdown()
     logger.info("Планировщик остановлен")
+
+
+class SchedulerManager:
+    """
+    Глобальное хранилище планировщика процесса.
+
+    Планировщик запускается в каждом процессе-воркере: перезагрузка тарифов нужна
+    каждому процессу (тарифы хранятся в его памяти). Задачи закрытия месяца
+    выполняет только лидер (см. LeaderManager).
+    """
+
+    _scheduler: AsyncIOScheduler | None = None
+
+    @classmethod
+    def start(cls) -> AsyncIOScheduler:
+        """
+        Создаёт и запускает планировщик с фоновыми задачами.
+
+        Возвращает:
+         - AsyncIOScheduler: Запущенный планировщик.
+
+        Исключения:
+         - SchedulerStartupError: Ошибка при запуске планировщика.
+        """
+
+        if cls._scheduler is None:
+            scheduler = AsyncIOScheduler()
+            run_scheduler(scheduler=scheduler)
+            cls._scheduler = scheduler
+
+        return cls._scheduler
+
+    @classmethod
+    def stop(cls) -> None:
+        """Останавливает планировщик (если он запущен)."""
+
+        if cls._scheduler is not None:
+            scheduler, cls._scheduler = cls._scheduler, None
+            end_scheduler(scheduler=scheduler)
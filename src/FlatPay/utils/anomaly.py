@@ -0,0 +1,118 @@
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+
+anomaly_logger = logging.getLogger("anomaly_detector")
+
+# Нижняя граница стандартного отклонения: доля среднего и абсолютный минимум (в единицах счётчика).
+# Без неё у стабильного расхода (дисперсия около нуля) любое отклонение на единицу было бы «аномалией».
+RELATIVE_STD_FLOOR = 0.1
+ABSOLUTE_STD_FLOOR = 1.0
+
+
+@dataclass(frozen=True)
+class AnomalyDetector:
+    """
+    Оценка правдоподобия расхода по скользящей статистике каждого пользователя.
+
+    Для каждого счётчика пользователя хранятся количество учтённых периодов, среднее и дисперсия расхода.
+    Статистика обновляется инкрементально (по одному периоду, без чтения истории):
+    первые `window` периодов — точные среднее и дисперсия (алгоритм Уэлфорда),
+    дальше — экспоненциально взвешенные с весом 1 / window, то есть с памятью примерно в `window` периодов.
+
+    Оценка — z-score: на сколько стандартных отклонений расход отличается от среднего.
+    Все методы векторные: массивы формы (N, 4) — по строке на пользователя, столбцы в порядке METERS.
+    Одиночная отправка показаний — тот же расчёт с N = 1.
+
+    Атрибуты:
+     - threshold (float): Порог |z|, выше которого расход считается аномальным.
+     - window (int): Длина «окна» статистики, периодов.
+     - min_periods (int): Сколько периодов нужно учесть, прежде чем оценивать расход.
+    """
+
+    threshold: float = 4.0
+    window: int = 12
+    min_periods: int = 3
+
+    def update(
+            self, count: np.ndarray, mean: np.ndarray, var: np.ndarray, used: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Учитывает в статистике расход очередного периода.
+
+        Параметры:
+         - count (np.ndarray): Количество учтённых периодов, форма (N,).
+         - mean (np.ndarray): Средний расход, форма (N, 4).
+         - var (np.ndarray): Дисперсия расхода, форма (N, 4).
+         - used (np.ndarray): Расход за период, форма (N, 4).
+
+        Возвращаемое значение:
+         - tuple[np.ndarray, np.ndarray, np.ndarray]: Новые (count, mean, var).
+        """
+
+        # 1/n — точное среднее по n периодам, после окна — постоянный вес
+        alpha = 1.0 / np.minimum(count + 1, self.window)[:, None]
+        diff = used - mean
+        increment = alpha * diff
+
+        return count + 1, mean + increment, (1.0 - alpha) * (var + diff * increment)
+
+    def score(self, count: np.ndarray, mean: np.ndarray, var: np.ndarray, used: np.ndarray) -> np.ndarray:
+        """
+        Считает z-score расхода по каждому счётчику.
+
+        Параметры:
+         - count, mean, var (np.ndarray): Статистика пользователей до оцениваемого периода.
+         - used (np.ndarray): Расход за оцениваемый период, форма (N, 4).
+
+        Возвращаемое значение:
+         - np.ndarray: z-score формы (N, 4); 0 — у пользователей с историей короче min_periods.
+        """
+
+        std = np.maximum(np.sqrt(var), np.maximum(RELATIVE_STD_FLOOR * np.abs(mean), ABSOLUTE_STD_FLOOR))
+        scores = (used - mean) / std
+        scores[count < self.min_periods] = 0.0
+        return scores
+
+    def flagged(self, scores: np.ndarray) -> np.ndarray:
+        """Маска аномальных значений (|z| выше порога) той же формы, что и scores."""
+
+        return np.abs(scores) > self.threshold
+
+
+class AnomalyManager:
+    """
+    Глобальное хранилище для детектора аномальных показаний.
+    До вызова init_detector() используется детектор с настройками по умолчанию.
+    """
+
+    _detector: AnomalyDetector = AnomalyDetector()
+
+    @classmethod
+    def init_detector(cls, threshold: float, window: int, min_periods: int) -> AnomalyDetector:
+        """
+        Создаёт детектор аномальных показаний.
+
+        Параметры:
+         - threshold (float): Порог |z| для аномалии.
+         - window (int): Длина «окна» статистики, периодов.
+         - min_periods (int): Минимальная история для оценки, периодов.
+
+        Возвращает:
+         - AnomalyDetector: Созданный детектор.
+        """
+
+        if window < 1 or min_periods < 1:
+            raise ValueError("Окно и минимальная история должны быть больше нуля")
+
+        cls._detector = AnomalyDetector(threshold=threshold, window=window, min_periods=min_periods)
+        anomaly_logger.info(f"Детектор аномальных показаний создан: {cls._detector}")
+        return cls._detector
+
+    @classmethod
+    def get_detector(cls) -> AnomalyDetector:
+        """Возвращает текущий детектор."""
+
+        return cls._detector
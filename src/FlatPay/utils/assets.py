@@ -0,0 +1,152 @@
+import hashlib
+import logging
+import mimetypes
+import os
+from dataclasses import dataclass, field
+
+from FlatPay.utils.compression import (
+    available_encodings, compress, is_compressible, STATIC_GZIP_LEVEL, STATIC_BROTLI_QUALITY
+)
+
+
+assets_logger = logging.getLogger("assets")
+
+# Длина отпечатка содержимого (hex-символов) в URL статики и в ETag
+DIGEST_SIZE = 8
+
+# Время кэширования статики с отпечатком в URL: её содержимое по такому адресу никогда не меняется
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def file_digest(path: str) -> str:
+    """
+    Считает отпечаток содержимого файла.
+
+    Параметры:
+     - path (str): Путь к файлу.
+
+    Возвращаемое значение:
+     - str: BLAKE2b от содержимого, 2 * DIGEST_SIZE hex-символов.
+    """
+
+    with open(path, "rb") as file:
+        return hashlib.blake2b(file.read(), digest_size=DIGEST_SIZE).hexdigest()
+
+
+def precompress(path: str) -> dict[str, bytes]:
+    """
+    Сжимает файл статики всеми доступными кодировками с максимальной степенью сжатия.
+
+    Параметры:
+     - path (str): Путь к файлу.
+
+    Возвращаемое значение:
+     - dict[str, bytes]: Кодировка -> сжатое содержимое. Пусто для уже сжатых типов (PNG и т. п.);
+                         варианты, которые не меньше исходного файла, не сохраняются.
+    """
+
+    if not is_compressible(mimetypes.guess_type(path)[0]):
+        return {}
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    variants = {}
+    for encoding in available_encodings():
+        compressed = compress(data, encoding, STATIC_BROTLI_QUALITY if encoding == "br" else STATIC_GZIP_LEVEL)
+        if len(compressed) < len(data):
+            variants[encoding] = compressed
+
+    return variants
+
+
+def walk_files(folder: str) -> list[str]:
+    """
+    Возвращает пути файлов каталога относительно него (с разделителем "/"), в порядке сортировки.
+
+    Параметры:
+     - folder (str): Каталог.
+    """
+
+    files = []
+    for root, _, names in os.walk(folder):
+        for name in names:
+            files.append(os.path.relpath(os.path.join(root, name), folder).replace(os.sep, "/"))
+
+    return sorted(files)
+
+
+@dataclass(frozen=True)
+class AssetManifest:
+    """
+    Отпечатки и сжатые варианты статики, посчитанные один раз при старте приложения.
+
+    Атрибуты:
+     - digests (dict[str, str]): Имя файла статики (относительно static_folder) -> отпечаток содержимого.
+     - release (str): Отпечаток всех шаблонов и статики: меняется с каждой выкладкой, меняющей разметку.
+     - compressed (dict[str, dict[str, bytes]]): Имя файла статики -> {кодировка: сжатое содержимое}.
+    """
+
+    digests: dict[str, str] = field(default_factory=dict)
+    release: str = ""
+    compressed: dict[str, dict[str, bytes]] = field(default_factory=dict)
+
+    def digest(self, filename: str) -> str | None:
+        """Возвращает отпечаток файла статики (None — файл неизвестен)."""
+
+        return self.digests.get(filename)
+
+    def variants(self, filename: str) -> dict[str, bytes]:
+        """Возвращает сжатые варианты файла статики (пусто — файл отдаётся без сжатия)."""
+
+        return self.compressed.get(filename, {})
+
+
+class AssetManager:
+    """
+    Глобальное хранилище для манифеста статики.
+    До вызова init_assets() используется пустой манифест: URL статики без отпечатков.
+    """
+
+    _manifest: AssetManifest = AssetManifest()
+
+    @classmethod
+    def init_assets(cls, static_folder: str, template_folder: str) -> AssetManifest:
+        """
+        Считает отпечатки всех файлов статики и шаблонов и заранее сжимает статику:
+        при отдаче файла сжатие уже не требует процессорного времени.
+
+        Параметры:
+         - static_folder (str): Каталог статики.
+         - template_folder (str): Каталог шаблонов.
+
+        Возвращает:
+         - AssetManifest: Созданный манифест.
+        """
+
+        digests = {name: file_digest(os.path.join(static_folder, name)) for name in walk_files(static_folder)}
+
+        # Отпечаток выкладки: от содержимого шаблонов и статики, а не от времени старта,
+        # чтобы воркеры и перезапуски одной версии отдавали одинаковые ETag
+        release = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        for name in walk_files(template_folder):
+            release.update(f"{name}:{file_digest(os.path.join(template_folder, name))}\n".encode())
+        for name, digest in digests.items():
+            release.update(f"{name}:{digest}\n".encode())
+
+        compressed = {
+            name: variants for name in digests if (variants := precompress(os.path.join(static_folder, name)))
+        }
+
+        cls._manifest = AssetManifest(digests=digests, release=release.hexdigest(), compressed=compressed)
+        assets_logger.info(
+            f"Отпечатки статики посчитаны: {len(digests)} файлов ({len(compressed)} сжаты заранее), "
+            f"выкладка {cls._manifest.release}"
+        )
+        return cls._manifest
+
+    @classmethod
+    def get_manifest(cls) -> AssetManifest:
+        """Возвращает текущий манифест."""
+
+        return cls._manifest
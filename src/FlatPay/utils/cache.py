@@ -0,0 +1,190 @@
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Hashable
+
+
+cache_logger = logging.getLogger("cache")
+
+# Значение «нет в кэше» (None — допустимое закэшированное значение, например «пользователь не найден»)
+MISSING = object()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Снимок статистики кэша.
+
+    Атрибуты:
+     - size (int): Текущее количество записей.
+     - max_size (int): Максимальное количество записей.
+     - hits (int): Количество попаданий.
+     - misses (int): Количество промахов (включая просроченные записи).
+     - evictions (int): Количество записей, вытесненных по LRU.
+     - invalidations (int): Количество явно удалённых записей.
+    """
+
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Доля попаданий среди всех обращений."""
+
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class TTLCache:
+    """
+    Ограниченный по размеру кэш в памяти с вытеснением LRU и временем жизни записей.
+
+    Значение None означает закэшированный отрицательный результат («не найдено»)
+    и живёт `negative_ttl` секунд — обычно меньше, чем положительный результат.
+    Кэш живёт в одном процессе и используется только из цикла событий,
+    поэтому блокировки не нужны.
+    """
+
+    def __init__(self, max_size: int, ttl: float, negative_ttl: float | None = None) -> None:
+        """
+        Параметры:
+         - max_size (int): Максимальное количество записей.
+         - ttl (float): Время жизни записи, сек.
+         - negative_ttl (float | None): Время жизни записи со значением None, сек. (по умолчанию — ttl).
+        """
+
+        if max_size < 1:
+            raise ValueError("Размер кэша должен быть больше нуля")
+
+        self._max_size = max_size
+        self._ttl = ttl
+        self._negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()  # ключ -> (срок, значение)
+
+        # Счётчики для статистики
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Возвращает значение по ключу.
+
+        Возвращаемое значение:
+         - Any: Закэшированное значение или MISSING, если записи нет или она просрочена.
+        """
+
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] <= monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return MISSING
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Сохраняет значение, вытесняя самую давно использованную запись при переполнении.
+
+        Параметры:
+         - key (Hashable): Ключ.
+         - value (Any): Значение; None — отрицательный результат с временем жизни negative_ttl.
+        """
+
+        ttl = self._negative_ttl if value is None else self._ttl
+        self._entries[key] = (monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Удаляет запись по ключу (если она есть)."""
+
+        if self._entries.pop(key, None) is not None:
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        """Удаляет все записи."""
+
+        self._invalidations += len(self._entries)
+        self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Текущая статистика кэша."""
+
+        return CacheStats(
+            size=len(self._entries),
+            max_size=self._max_size,
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            invalidations=self._invalidations
+        )
+
+
+class CacheManager:
+    """
+    Глобальное хранилище именованных кэшей процесса.
+    Кэши создаются при старте приложения и доступны из сервисов по имени.
+    """
+
+    _caches: dict[str, TTLCache] = {}
+
+    @classmethod
+    def init_cache(cls, name: str, max_size: int, ttl: float, negative_ttl: float | None = None) -> TTLCache:
+        """
+        Создаёт (или пересоздаёт) именованный кэш.
+
+        Параметры:
+         - name (str): Имя кэша.
+         - max_size (int): Максимальное количество записей.
+         - ttl (float): Время жизни записи, сек.
+         - negative_ttl (float | None): Время жизни отрицательного результата (None), сек.
+
+        Возвращает:
+         - TTLCache: Созданный кэш.
+        """
+
+        cls._caches[name] = TTLCache(max_size=max_size, ttl=ttl, negative_ttl=negative_ttl)
+        cache_logger.info(f"Кэш {name} создан (max_size={max_size}, ttl={ttl}, negative_ttl={negative_ttl})")
+        return cls._caches[name]
+
+    @classmethod
+    def get_cache(cls, name: str) -> TTLCache:
+        """Возвращает кэш по имени."""
+
+        if name not in cls._caches:
+            raise KeyError(f"Кэш {name} не инициализирован! Сначала вызови init_cache().")
+
+        return cls._caches[name]
+
+    @classmethod
+    def find_cache(cls, name: str) -> TTLCache | None:
+        """
+        Возвращает кэш по имени или None, если он не создан.
+        Используется для инвалидации: процессы без кэша (например, CLI-импорт) её пропускают.
+        """
+
+        return cls._caches.get(name)
+
+    @classmethod
+    def close_caches(cls) -> None:
+        """Логирует итоговую статистику и удаляет все кэши."""
+
+        for name, cache in cls._caches.items():
+            cache_logger.info(f"Кэш {name}: {cache.stats}")
+
+        cls._caches = {}
@@ -1,25 +1,25 @@
-from decimal import Decimal
+from datetime import date
+
+import numpy as np
 
 from FlatPay.app.models import Readings
+from FlatPay.utils.tariffs import TariffManager
 
 
-def calculate_base_debt(readings: Readings) -> float:
+def calculate_base_debt(readings: Readings, day: date | None = None) -> float:
     """
-    Утилита для подсчёта долга по актуальному Казансому тарифу.
+    Утилита для подсчёта долга по Казанскому тарифу, действующему на указанную дату.
 
     Параметры:
      - readings (dict): Словарь с показаниями для различных ресурсов (электричество, вода, газ).
+     - day (date | None): Дата, на которую берутся тарифы (по умолчанию — сегодня).
 
     Возвращаемое значение:
-     - float: Рассчитанный долг по актуальному тарифу.
+     - float: Рассчитанный долг по действующему тарифу.
     """
 
-    # Казанские тарифы, руб./единицу измерения
-    tariffs = {
-        "electricity": 5.09,
-        "cold_water": 29.41,
-        "hot_water": 226.7,
-        "gas": 7.47}
+    # Тарифы берутся из расписания в памяти, без обращения к БД
+    tariffs = TariffManager.get_schedule().tariffs_for(day or date.today())
     base_debt = 0.0
 
     # Суммируем задолженность по каждому ресурсу
@@ -28,3 +28,22 @@ def calculate_base_debt(readings: Readings) -> float:
 
     # Возвращаем округлённый результат до 2 знаков (рубли и копейки)
     return round(base_debt, 2)
+
+
+def calculate_base_debts(readings: np.ndarray, day: date | None = None) -> np.ndarray:
+    """
+    Векторная утилита для подсчёта долга сразу по множеству пользователей.
+
+    Параметры:
+     - readings (np.ndarray): Матрица показаний формы (N, 4), столбцы в порядке METERS.
+     - day (date | None): Дата, на которую берутся тарифы (по умолчанию — сегодня).
+
+    Возвращаемое значение:
+     - np.ndarray: Вектор долгов длины N, округлённых до 2 знаков.
+    """
+
+    # Вектор тарифов в порядке столбцов матрицы показаний
+    tariff_vector = TariffManager.get_schedule().vector_for(day or date.today())
+
+    # Одно матричное умножение вместо цикла по пользователям
+    return np.round(readings @ tariff_vector, 2)
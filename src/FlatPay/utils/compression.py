@@ -0,0 +1,141 @@
+import asyncio
+import gzip
+import logging
+from dataclasses import dataclass
+
+try:
+    import brotli
+except ImportError:  # brotli — необязательная зависимость: без неё ответы сжимаются только gzip
+    brotli = None
+
+
+compression_logger = logging.getLogger("compression")
+
+# Типы содержимого, которые имеет смысл сжимать (кроме text/*). Изображения PNG/JPEG, архивы
+# и шрифты WOFF2 уже сжаты: повторное сжатие тратит процессор и не уменьшает размер
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/javascript",
+    "application/manifest+json",
+    "application/xml",
+    "image/svg+xml",
+    "image/vnd.microsoft.icon",
+    "image/x-icon",
+})
+
+# Максимальная степень сжатия для статики: она сжимается один раз при старте, а не на каждый запрос
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+
+
+def is_compressible(mimetype: str | None) -> bool:
+    """Проверяет, имеет ли смысл сжимать содержимое этого типа."""
+
+    return bool(mimetype) and (mimetype.startswith("text/") or mimetype in COMPRESSIBLE_TYPES)
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Возвращает поддерживаемые кодировки в порядке предпочтения сервера (brotli — если установлен)."""
+
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """
+    Сжимает данные.
+
+    Параметры:
+     - data (bytes): Данные.
+     - encoding (str): Кодировка: "gzip" или "br".
+     - level (int): Степень сжатия (gzip — 1..9, brotli — 0..11).
+
+    Возвращаемое значение:
+     - bytes: Сжатые данные.
+    """
+
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+
+    # mtime=0: одинаковые данные дают одинаковые байты (не меняется от запроса к запросу)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+@dataclass(frozen=True)
+class Compressor:
+    """
+    Настройки сжатия ответов.
+
+    Атрибуты:
+     - min_size (int): Ответы меньше этого размера (байт) не сжимаются: выигрыш меньше пакета TCP,
+                       а время на сжатие тратится.
+     - gzip_level (int): Степень сжатия gzip для динамических ответов.
+     - brotli_quality (int): Качество brotli для динамических ответов.
+     - offload_size (int): Ответы от этого размера (байт) сжимаются в пуле потоков, чтобы не блокировать
+                           цикл событий (zlib и brotli освобождают GIL на время сжатия).
+    """
+
+    min_size: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 4
+    offload_size: int = 64 * 1024
+
+    def level(self, encoding: str) -> int:
+        """Возвращает степень сжатия для кодировки."""
+
+        return self.brotli_quality if encoding == "br" else self.gzip_level
+
+    async def compress(self, data: bytes, encoding: str) -> bytes:
+        """
+        Сжимает тело ответа: небольшие — сразу, большие — в пуле потоков.
+
+        Параметры:
+         - data (bytes): Тело ответа.
+         - encoding (str): Кодировка: "gzip" или "br".
+
+        Возвращаемое значение:
+         - bytes: Сжатое тело ответа.
+        """
+
+        if len(data) >= self.offload_size:
+            return await asyncio.to_thread(compress, data, encoding, self.level(encoding))
+
+        return compress(data, encoding, self.level(encoding))
+
+
+class CompressionManager:
+    """
+    Глобальное хранилище для настроек сжатия ответов.
+    До вызова init_compressor() используются настройки по умолчанию.
+    """
+
+    _compressor: Compressor = Compressor()
+
+    @classmethod
+    def init_compressor(cls, min_size: int, gzip_level: int, brotli_quality: int, offload_size: int) -> Compressor:
+        """
+        Создаёт настройки сжатия ответов.
+
+        Параметры:
+         - min_size (int): Минимальный размер сжимаемого ответа, байт.
+         - gzip_level (int): Степень сжатия gzip (1..9).
+         - brotli_quality (int): Качество brotli (0..11).
+         - offload_size (int): Размер ответа, с которого сжатие выполняется в пуле потоков, байт.
+
+        Возвращает:
+         - Compressor: Созданные настройки.
+        """
+
+        if not 1 <= gzip_level <= 9 or not 0 <= brotli_quality <= 11:
+            raise ValueError("Степень сжатия gzip должна быть от 1 до 9, качество brotli — от 0 до 11")
+
+        cls._compressor = Compressor(
+            min_size=min_size, gzip_level=gzip_level, brotli_quality=brotli_quality, offload_size=offload_size
+        )
+        compression_logger.info(f"Сжатие ответов настроено: {cls._compressor}, кодировки {available_encodings()}")
+        return cls._compressor
+
+    @classmethod
+    def get_compressor(cls) -> Compressor:
+        """Возвращает текущие настройки сжатия."""
+
+        return cls._compressor
@@ -0,0 +1,225 @@
+import logging
+import sys
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+
+from FlatPay.core.config import RateLimit
+
+
+rate_limit_logger = logging.getLogger("rate_limiter")
+
+
+@dataclass(frozen=True)
+class RateLimiterStats:
+    """
+    Снимок статистики ограничителя частоты запросов.
+
+    Атрибуты:
+     - keys (int): Количество корзин в памяти.
+     - max_keys (int): Максимальное количество корзин.
+     - allowed (int): Количество пропущенных запросов.
+     - rejected (int): Количество отклонённых запросов.
+     - evicted (int): Количество удалённых корзин (простаивающих и вытесненных при переполнении).
+     - memory_bytes (int): Оценка занимаемой памяти, байт.
+    """
+
+    keys: int
+    max_keys: int
+    allowed: int
+    rejected: int
+    evicted: int
+    memory_bytes: int
+
+
+class TokenBucketLimiter:
+    """
+    Ограничитель частоты запросов на корзинах токенов в памяти процесса.
+
+    Ограничитель живёт в памяти одного процесса: при SERVER_WORKERS > 1 у каждого воркера свои корзины,
+    и клиент, запросы которого распределяются по воркерам, получает до limit × SERVER_WORKERS запросов за период.
+
+    Состояние корзин хранится компактно: ключ отображается в номер ячейки,
+    а количество токенов и время последнего обновления лежат в двух массивах array('d').
+    Освободившиеся ячейки переиспользуются, поэтому память ограничена `max_keys` корзинами.
+
+    Раз в `sweep_interval` секунд (во время очередной проверки, без фоновой задачи)
+    удаляются корзины, которые простаивали дольше `idle_ttl` — за это время они
+    всё равно восстановились бы полностью. Если корзин всё ещё слишком много,
+    вытесняются те, к которым дольше всего не обращались (LRU).
+    """
+
+    def __init__(self, max_keys: int, idle_ttl: float, sweep_interval: float = 10.0) -> None:
+        """
+        Параметры:
+         - max_keys (int): Максимальное количество корзин в памяти.
+         - idle_ttl (float): Через сколько секунд простоя корзина удаляется.
+         - sweep_interval (float): Как часто удалять простаивающие корзины, сек.
+        """
+
+        if max_keys < 1:
+            raise ValueError("Количество корзин должно быть больше нуля")
+
+        self._max_keys = max_keys
+        self._idle_ttl = idle_ttl
+        self._sweep_interval = sweep_interval
+        self._next_sweep = monotonic() + sweep_interval
+
+        self._slots: OrderedDict[str, int] = OrderedDict()  # ключ -> номер ячейки, от давно использованных к недавним
+        self._tokens = array("d")  # Оставшиеся токены корзины
+        self._stamps = array("d")  # Время последнего обновления корзины
+        self._free: list[int] = []  # Освободившиеся ячейки
+
+        # Счётчики для статистики
+        self._allowed = 0
+        self._rejected = 0
+        self._evicted = 0
+
+    def hit(self, key: str, limit: RateLimit) -> float:
+        """
+        Забирает один токен из корзины ключа.
+
+        Параметры:
+         - key (str): Ключ корзины (например, маршрут и IP-адрес).
+         - limit (RateLimit): Ограничение для маршрута.
+
+        Возвращаемое значение:
+         - float: 0, если запрос разрешён; иначе — через сколько секунд появится токен.
+        """
+
+        now = monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        slot = self._slots.get(key)
+
+        if slot is None:
+            # Новая корзина — полная, сразу забираем из неё токен
+            slot = self._allocate(key)
+            self._tokens[slot] = limit.requests - 1
+            self._stamps[slot] = now
+            self._allowed += 1
+            return 0.0
+
+        self._slots.move_to_end(key)
+
+        # Пополняем корзину за прошедшее время, но не выше ёмкости
+        tokens = min(limit.requests, self._tokens[slot] + (now - self._stamps[slot]) * limit.refill_rate)
+        self._stamps[slot] = now
+
+        if tokens < 1:
+            self._tokens[slot] = tokens
+            self._rejected += 1
+            return (1 - tokens) / limit.refill_rate
+
+        self._tokens[slot] = tokens - 1
+        self._allowed += 1
+        return 0.0
+
+    def _allocate(self, key: str) -> int:
+        """Выделяет ячейку под новую корзину, при переполнении вытесняя давнее всех использованную."""
+
+        if len(self._slots) >= self._max_keys:
+            # Лимит исчерпан до очередной очистки — вытесняем корзину, к которой дольше всего не обращались
+            _, slot = self._slots.popitem(last=False)
+            self._free.append(slot)
+            self._evicted += 1
+
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._tokens)
+            self._tokens.append(0.0)
+            self._stamps.append(0.0)
+
+        self._slots[key] = slot
+        return slot
+
+    def _sweep(self, now: float) -> None:
+        """Удаляет корзины, простаивавшие дольше idle_ttl."""
+
+        deadline = now - self._idle_ttl
+        idle = [key for key, slot in self._slots.items() if self._stamps[slot] <= deadline]
+
+        for key in idle:
+            self._free.append(self._slots.pop(key))
+
+        self._evicted += len(idle)
+        self._next_sweep = now + self._sweep_interval
+
+    def memory_usage(self) -> int:
+        """Оценка памяти, занимаемой корзинами (словарь, ключи, массивы), байт."""
+
+        return (
+            sys.getsizeof(self._slots)
+            + sum(sys.getsizeof(key) for key in self._slots)
+            + sys.getsizeof(self._tokens)
+            + sys.getsizeof(self._stamps)
+            + sys.getsizeof(self._free)
+        )
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        """Текущая статистика ограничителя."""
+
+        return RateLimiterStats(
+            keys=len(self._slots),
+            max_keys=self._max_keys,
+            allowed=self._allowed,
+            rejected=self._rejected,
+            evicted=self._evicted,
+            memory_bytes=self.memory_usage()
+        )
+
+
+class RateLimiterManager:
+    """
+    Глобальное хранилище ограничителя частоты запросов и ограничений по маршрутам.
+    """
+
+    _limiter: TokenBucketLimiter | None = None
+    _limits: dict[str, RateLimit] = {}
+
+    @classmethod
+    def init_limiter(cls, limits: dict[str, RateLimit], max_keys: int) -> TokenBucketLimiter:
+        """
+        Создаёт ограничитель частоты запросов.
+
+        Параметры:
+         - limits (dict[str, RateLimit]): Ограничения по именам маршрутов.
+         - max_keys (int): Максимальное количество корзин в памяти.
+
+        Возвращает:
+         - TokenBucketLimiter: Созданный ограничитель.
+        """
+
+        # Корзина, простоявшая дольше самого длинного периода, гарантированно полная
+        idle_ttl = max((limit.period for limit in limits.values()), default=60.0)
+
+        cls._limiter = TokenBucketLimiter(max_keys=max_keys, idle_ttl=idle_ttl)
+        cls._limits = dict(limits)
+        rate_limit_logger.info(f"Ограничитель частоты запросов создан (max_keys={max_keys}, маршруты: {limits})")
+        return cls._limiter
+
+    @classmethod
+    def get_limit(cls, route: str) -> RateLimit | None:
+        """Возвращает ограничение для маршрута (None — маршрут не ограничен)."""
+
+        return cls._limits.get(route)
+
+    @classmethod
+    def get_limiter(cls) -> TokenBucketLimiter | None:
+        """Возвращает текущий ограничитель (None, если он не создан)."""
+
+        return cls._limiter
+
+    @classmethod
+    def close_limiter(cls) -> None:
+        """Логирует итоговую статистику и удаляет ограничитель."""
+
+        if cls._limiter is None:
+            return
+
+        limiter, cls._limiter = cls._limiter, None
+        rate_limit_logger.info(f"Ограничитель частоты запросов остановлен: {limiter.stats}")
@@ -1,42 +1,197 @@
-import os
+import asyncio
 import hashlib
+import hmac
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from FlatPay.core.exceptions import PasswordHasherError
+
+
+# Инициализируем логирование
+security_logger = logging.getLogger("password_hasher")
 
+# Формат хеша: scrypt$n=<N>,r=<r>,p=<p>$<соль hex>$<хеш hex>
+SCRYPT_SCHEME = "scrypt"
 
-def hash_password(password: str, salt: bytes = None) -> tuple[str, str] | str:
+# Параметры scrypt по умолчанию: N=2^14, r=8 — около 16 МБ памяти на одно вычисление
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_KEY_LENGTH = 32
+SALT_LENGTH = 16
+
+
+def hash_password(password: str, n: int = SCRYPT_N, r: int = SCRYPT_R, p: int = SCRYPT_P) -> str:
     """
-    Хеширует пароль с использованием SHA-256 и соли.
+    Хеширует пароль функцией scrypt со случайной солью.
 
-    - Если соль не передана, генерируется новая соль, и возвращается кортеж (hash, salt).
-    - Если соль передана, возвращается только хеш пароля.
+    Результат самоописывающий: алгоритм, параметры и соль хранятся в самой строке,
+    поэтому параметры можно менять без миграции уже сохранённых хешей.
+    Функция блокирующая — в приложении вызывается через PasswordHasher.
 
     Параметры:
     - password (str): Пароль в открытом виде.
-    - salt (bytes | None): Соль в байтах. Если не передана, будет создана новая.
+    - n, r, p (int): Параметры scrypt (стоимость, размер блока, параллелизм).
+
+    Возвращаемое значение:
+    - str: Строка вида scrypt$n=...,r=...,p=...$<соль>$<хеш>.
+    """
+
+    salt = os.urandom(SALT_LENGTH)
+    derived = _scrypt(password, salt, n, r, p)
+
+    return f"{SCRYPT_SCHEME}$n={n},r={r},p={p}${salt.hex()}${derived.hex()}"
+
+
+def verify_password(password: str, stored_hash: str, legacy_salt: str | None = None) -> bool:
+    """
+    Проверяет пароль по сохранённому хешу.
+
+    Поддерживаются два формата:
+    - самоописывающий scrypt (см. hash_password);
+    - старый формат: hex SHA-256(соль + пароль), соль хранится отдельно в столбце salt.
+
+    Параметры:
+    - password (str): Введённый пароль.
+    - stored_hash (str): Сохранённый хеш.
+    - legacy_salt (str | None): Соль в hex для хешей старого формата.
 
     Возвращаемое значение:
-    - tuple[str, str]: Хеш и соль (в hex), если соль не передана.
-    - str: Только хеш, если соль передана.
-    """
-
-    # Преобразуем пароль в байты
-    encoded_password = password.encode('utf-8')
-
-    # Если не передаем соль в аргументах:
-    if salt is None:
-        # Создаем соль динамически
-        salt = os.urandom(16)
-        # "Солим" пароль
-        salted_password = salt + encoded_password
-        # Хэщируем пароль, спользуя sha256
-        hashed_password = hashlib.sha256(salted_password).hexdigest()
-        # Возвращаем хеш и соль в hex-представлении
-        return hashed_password, salt.hex()
-
-    # Если соль передана:
-    else:
-        # "Солим" пароль
-        salted_password = salt + encoded_password
-        # Хэщируем пароль, спользуя sha256
-        hashed_password = hashlib.sha256(salted_password).hexdigest()
-        # Возвращаем только хеш
-        return hashed_password
+    - bool: True, если пароль совпадает, иначе False.
+    """
+
+    if stored_hash.startswith(f"{SCRYPT_SCHEME}$"):
+        try:
+            _, params, salt, expected = stored_hash.split("$")
+            n, r, p = (int(value.split("=")[1]) for value in params.split(","))
+            derived = _scrypt(password, bytes.fromhex(salt), n, r, p)
+        except ValueError:
+            security_logger.error("Повреждённый хеш пароля в формате scrypt")
+            return False
+
+        return hmac.compare_digest(derived.hex(), expected)
+
+    # Старый формат без префикса: SHA-256 с солью из отдельного столбца
+    if legacy_salt is None:
+        return False
+
+    legacy_hash = hashlib.sha256(bytes.fromhex(legacy_salt) + password.encode("utf-8")).hexdigest()
+    return hmac.compare_digest(legacy_hash, stored_hash)
+
+
+def needs_rehash(stored_hash: str, n: int = SCRYPT_N, r: int = SCRYPT_R, p: int = SCRYPT_P) -> bool:
+    """
+    Проверяет, нужно ли пересчитать хеш: старый формат или устаревшие параметры scrypt.
+
+    Параметры:
+    - stored_hash (str): Сохранённый хеш.
+    - n, r, p (int): Текущие параметры scrypt.
+
+    Возвращаемое значение:
+    - bool: True, если хеш следует пересчитать при ближайшем успешном входе.
+    """
+
+    return not stored_hash.startswith(f"{SCRYPT_SCHEME}$n={n},r={r},p={p}$")
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    """Вычисляет scrypt с запасом по памяти под выбранные параметры."""
+
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r, dklen=SCRYPT_KEY_LENGTH
+    )
+
+
+class PasswordHasher:
+    """
+    Хеширование и проверка паролей в ограниченном пуле потоков.
+
+    scrypt занимает десятки миллисекунд процессора; hashlib отпускает GIL на время
+    вычисления, поэтому пул потоков не блокирует цикл событий и ограничивает
+    количество одновременных вычислений (и расход памяти) числом `workers`.
+    """
+
+    def __init__(self, workers: int = 4, n: int = SCRYPT_N) -> None:
+        """
+        Параметры:
+         - workers (int): Максимальное количество одновременных вычислений.
+         - n (int): Параметр стоимости scrypt для новых хешей.
+        """
+
+        if workers < 1:
+            raise ValueError("Количество потоков хеширования должно быть больше нуля")
+
+        self._n = n
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hasher")
+
+    async def hash(self, password: str) -> str:
+        """Хеширует пароль в пуле потоков (см. hash_password)."""
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, hash_password, password, self._n)
+
+    async def verify(self, password: str, stored_hash: str, legacy_salt: str | None = None) -> bool:
+        """Проверяет пароль в пуле потоков (см. verify_password)."""
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, verify_password, password, stored_hash, legacy_salt
+        )
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        """Проверяет, устарел ли формат или параметры хеша (см. needs_rehash)."""
+
+        return needs_rehash(stored_hash, self._n)
+
+    def close(self) -> None:
+        """Дожидается текущих вычислений и останавливает пул потоков."""
+
+        self._executor.shutdown(wait=True)
+
+
+class HasherManager:
+    """
+    Глобальное хранилище для пула хеширования паролей.
+    Пул создаётся один раз при старте приложения.
+    """
+
+    _hasher: PasswordHasher | None = None
+
+    @classmethod
+    def init_hasher(cls, workers: int, n: int = SCRYPT_N) -> PasswordHasher:
+        """
+        Создаёт пул хеширования паролей.
+
+        Параметры:
+         - workers (int): Максимальное количество одновременных вычислений.
+         - n (int): Параметр стоимости scrypt.
+
+        Возвращает:
+         - PasswordHasher: Созданный пул.
+        """
+
+        if cls._hasher is not None:
+            raise PasswordHasherError("Пул хеширования паролей уже инициализирован")
+
+        cls._hasher = PasswordHasher(workers=workers, n=n)
+        security_logger.info(f"Пул хеширования паролей создан (workers={workers}, n={n})")
+        return cls._hasher
+
+    @classmethod
+    def get_hasher(cls) -> PasswordHasher:
+        """Возвращает текущий пул хеширования паролей."""
+
+        if cls._hasher is None:
+            raise PasswordHasherError("Пул хеширования не инициализирован! Сначала вызови init_hasher().")
+
+        return cls._hasher
+
+    @classmethod
+    def close_hasher(cls) -> None:
+        """Останавливает пул хеширования паролей."""
+
+        if cls._hasher is None:
+            return
+
+        hasher, cls._hasher = cls._hasher, None
+        hasher.close()
@@ -0,0 +1,158 @@
+from bisect import bisect_right
+from calendar import monthrange
+from dataclasses import dataclass
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Iterable, Mapping
+
+import numpy as np
+from aiosqlite import Connection
+
+from FlatPay.database.repositories.tariffs_repo import fetch_tariffs_repo, fetch_tariffs_version_repo
+
+
+# Порядок счётчиков — совпадает с порядком столбцов в таблицах Taxpayers и tariffs
+METERS: tuple[str, ...] = ("electricity", "cold_water", "hot_water", "gas")
+
+# Казанские тарифы по умолчанию, руб./единицу измерения (используются, пока тарифы не загружены из БД)
+DEFAULT_TARIFFS: dict[str, float] = {
+    "electricity": 5.09,
+    "cold_water": 29.41,
+    "hot_water": 226.7,
+    "gas": 7.47
+}
+
+
+def billing_day(period: str) -> date:
+    """
+    Возвращает дату, на которую берутся тарифы для начислений за период: последний день месяца.
+
+    Одна дата для всех путей расчёта (показания через форму и API, массовый импорт, закрытие месяца):
+    если тарифы меняются посреди периода, оценка долга на следующий месяц совпадает с начислением
+    при закрытии месяца.
+
+    Параметры:
+     - period (str): Период (YYYY-MM).
+
+    Возвращаемое значение:
+     - date: Последний день периода.
+    """
+
+    first_day = datetime.strptime(period, "%Y-%m").date()
+    return first_day.replace(day=monthrange(first_day.year, first_day.month)[1])
+
+
+@dataclass(frozen=True)
+class TariffSchedule:
+    """
+    Неизменяемое расписание тарифов, скомпилированное для быстрого поиска по дате.
+
+    Атрибуты:
+     - dates (tuple[str, ...]): Даты начала действия версий (ISO, по возрастанию).
+     - tariffs (tuple[Mapping[str, float], ...]): Тарифы каждой версии по типам счётчиков.
+     - vectors (tuple[np.ndarray, ...]): Те же тарифы векторами в порядке METERS (только для чтения).
+    """
+
+    dates: tuple[str, ...]
+    tariffs: tuple[Mapping[str, float], ...]
+    vectors: tuple[np.ndarray, ...]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "TariffSchedule":
+        """
+        Компилирует расписание из строк таблицы tariffs.
+
+        Параметры:
+         - rows (Iterable[tuple]): Кортежи (effective_from, electricity, cold_water, hot_water, gas).
+        """
+
+        dates, tariffs, vectors = [], [], []
+
+        for effective_from, *rates in sorted(rows):
+            vector = np.asarray(rates, dtype=np.float64)
+            vector.setflags(write=False)
+
+            dates.append(effective_from)
+            tariffs.append(MappingProxyType(dict(zip(METERS, map(float, rates)))))
+            vectors.append(vector)
+
+        if not dates:
+            raise ValueError("Расписание тарифов не может быть пустым")
+
+        return cls(dates=tuple(dates), tariffs=tuple(tariffs), vectors=tuple(vectors))
+
+    def _index_for(self, day: date) -> int:
+        # Последняя версия, вступившая в силу не позже указанного дня
+        index = bisect_right(self.dates, day.isoformat()) - 1
+        if index < 0:
+            raise LookupError(f"Нет тарифов, действующих на {day}")
+
+        return index
+
+    def tariffs_for(self, day: date) -> Mapping[str, float]:
+        """Тарифы, действующие в указанный день."""
+
+        return self.tariffs[self._index_for(day)]
+
+    def vector_for(self, day: date) -> np.ndarray:
+        """Тарифы, действующие в указанный день, вектором в порядке METERS."""
+
+        return self.vectors[self._index_for(day)]
+
+
+class TariffManager:
+    """
+    Глобальное хранилище для расписания тарифов.
+
+    Расписание загружается из БД при старте и при изменении тарифов,
+    а расчёт долга читает его только из памяти. Перезагрузка подменяет
+    ссылку на новый неизменяемый объект, поэтому читатели всегда видят
+    согласованную версию. Изменения, сделанные другими процессами, подхватывает
+    refresh: он сравнивает отпечаток таблицы тарифов с отпечатком загруженного расписания.
+    """
+
+    _schedule: TariffSchedule = TariffSchedule.from_rows(
+        [("1970-01-01", *(DEFAULT_TARIFFS[meter] for meter in METERS))]
+    )
+    _version: tuple | None = None  # Отпечаток таблицы тарифов, по которой построено расписание
+
+    @classmethod
+    def get_schedule(cls) -> TariffSchedule:
+        """Возвращает текущее расписание тарифов."""
+
+        return cls._schedule
+
+    @classmethod
+    async def reload(cls, connection: Connection) -> TariffSchedule:
+        """
+        Перечитывает тарифы из БД и атомарно подменяет расписание.
+
+        Параметры:
+         - connection (Connection): Асинхронное соединение с базой данных.
+
+        Возвращает:
+         - TariffSchedule: Новое расписание.
+        """
+
+        # Отпечаток читается до строк: изменение между запросами не потеряется, а вызовет ещё одну перезагрузку
+        version = await fetch_tariffs_version_repo(connection)
+        schedule = TariffSchedule.from_rows(await fetch_tariffs_repo(connection))
+        cls._schedule, cls._version = schedule, version
+        return schedule
+
+    @classmethod
+    async def refresh(cls, connection: Connection) -> TariffSchedule | None:
+        """
+        Перезагружает расписание, только если тарифы в БД изменились (например, другим процессом).
+
+        Параметры:
+         - connection (Connection): Асинхронное соединение с базой данных.
+
+        Возвращает:
+         - TariffSchedule | None: Новое расписание; None, если тарифы не менялись.
+        """
+
+        if await fetch_tariffs_version_repo(connection) == cls._version:
+            return None
+
+        return await cls.reload(connection)
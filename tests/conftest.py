@@ -0,0 +1,74 @@
+import asyncio
+import importlib
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Пакет лежит в src/ — как и при запуске приложения (PYTHONPATH=src)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from FlatPay.core import SettingsManager, setup_app  # noqa: E402
+
+
+EMAIL, PASSWORD = "user@example.com", "password1"
+IMPORT_TOKEN = "test-token"
+
+
+@pytest.fixture
+def run():
+    """
+    Цикл событий на время теста: run(coroutine) выполняет корутину и возвращает её результат.
+    Приложение, писатель и пул живут в этом цикле, поэтому тесты выполняют в нём все запросы.
+    """
+
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch, run):
+    """Приложение на временной базе данных, запущенное так же, как сервером (startup/shutdown)."""
+
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "flatpay.db"))
+    monkeypatch.setenv("LOG_CONFIG_PATH", "")
+    monkeypatch.setenv("SECRET_KEY", "test")
+    monkeypatch.setenv("IMPORT_TOKEN", IMPORT_TOKEN)
+    # Быстрое хеширование паролей: в тестах стойкость хеша не важна
+    monkeypatch.setenv("PASSWORD_SCRYPT_N", "1024")
+    SettingsManager.load_config()
+    # Закрытие месяца тесты запускают явно: при получении лидерства оно запустилось бы в фоне
+    # за прошедший календарный месяц, и результат тестов зависел бы от текущей даты
+    # (FlatPay.core.setup_app — это и модуль, и функция, поэтому модуль берём через importlib)
+    monkeypatch.setattr(importlib.import_module("FlatPay.core.setup_app"), "resume_month_close", lambda scheduler: None)
+
+    app = setup_app(SettingsManager.get_config().SECRET_KEY)
+    lifespan = app.test_app()
+    run(lifespan.__aenter__())
+    yield app
+    run(lifespan.__aexit__(None, None, None))
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def db(app):
+    """Отдельное синхронное соединение с базой приложения: подготовка данных и проверки в обход сервисов."""
+
+    connection = sqlite3.connect(SettingsManager.get_config().DATABASE_PATH, isolation_level=None)
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def user(client, run):
+    """Зарегистрированный пользователь с открытой сессией в `client`; возвращает его email."""
+
+    run(client.post("/FlatPay/register", form={"email": EMAIL, "password": PASSWORD}))
+    run(client.post("/FlatPay/login", form={"email": EMAIL, "password": PASSWORD}))
+    return EMAIL
@@ -0,0 +1,65 @@
+from FlatPay.app.models import AccountSummary
+from FlatPay.services.user import ACCOUNT_CACHE, get_account_data, invalidate_account, invalidate_accounts
+from FlatPay.utils.cache import CacheManager, MISSING
+
+
+def summary(version: int) -> AccountSummary:
+    return AccountSummary(
+        email="user@example.com", version=version, current_debt=0, last_payment=0, next_month_debt=0, history=[]
+    )
+
+
+def loader(*results, during=None):
+    """Загрузка, возвращающая `results` по очереди; `during` вызывается посреди загрузки (запись другого запроса)."""
+
+    calls = []
+
+    async def load():
+        calls.append(None)
+        if during is not None:
+            during()
+        return results[len(calls) - 1]
+
+    return load, calls
+
+
+def test_summary_is_cached(app, run):
+    load, calls = loader(summary(1))
+
+    assert run(get_account_data("user@example.com", load)).version == 1
+    assert run(get_account_data("user@example.com", load)).version == 1
+    assert len(calls) == 1
+
+
+def test_invalidation_during_load_is_not_overwritten(app, run):
+    load, calls = loader(summary(1), summary(2), during=lambda: invalidate_account("user@example.com"))
+
+    assert run(get_account_data("user@example.com", load)).version == 1
+    assert CacheManager.find_cache(ACCOUNT_CACHE).get("user@example.com") is MISSING
+    assert run(get_account_data("user@example.com", load)).version == 2
+    assert len(calls) == 2
+
+
+def test_invalidation_of_all_accounts_during_load(app, run):
+    load, _ = loader(summary(1), during=invalidate_accounts)
+
+    run(get_account_data("user@example.com", load))
+
+    assert CacheManager.find_cache(ACCOUNT_CACHE).get("user@example.com") is MISSING
+
+
+def test_invalidation_of_other_account_keeps_fill(app, run):
+    load, _ = loader(summary(1), during=lambda: invalidate_account("other@example.com"))
+
+    run(get_account_data("user@example.com", load))
+
+    assert CacheManager.find_cache(ACCOUNT_CACHE).get("user@example.com").version == 1
+
+
+def test_unknown_email_is_not_cached(app, run):
+    load, calls = loader(None, summary(1))
+
+    assert run(get_account_data("user@example.com", load)) is None
+    assert CacheManager.find_cache(ACCOUNT_CACHE).get("user@example.com") is MISSING
+    assert run(get_account_data("user@example.com", load)).version == 1
+    assert len(calls) == 2
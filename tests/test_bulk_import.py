@@ -0,0 +1,81 @@
+from datetime import date
+
+from FlatPay.services.payments import refresh_tariffs
+from FlatPay.services.readings import import_readings
+from FlatPay.utils.calculate_base_debt import calculate_base_debts
+from FlatPay.utils.tariffs import billing_day
+
+
+EMAIL = "user@example.com"
+TODAY = date(2026, 9, 15)
+
+
+async def csv(*rows: str):
+    yield ("email,electricity,cold_water,hot_water,gas\n" + "\n".join(rows)).encode()
+
+
+def do_import(run, period: str, *rows: str):
+    return run(import_readings(csv(*rows), period=period, today=TODAY))
+
+
+def history(db) -> list[tuple]:
+    return db.execute(
+        "SELECT period, electricity, electricity_used FROM readings_history WHERE email = ? ORDER BY period", (EMAIL,)
+    ).fetchall()
+
+
+def next_debt(db) -> float:
+    return db.execute("SELECT next_month_debt FROM Taxpayers WHERE email = ?", (EMAIL,)).fetchone()[0]
+
+
+def test_open_period_import_reprices_at_billing_day(db, run):
+    db.execute("INSERT INTO Taxpayers (email) VALUES (?)", (EMAIL,))
+    # Тарифы меняются посреди периода: импорт, как и закрытие месяца, берёт тарифы на последний день периода
+    db.execute("INSERT INTO tariffs VALUES ('2026-09-15', 6, 35, 250, 8)")
+    assert run(refresh_tariffs())
+
+    do_import(run, "2026-08", f"{EMAIL},100,10,5,20")
+    report = do_import(run, "2026-09", f"{EMAIL},150,12,6,25")
+
+    assert report.imported == 1
+    assert history(db) == [("2026-08", 100, 0), ("2026-09", 150, 50)]
+    assert next_debt(db) == calculate_base_debts([[50, 2, 1, 5]], billing_day("2026-09"))[0]
+    assert next_debt(db) == 50 * 6 + 2 * 35 + 250 + 5 * 8
+
+
+def test_past_period_import_keeps_next_debt(db, run):
+    db.execute("INSERT INTO Taxpayers (email, next_month_debt) VALUES (?, 801.99)", (EMAIL,))
+
+    report = do_import(run, "2026-07", f"{EMAIL},100,10,5,20")
+
+    assert report.imported == 1
+    assert next_debt(db) == 801.99
+    # История изменилась — версия аккаунта (ETag страниц пользователя) тоже
+    assert db.execute("SELECT version FROM Taxpayers").fetchone() == (1,)
+
+
+def test_import_older_than_latest_period_is_rejected(db, run):
+    db.execute("INSERT INTO Taxpayers (email) VALUES (?)", (EMAIL,))
+    do_import(run, "2026-08", f"{EMAIL},100,10,5,20")
+    do_import(run, "2026-09", f"{EMAIL},150,12,6,25")
+    debt = next_debt(db)
+
+    report = do_import(run, "2026-07", f"{EMAIL},50,5,2,10")
+
+    assert report.imported == 0
+    assert [(error.line, error.email) for error in report.errors] == [(2, EMAIL)]
+    assert "2026-09" in report.errors[0].error
+    assert history(db) == [("2026-08", 100, 0), ("2026-09", 150, 50)]
+    assert next_debt(db) == debt
+
+
+def test_reimport_of_latest_period_is_accepted(db, run):
+    db.execute("INSERT INTO Taxpayers (email) VALUES (?)", (EMAIL,))
+    do_import(run, "2026-08", f"{EMAIL},100,10,5,20")
+    do_import(run, "2026-09", f"{EMAIL},150,12,6,25")
+
+    report = do_import(run, "2026-09", f"{EMAIL},170,12,6,25")
+
+    assert report.imported == 1
+    assert history(db)[-1] == ("2026-09", 170, 70)
+    assert next_debt(db) == calculate_base_debts([[70, 2, 1, 5]], date(2026, 9, 1))[0]
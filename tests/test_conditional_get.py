@@ -0,0 +1,72 @@
+import re
+
+import pytest
+
+
+PAGES = ["/FlatPay/homepage", "/FlatPay/get_debt", "/FlatPay/get_readings", "/FlatPay/api/v1/account"]
+OTHER_EMAIL = "other@example.com"
+READINGS = {"electricity": "150", "cold_water": "12", "hot_water": "6", "gas": "25"}
+
+
+def get(run, client, path: str, etag: str | None = None):
+    headers = {"If-None-Match": etag} if etag is not None else {}
+    return run(client.get(path, headers=headers))
+
+
+@pytest.mark.parametrize("path", PAGES)
+def test_same_etag_gets_304_without_body(client, run, user, path):
+    first = get(run, client, path)
+    etag = first.headers["ETag"]
+
+    response = get(run, client, path, etag)
+
+    assert first.status_code == 200
+    assert response.status_code == 304
+    assert run(response.get_data()) == b""
+    assert response.headers["ETag"] == etag
+    assert "no-cache" in response.headers["Cache-Control"]
+
+
+@pytest.mark.parametrize("path", PAGES)
+def test_etag_changes_after_readings_and_payment(client, run, user, path):
+    etag = get(run, client, path).headers["ETag"]
+
+    run(client.post("/FlatPay/update_readings", form=READINGS))
+    after_readings = get(run, client, path, etag)
+    run(client.post("/FlatPay/update_debt", form={"new_payment": "100", "idempotency_key": "k1"}))
+    after_payment = get(run, client, path, after_readings.headers["ETag"])
+
+    assert after_readings.status_code == 200
+    assert after_readings.headers["ETag"] != etag
+    assert after_payment.status_code == 200
+    assert after_payment.headers["ETag"] not in (etag, after_readings.headers["ETag"])
+
+
+@pytest.mark.parametrize("path", PAGES)
+def test_other_user_with_same_etag_gets_200(app, client, run, user, path):
+    etag = get(run, client, path).headers["ETag"]
+    other = app.test_client()
+    run(other.post("/FlatPay/register", form={"email": OTHER_EMAIL, "password": "password2"}))
+    run(other.post("/FlatPay/login", form={"email": OTHER_EMAIL, "password": "password2"}))
+
+    response = get(run, other, path, etag)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_fingerprinted_static_is_immutable(client, run, user):
+    html = run(get(run, client, PAGES[0]).get_data(as_text=True))
+    assets = re.findall(r'(?:href|src)="(/static/[^"]+\?v=[^"]+)"', html)
+
+    assert assets
+    for asset in assets:
+        response = get(run, client, asset)
+        assert response.status_code == 200
+        assert response.cache_control.immutable
+        assert response.cache_control.public
+        assert response.cache_control.max_age >= 365 * 24 * 3600
+
+    # Без отпечатка (или со старым) статика перепроверяется как обычно
+    stale = get(run, client, assets[0].split("?")[0] + "?v=stale")
+    assert not stale.cache_control.immutable
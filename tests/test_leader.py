@@ -0,0 +1,18 @@
+from conftest import IMPORT_TOKEN
+
+
+def test_lease_state_requires_manager_token(client, run):
+    response = run(client.get("/FlatPay/leader"))
+
+    assert response.status_code == 403
+
+
+def test_lease_state_shows_this_process_as_leader(client, run):
+    response = run(client.get("/FlatPay/leader", headers={"Authorization": f"Bearer {IMPORT_TOKEN}"}))
+    state = run(response.get_json())
+
+    assert response.status_code == 200
+    assert state["name"] == "month_close"
+    assert state["is_leader"] is True
+    assert state["elections"] == 1
+    assert state["expires_at"] > 0
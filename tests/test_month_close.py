@@ -0,0 +1,169 @@
+import sqlite3
+from datetime import date
+
+import numpy as np
+import pytest
+
+from FlatPay.database.migrations import MIGRATIONS
+from FlatPay.services.month_close import (
+    close_month, resume_month_closes, catch_up_month_close, closed_period, billing_day
+)
+from FlatPay.services.month_close import month_close
+from FlatPay.tasks.jobs.month_close import schedule_month_close
+from FlatPay.utils.calculate_base_debt import calculate_base_debts
+
+
+PERIOD = "2024-01"
+EMAILS = [f"user{i}@example.com" for i in range(5)]
+CONSUMPTION = (100, 10, 5, 20)
+CHUNK_SIZE = 2
+
+
+def seed(db, period: str = PERIOD) -> float:
+    """Добавляет пользователей с одинаковым расходом за период; возвращает ожидаемый долг каждого."""
+
+    db.executemany("INSERT OR IGNORE INTO Taxpayers (email) VALUES (?)", [(email,) for email in EMAILS])
+    db.executemany(
+        """
+        INSERT INTO readings_history (
+            email, period, electricity, cold_water, hot_water, gas,
+            electricity_used, cold_water_used, hot_water_used, gas_used
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [(email, period, *CONSUMPTION, *CONSUMPTION) for email in EMAILS]
+    )
+    return float(calculate_base_debts(np.array([CONSUMPTION], dtype=np.float64), billing_day(period))[0])
+
+
+def debts(db) -> list[tuple[float, float]]:
+    return db.execute("SELECT current_month_debt, next_month_debt FROM Taxpayers ORDER BY email").fetchall()
+
+
+def checkpoint(db, period: str = PERIOD) -> tuple | None:
+    return db.execute(
+        "SELECT last_email, processed, completed FROM month_close_checkpoints WHERE period = ?", (period,)
+    ).fetchone()
+
+
+def billed(db, period: str = PERIOD) -> float:
+    return db.execute("SELECT billed FROM monthly_rollups WHERE period = ?", (period,)).fetchone()[0]
+
+
+@pytest.fixture
+def interrupted(monkeypatch, db, run):
+    """Закрытие PERIOD, прерванное ошибкой на второй порции; возвращает ожидаемый долг каждого пользователя."""
+
+    bill = seed(db)
+    close_range = month_close._close_range
+
+    async def failing_close_range(connection, after_email, last_email, **kwargs):
+        if after_email:
+            raise RuntimeError("процесс остановлен посреди закрытия месяца")
+        await close_range(connection, after_email, last_email, **kwargs)
+
+    monkeypatch.setattr(month_close, "_close_range", failing_close_range)
+    assert not run(close_month(PERIOD, CHUNK_SIZE))
+    monkeypatch.setattr(month_close, "_close_range", close_range)
+
+    # Первая порция зафиксирована вместе с контрольной точкой, вторая откатилась целиком
+    assert checkpoint(db) == (EMAILS[1], 1, 0)
+    assert debts(db) == [(bill, 0)] * 2 + [(0, 0)] * 3
+    return bill
+
+
+def test_close_bills_every_account_once(db, run):
+    bill = seed(db)
+
+    assert run(close_month(PERIOD, CHUNK_SIZE))
+    # Повторный запуск за закрытый период ничего не меняет
+    assert run(close_month(PERIOD, CHUNK_SIZE))
+
+    assert debts(db) == [(bill, 0)] * len(EMAILS)
+    assert checkpoint(db) == (EMAILS[-1], 3, 1)
+    assert billed(db) == pytest.approx(bill * len(EMAILS))
+
+
+def test_interrupted_close_resumes_from_checkpoint(db, run, interrupted):
+    assert run(close_month(PERIOD, CHUNK_SIZE))
+
+    # Пользователи первой порции не получили долг повторно
+    assert debts(db) == [(interrupted, 0)] * len(EMAILS)
+    assert checkpoint(db) == (EMAILS[-1], 3, 1)
+    assert billed(db) == pytest.approx(interrupted * len(EMAILS))
+    assert db.execute(
+        "SELECT stage, rows FROM month_close_stages WHERE period = ? ORDER BY stage", (PERIOD,)
+    ).fetchall() == [("billing", 5), ("rollover", 5), ("stats", 5)]
+
+
+def test_resume_finishes_unfinished_periods_only(db, run, interrupted):
+    assert run(resume_month_closes(CHUNK_SIZE))
+
+    assert debts(db) == [(interrupted, 0)] * len(EMAILS)
+    assert checkpoint(db) == (EMAILS[-1], 3, 1)
+    # Период без контрольной точки продолжение не начинает
+    assert checkpoint(db, "2024-02") is None
+
+
+def mark_closed(db, period: str) -> None:
+    """Оставляет в журнале закрытий только завершённое закрытие `period` (вместо отметки миграции)."""
+
+    db.execute("DELETE FROM month_close_checkpoints")
+    db.execute(
+        "INSERT INTO month_close_checkpoints (job, period, completed) VALUES ('month_close', ?, 1)", (period,)
+    )
+
+
+def test_new_leader_closes_missed_month(db, run):
+    # Последнее закрытие — за январь, запуск 1 марта пропущен: контрольной точки за февраль нет
+    mark_closed(db, PERIOD)
+    bill = seed(db, "2024-02")
+
+    assert run(catch_up_month_close(CHUNK_SIZE, today=date(2024, 3, 5)))
+
+    assert debts(db) == [(bill, 0)] * len(EMAILS)
+    assert checkpoint(db, "2024-02")[2] == 1
+
+
+def test_new_leader_does_not_close_month_again(db, run):
+    # Прошедший месяц отмечен закрытым миграцией: новый лидер не начисляет долг повторно
+    db.executemany(
+        "INSERT INTO Taxpayers (email, current_month_debt, next_month_debt) VALUES (?, 500, 120)",
+        [(email,) for email in EMAILS]
+    )
+
+    run(schedule_month_close(catch_up=True))
+
+    assert debts(db) == [(500, 120)] * len(EMAILS)
+    assert checkpoint(db, closed_period()) == ("", 0, 1)
+
+
+def test_first_start_on_existing_database_does_not_rebill(tmp_path, request, run):
+    # База, созданная до миграций: прошедший месяц уже закрыла ежемесячная задача
+    connection = sqlite3.connect(tmp_path / "flatpay.db")
+    connection.execute(MIGRATIONS[0].statements[0])
+    connection.executemany(
+        "INSERT INTO Taxpayers (email, current_month_debt, next_month_debt) VALUES (?, 500, 120)",
+        [(email,) for email in EMAILS]
+    )
+    connection.commit()
+    connection.close()
+
+    # Первый запуск после обновления: миграции, выбор лидера и догоняющее закрытие
+    db = request.getfixturevalue("db")
+    run(schedule_month_close(catch_up=True))
+
+    assert debts(db) == [(500, 120)] * len(EMAILS)
+    assert db.execute("SELECT period, completed FROM month_close_checkpoints").fetchall() == [(closed_period(), 1)]
+
+
+def test_catch_up_resumes_older_period_first(db, run, interrupted):
+    # В журнале только прерванное закрытие января, запуск 1 марта пропущен
+    db.execute("DELETE FROM month_close_checkpoints WHERE period != ?", (PERIOD,))
+    bill = seed(db, "2024-02")
+
+    assert run(catch_up_month_close(CHUNK_SIZE, today=date(2024, 3, 5)))
+
+    assert checkpoint(db)[2] == 1
+    assert checkpoint(db, "2024-02")[2] == 1
+    assert debts(db) == [(interrupted + bill, 0)] * len(EMAILS)
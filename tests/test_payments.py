@@ -0,0 +1,78 @@
+import pytest
+from pydantic import ValidationError
+
+from FlatPay.app.models import Payment
+from FlatPay.services.payments import apply_payment
+
+
+OTHER_EMAIL = "other@example.com"
+
+
+def debt(db, email: str) -> tuple[float, float]:
+    return db.execute("SELECT current_month_debt, last_payment FROM Taxpayers WHERE email = ?", (email,)).fetchone()
+
+
+def ledger(db, email: str) -> list[tuple[float, float]]:
+    return db.execute("SELECT amount, balance_after FROM payments WHERE email = ? ORDER BY id", (email,)).fetchall()
+
+
+@pytest.mark.parametrize("amount", [-50, 0, float("inf"), float("-inf"), float("nan"), "inf", "nan"])
+def test_payment_amount_must_be_finite_and_positive(amount):
+    with pytest.raises(ValidationError):
+        Payment(amount=amount)
+
+
+@pytest.mark.parametrize("amount", ["-50", "inf", "nan"])
+def test_rejected_amount_does_not_touch_debt(client, db, run, user, amount):
+    response = run(client.post("/FlatPay/update_debt", form={"new_payment": amount, "idempotency_key": "k1"}))
+
+    assert response.status_code == 200
+    assert debt(db, user) == (0, 0)
+    assert ledger(db, user) == []
+    assert db.execute("SELECT COUNT(*) FROM payment_requests").fetchone() == (0,)
+
+
+def test_replayed_key_is_applied_once(db, run, user):
+    payment = Payment(amount=100, idempotency_key="k1")
+
+    assert run(apply_payment(user, payment))
+    assert run(apply_payment(user, payment))
+
+    assert debt(db, user) == (-100, 100)
+    assert ledger(db, user) == [(100, -100)]
+
+
+def test_key_used_by_another_user_is_rejected(db, run, user):
+    db.execute("INSERT INTO Taxpayers (email) VALUES (?)", (OTHER_EMAIL,))
+
+    assert run(apply_payment(user, Payment(amount=100, idempotency_key="k1")))
+    assert not run(apply_payment(OTHER_EMAIL, Payment(amount=40, idempotency_key="k1")))
+
+    assert debt(db, user) == (-100, 100)
+    assert debt(db, OTHER_EMAIL) == (0, 0)
+    assert ledger(db, OTHER_EMAIL) == []
+
+
+def test_key_reused_with_other_amount_is_rejected(db, run, user):
+    assert run(apply_payment(user, Payment(amount=100, idempotency_key="k1")))
+    assert not run(apply_payment(user, Payment(amount=250, idempotency_key="k1")))
+
+    assert debt(db, user) == (-100, 100)
+    assert ledger(db, user) == [(100, -100)]
+
+
+def test_api_rejects_key_reused_with_other_amount(client, db, run, user):
+    first = run(client.post("/FlatPay/api/v1/payments", json={"amount": 100, "idempotency_key": "k1"}))
+    replay = run(client.post("/FlatPay/api/v1/payments", json={"amount": 100, "idempotency_key": "k1"}))
+    other = run(client.post("/FlatPay/api/v1/payments", json={"amount": 250, "idempotency_key": "k1"}))
+
+    assert (first.status_code, replay.status_code, other.status_code) == (200, 200, 422)
+    assert debt(db, user) == (-100, 100)
+
+
+def test_payments_without_key_are_all_applied(db, run, user):
+    assert run(apply_payment(user, Payment(amount=100)))
+    assert run(apply_payment(user, Payment(amount=50)))
+
+    assert debt(db, user) == (-150, 50)
+    assert ledger(db, user) == [(100, -100), (50, -150)]
@@ -0,0 +1,28 @@
+from conftest import IMPORT_TOKEN
+
+from FlatPay.core import SettingsManager
+
+
+MANAGER = {"Authorization": f"Bearer {IMPORT_TOKEN}"}
+
+
+def test_pool_stats_require_manager_token(client, run):
+    response = run(client.get("/FlatPay/pool"))
+
+    assert response.status_code == 403
+
+
+def test_pool_stats_while_running(client, run, user):
+    # Страница пользователя берёт соединение из пула и возвращает его после ответа
+    run(client.get("/FlatPay/get_debt"))
+
+    response = run(client.get("/FlatPay/pool", headers=MANAGER))
+    stats = run(response.get_json())
+
+    assert response.status_code == 200
+    assert stats["size"] == SettingsManager.get_config().DB_POOL_SIZE
+    assert stats["acquisitions"] >= 1
+    assert stats["in_use"] == 0
+    assert stats["idle"] == stats["opened"] >= 1
+    assert stats["waiting"] == stats["timeouts"] == 0
+    assert 0 <= stats["avg_wait_time"] <= stats["max_wait_time"]
@@ -0,0 +1,19 @@
+from FlatPay.core.config import RateLimit
+from FlatPay.utils.rate_limit import TokenBucketLimiter
+
+
+LIMIT = RateLimit(requests=1, period=3600)
+
+
+def test_overflow_evicts_least_recently_used_bucket():
+    limiter = TokenBucketLimiter(max_keys=2, idle_ttl=3600)
+    limiter.hit("first", LIMIT)
+    limiter.hit("second", LIMIT)
+
+    # Повторное обращение к первой корзине делает давнее всех использованной вторую
+    assert limiter.hit("first", LIMIT) > 0
+    limiter.hit("third", LIMIT)
+
+    assert limiter.stats.evicted == 1
+    assert limiter.hit("first", LIMIT) > 0  # корзина сохранилась вместе с исчерпанным лимитом
+    assert limiter.hit("second", LIMIT) == 0  # вытеснена — создаётся заново полной
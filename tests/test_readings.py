@@ -0,0 +1,110 @@
+from FlatPay.app.models import Readings
+from FlatPay.services.readings import update_readings, readings_period
+from FlatPay.services.readings import readings as readings_service
+from FlatPay.services.month_close import close_month
+from FlatPay.services.payments import bill_all_accounts, refresh_tariffs
+from FlatPay.utils.calculate_base_debt import calculate_base_debt
+from FlatPay.utils.tariffs import billing_day
+
+
+def meters(electricity: int, cold_water: int, hot_water: int, gas: int) -> Readings:
+    return Readings(meter_readings={
+        "electricity": electricity, "cold_water": cold_water, "hot_water": hot_water, "gas": gas
+    })
+
+
+def account(db, email: str) -> tuple[float, int]:
+    return db.execute("SELECT next_month_debt, version FROM Taxpayers WHERE email = ?", (email,)).fetchone()
+
+
+def stored(db, email: str) -> list[tuple]:
+    return db.execute(
+        "SELECT period, electricity, electricity_used FROM readings_history WHERE email = ?", (email,)
+    ).fetchall()
+
+
+def seed_previous(db, email: str) -> None:
+    """Показания за прошлый период: от них считается расход за текущий."""
+
+    db.execute(
+        """
+        INSERT INTO readings_history (
+            email, period, electricity, cold_water, hot_water, gas,
+            electricity_used, cold_water_used, hot_water_used, gas_used
+        )
+        VALUES (?, '2000-01', 100, 10, 5, 20, 0, 0, 0, 0)
+        """, (email,)
+    )
+
+
+def test_readings_and_next_debt_are_saved_together(db, run, user):
+    seed_previous(db, user)
+
+    submitted = run(update_readings(user, meters(150, 12, 6, 25)))
+
+    assert submitted.consumption == meters(50, 2, 1, 5)
+    assert stored(db, user)[-1] == (readings_period(), 150, 50)
+    assert account(db, user) == (calculate_base_debt(meters(50, 2, 1, 5), billing_day(readings_period())), 1)
+
+
+def test_next_debt_matches_month_close_when_tariffs_change_mid_period(db, run, user):
+    # Новые тарифы вступают в силу посреди периода, в его последний день
+    period = readings_period()
+    db.execute("INSERT INTO tariffs VALUES (?, 6, 35, 250, 8)", (billing_day(period).isoformat(),))
+    assert run(refresh_tariffs())
+    seed_previous(db, user)
+
+    run(update_readings(user, meters(150, 12, 6, 25)))
+    next_debt = account(db, user)[0]
+    assert next_debt == 50 * 6 + 2 * 35 + 1 * 250 + 5 * 8
+
+    # Закрытие периода начисляет столько же, сколько пользователь видел в оценке долга
+    db.execute("DELETE FROM month_close_checkpoints")
+    assert run(close_month(period, 100))
+    assert db.execute("SELECT current_month_debt FROM Taxpayers WHERE email = ?", (user,)).fetchone() == (next_debt,)
+
+
+def test_rebill_reprices_submitted_readings_after_tariff_change(db, run, user):
+    seed_previous(db, user)
+    db.execute("INSERT INTO Taxpayers (email, next_month_debt) VALUES ('idle@example.com', 500)")
+    run(update_readings(user, meters(150, 12, 6, 25)))
+    before = account(db, user)
+
+    # Тарифы открытого периода исправлены после отправки показаний
+    db.execute("INSERT INTO tariffs VALUES (?, 6, 35, 250, 8)", (billing_day(readings_period()).isoformat(),))
+    assert run(refresh_tariffs())
+
+    assert run(bill_all_accounts(chunk_size=1)) == 2
+    assert account(db, user) == (50 * 6 + 2 * 35 + 1 * 250 + 5 * 8, before[1] + 1)
+    # Без показаний за период оценка долга нулевая
+    assert account(db, "idle@example.com")[0] == 0
+
+
+def test_failed_debt_update_rolls_back_readings(monkeypatch, db, run, user):
+    async def failing_update(connection, debt, email):
+        raise RuntimeError("ошибка записи долга")
+
+    monkeypatch.setattr(readings_service, "update_next_month_debt_repo", failing_update)
+
+    assert run(update_readings(user, meters(150, 12, 6, 25))) is None
+    assert stored(db, user) == []
+    assert account(db, user) == (0, 0)
+
+
+def test_decreased_readings_are_rejected(db, run, user):
+    seed_previous(db, user)
+
+    assert run(update_readings(user, meters(90, 12, 6, 25))) is None
+    assert stored(db, user) == [("2000-01", 100, 0)]
+    assert account(db, user) == (0, 0)
+
+
+def test_form_submission_updates_next_debt(client, db, run, user):
+    form = {"electricity": "150", "cold_water": "12", "hot_water": "6", "gas": "25"}
+
+    response = run(client.post("/FlatPay/update_readings", form=form))
+
+    assert response.status_code == 200
+    assert stored(db, user) == [(readings_period(), 150, 0)]
+    # Первые показания — начальная точка: расход и долг нулевые, но версия аккаунта выросла
+    assert account(db, user) == (0, 1)
@@ -0,0 +1,192 @@
+from datetime import date
+
+import aiosqlite
+import pytest
+
+from FlatPay.app.models import Payment
+from FlatPay.database import PoolManager
+from FlatPay.database.migrations import MIGRATIONS, apply_migrations
+from FlatPay.services.analytics import rebuild_rollups
+from FlatPay.services.month_close import close_month
+from FlatPay.services.payments import apply_payment
+from FlatPay.services.readings import import_readings
+
+
+EMAILS = [f"user{i}@example.com" for i in range(4)]
+TODAY = date(2026, 9, 15)
+
+
+async def csv(*rows: str):
+    yield ("email,electricity,cold_water,hot_water,gas\n" + "\n".join(rows)).encode()
+
+
+def do_import(run, period: str, *rows: str) -> None:
+    assert run(import_readings(csv(*rows), period=period, today=TODAY)).imported == len(rows)
+
+
+def rounded(rows: list[tuple]) -> list[tuple]:
+    """Округляет суммы: агрегаты и исходные таблицы складывают числа с плавающей точкой в разном порядке."""
+
+    return [tuple(round(value, 6) if isinstance(value, float) else value for value in row) for row in rows]
+
+
+def monthly(db) -> list[tuple]:
+    return db.execute(
+        """
+        SELECT period, accounts, electricity_used, cold_water_used, hot_water_used, gas_used, paid, payments
+        FROM monthly_rollups
+        WHERE accounts > 0 OR payments > 0
+        ORDER BY period
+        """
+    ).fetchall()
+
+
+def monthly_from_sources(db) -> list[tuple]:
+    """Итоги по месяцам, посчитанные по исходным таблицам (как rebuild_rollups_repo)."""
+
+    readings = {
+        row[0]: row[1:] for row in db.execute(
+            """
+            SELECT period, COUNT(*), SUM(electricity_used), SUM(cold_water_used), SUM(hot_water_used), SUM(gas_used)
+            FROM readings_history
+            GROUP BY period
+            """
+        )
+    }
+    payments = {
+        row[0]: row[1:] for row in db.execute(
+            "SELECT substr(created_at, 1, 7), SUM(amount), COUNT(*) FROM payments GROUP BY substr(created_at, 1, 7)"
+        )
+    }
+    return [
+        (period, *readings.get(period, (0, 0, 0, 0, 0)), *payments.get(period, (0, 0)))
+        for period in sorted(readings.keys() | payments.keys())
+    ]
+
+
+def arrears(db) -> list[tuple]:
+    return db.execute(
+        "SELECT bucket, accounts, debt FROM arrears_rollups WHERE accounts > 0 ORDER BY bucket"
+    ).fetchall()
+
+
+def arrears_from_sources(db) -> list[tuple]:
+    return db.execute(
+        """
+        SELECT CASE
+                   WHEN current_month_debt <= 0 THEN 0
+                   WHEN current_month_debt <= 1000 THEN 1
+                   WHEN current_month_debt <= 5000 THEN 2
+                   WHEN current_month_debt <= 20000 THEN 3
+                   ELSE 4
+               END AS bucket,
+               COUNT(*), SUM(current_month_debt)
+        FROM Taxpayers
+        GROUP BY bucket
+        ORDER BY bucket
+        """
+    ).fetchall()
+
+
+def total_debt(db) -> float:
+    return db.execute("SELECT SUM(current_month_debt) FROM Taxpayers").fetchone()[0]
+
+
+def debt(db, email: str) -> float:
+    return db.execute("SELECT current_month_debt FROM Taxpayers WHERE email = ?", (email,)).fetchone()[0]
+
+
+@pytest.fixture
+def activity(db, run):
+    """Показания (импорт и повторный импорт), закрытие месяца, платежи и удаление аккаунта через пути записи."""
+
+    db.executemany("INSERT INTO Taxpayers (email) VALUES (?)", [(email,) for email in EMAILS])
+    db.execute("INSERT INTO Taxpayers (email, current_month_debt) VALUES ('gone@example.com', 3000)")
+
+    do_import(run, "2026-08", *(f"{email},{100 * i},{10 * i},{5 * i},{20 * i}" for i, email in enumerate(EMAILS)))
+    do_import(run, "2026-09", *(f"{email},{5000 * i},{80 * i},{40 * i},{300 * i}" for i, email in enumerate(EMAILS)))
+    # Исправленная выгрузка за тот же период: строки обновляются, а не добавляются
+    do_import(run, "2026-09", *(f"{email},{3000 * i},{60 * i},{30 * i},{200 * i}" for i, email in enumerate(EMAILS)))
+
+    # Отметка миграции о закрытом прошедшем месяце относится к реальной дате, а не к TODAY
+    db.execute("DELETE FROM month_close_checkpoints")
+    before = total_debt(db)
+    assert run(close_month("2026-09", 2))
+    billed = total_debt(db) - before
+
+    # Платежи переводят аккаунты из корзины начисленного долга в корзины 0-3 (у первого — переплата)
+    for email, remaining in zip(EMAILS, (-50, 500, 3000, 15000)):
+        assert run(apply_payment(email, Payment(amount=debt(db, email) - remaining)))
+    db.execute("DELETE FROM Taxpayers WHERE email = 'gone@example.com'")
+
+    return billed
+
+
+def test_monthly_rollups_match_sources(db, activity):
+    rollups = monthly(db)
+
+    assert rounded(rollups) == rounded(monthly_from_sources(db))
+    assert [row[:2] for row in rollups if row[0].startswith("2026-0")] == [("2026-08", 4), ("2026-09", 4)]
+    assert sum(row[-1] for row in rollups) == 4
+    billed = db.execute("SELECT billed FROM monthly_rollups WHERE period = '2026-09'").fetchone()[0]
+    assert billed == pytest.approx(activity)
+    assert billed > 0
+
+
+def test_arrears_rollups_match_sources(db, activity):
+    rollups = arrears(db)
+
+    assert rounded(rollups) == rounded(arrears_from_sources(db))
+    assert rounded(rollups) == [(0, 1, -50.0), (1, 1, 500.0), (2, 1, 3000.0), (3, 1, 15000.0)]
+
+
+def test_rebuild_reproduces_trigger_totals(db, run, activity):
+    before = monthly(db), arrears(db), db.execute("SELECT period, billed FROM monthly_rollups").fetchall()
+
+    async def rebuild():
+        async with PoolManager.get_pool().connection() as connection:
+            return await rebuild_rollups(connection)
+
+    assert run(rebuild())
+
+    assert rounded(monthly(db)) == rounded(before[0])
+    assert rounded(arrears(db)) == rounded(before[1])
+    assert rounded(db.execute("SELECT period, billed FROM monthly_rollups").fetchall()) == rounded(before[2])
+
+
+def test_upgrade_seeds_rollups_from_existing_data(tmp_path, request, run):
+    # База версии 9: показания, платежи и долги накоплены до появления агрегатов
+    async def legacy():
+        async with aiosqlite.connect(tmp_path / "flatpay.db") as connection:
+            await apply_migrations(connection, MIGRATIONS[:9])
+            await connection.executemany(
+                "INSERT INTO Taxpayers (email, current_month_debt) VALUES (?, ?)",
+                zip(EMAILS, (0, 700, 4000, 25000))
+            )
+            await connection.executemany(
+                """
+                INSERT INTO readings_history (
+                    email, period, electricity, cold_water, hot_water, gas,
+                    electricity_used, cold_water_used, hot_water_used, gas_used
+                )
+                VALUES (?, '2026-08', 100, 10, 5, 20, 40, 4, 2, 8)
+                """, [(email,) for email in EMAILS]
+            )
+            await connection.execute(
+                "INSERT INTO payments (email, amount, balance_after, created_at) VALUES (?, 300, 400, '2026-08-20')",
+                (EMAILS[1],)
+            )
+            await connection.commit()
+
+    run(legacy())
+    db = request.getfixturevalue("db")
+
+    assert rounded(monthly(db)) == rounded(monthly_from_sources(db)) == [("2026-08", 4, 160, 16, 8, 32, 300.0, 1)]
+    assert rounded(arrears(db)) == rounded(arrears_from_sources(db))
+
+    # Триггеры продолжают от заполненных значений: аккаунт переходит из корзины 4 в корзину 3
+    assert run(apply_payment(EMAILS[3], Payment(amount=10000)))
+
+    assert rounded(arrears(db)) == rounded(arrears_from_sources(db)) == [
+        (0, 1, 0.0), (1, 1, 700.0), (2, 1, 4000.0), (3, 1, 15000.0)
+    ]
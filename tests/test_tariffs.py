@@ -0,0 +1,53 @@
+from datetime import date
+
+from conftest import IMPORT_TOKEN
+
+from FlatPay.services.payments import refresh_tariffs
+from FlatPay.utils.tariffs import TariffManager
+
+
+MANAGER = {"Authorization": f"Bearer {IMPORT_TOKEN}"}
+JULY = {"effective_from": "2025-07-01", "electricity": 5.45, "cold_water": 31.2, "hot_water": 240.5, "gas": 7.9}
+
+
+def test_tariffs_require_manager_token(client, run):
+    response = run(client.post("/FlatPay/tariffs", json=JULY))
+
+    assert response.status_code == 403
+    assert TariffManager.get_schedule().dates == ("1970-01-01",)
+
+
+def test_invalid_tariffs_are_rejected(client, db, run):
+    response = run(client.post("/FlatPay/tariffs", json={**JULY, "gas": -1}, headers=MANAGER))
+
+    assert response.status_code == 400
+    assert db.execute("SELECT COUNT(*) FROM tariffs").fetchone() == (1,)
+
+
+def test_new_tariffs_are_saved_and_applied(client, db, run):
+    response = run(client.post("/FlatPay/tariffs", json=JULY, headers=MANAGER))
+    versions = run(response.get_json())
+
+    assert response.status_code == 200
+    assert [version["effective_from"] for version in versions] == ["1970-01-01", "2025-07-01"]
+    assert db.execute("SELECT electricity FROM tariffs WHERE effective_from = '2025-07-01'").fetchone() == (5.45,)
+    assert TariffManager.get_schedule().tariffs_for(date(2025, 7, 1))["electricity"] == 5.45
+    assert TariffManager.get_schedule().tariffs_for(date(2025, 6, 30))["electricity"] == 5.09
+
+
+def test_refresh_picks_up_tariffs_changed_by_another_worker(db, run):
+    schedule = TariffManager.get_schedule()
+
+    # Тарифы не менялись — расписание не перечитывается
+    assert run(refresh_tariffs())
+    assert TariffManager.get_schedule() is schedule
+
+    # Новая версия, добавленная другим процессом
+    db.execute("INSERT INTO tariffs VALUES ('2025-07-01', 5.45, 31.2, 240.5, 7.9)")
+    assert run(refresh_tariffs())
+    assert TariffManager.get_schedule().dates == ("1970-01-01", "2025-07-01")
+
+    # Исправление тарифов существующей версии (количество и последняя дата не меняются)
+    db.execute("UPDATE tariffs SET gas = 8.1 WHERE effective_from = '2025-07-01'")
+    assert run(refresh_tariffs())
+    assert TariffManager.get_schedule().tariffs_for(date(2025, 8, 1))["gas"] == 8.1